@@ -0,0 +1,6 @@
+"""
+Benchmarks for the option pricing and implied volatility models
+
+Run from the repository root, e.g. python -m benchmarks.normal_kernels
+
+"""
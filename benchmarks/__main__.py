@@ -0,0 +1,78 @@
+"""
+Command line interface to the benchmark suite
+
+Record a baseline:
+    python -m benchmarks run --output baseline.json
+
+Compare a new run, or a saved report, against the baseline:
+    python -m benchmarks compare baseline.json [current.json]
+
+"""
+
+import argparse
+import sys
+from benchmarks import suite
+
+
+def main(argv=None):
+    """
+    Parse the command line and run or compare the benchmarks
+
+    Returns
+    -------
+    Int
+        Exit code, 1 if compare found a regression and 0 otherwise.
+
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the suite')
+    run_parser.add_argument('--output', help='JSON file to write')
+
+    compare_parser = commands.add_parser(
+        'compare', help='compare against a baseline')
+    compare_parser.add_argument('baseline', help='baseline JSON file')
+    compare_parser.add_argument(
+        'current', nargs='?',
+        help='JSON file to compare, otherwise the suite is run now')
+    compare_parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='relative slowdown flagged as a regression (default 0.2)')
+    compare_parser.add_argument('--output', help='JSON file for a new run')
+
+    for sub_parser in (run_parser, compare_parser):
+        sub_parser.add_argument(
+            '--quick', action='store_true',
+            help='smallest setting and array size only')
+        sub_parser.add_argument(
+            '--budget', type=float, default=0.5,
+            help='seconds of timed calls per case (default 0.5)')
+        sub_parser.add_argument(
+            '--filter', dest='name_filter',
+            help='only run cases whose name contains this string')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare' and args.current:
+        current = suite.load(args.current)
+    else:
+        current = suite.run(quick=args.quick, budget=args.budget,
+                            name_filter=args.name_filter,
+                            verbose=args.command == 'run')
+        if args.output:
+            suite.save(current, args.output)
+
+    if args.command == 'run':
+        return 0
+
+    regressions = suite.compare(
+        suite.load(args.baseline), current, threshold=args.threshold)
+    print('{} regression(s) beyond {:.0%}'.format(
+        len(regressions), args.threshold))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Cold start benchmark: time taken by a fresh interpreter to import each
+entry point, and to import and price with the lightweight models
+
+"""
+
+import subprocess
+import sys
+import time
+
+# Statements timed in a fresh interpreter
+ENTRY_POINTS = {
+    'python':'pass',
+    'numpy':'import numpy',
+    'optionmodels':'import optionmodels',
+    'optionmodels.models':'import optionmodels.models',
+    'optionmodels.sabr':'import optionmodels.sabr',
+    'optionmodels.analyticalmethods':'import optionmodels.analyticalmethods',
+    'optionmodels.latticemethods':'import optionmodels.latticemethods',
+    'optionmodels.finitedifferencemethods':(
+        'import optionmodels.finitedifferencemethods'),
+    'optionmodels.montecarlo':'import optionmodels.montecarlo',
+    'optionmodels.hullwhite':'import optionmodels.hullwhite',
+    'optionmodels.impliedvol':'import optionmodels.impliedvol',
+    'first bsm price':(
+        'from optionmodels.models import Pricer; '
+        'Pricer().price(option_method="bsm")'),
+    'first bsm impliedvol':(
+        'from optionmodels.models import Pricer; '
+        'Pricer().impliedvol(vol_method="nr")'),
+    'first sabr calibrate':(
+        'from optionmodels.sabr import SABRVolatility; '
+        'SABRVolatility().calibrate()'),
+    'first array bsm price':(
+        'import numpy as np; from optionmodels.models import Pricer; '
+        'Pricer().price(option_method="bsm", K=np.array([90., 110.]))'),
+    }
+
+
+def run(repeat=5):
+    """
+    Time each entry point in a fresh interpreter
+
+    Parameters
+    ----------
+    repeat : Int
+        Number of interpreter launches per entry point; the fastest is
+        reported. The default is 5.
+
+    Returns
+    -------
+    results : Dict
+        Milliseconds from interpreter launch to exit, keyed by entry
+        point.
+
+    """
+    results = {}
+    for name, statement in ENTRY_POINTS.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', statement], check=True)
+            timings.append(time.perf_counter() - start)
+        results[name] = min(timings) * 1e3
+
+    return results
+
+
+def main():
+    """
+    Print the benchmark table
+
+    """
+    for name, millis in run().items():
+        print('{:<40}{:>10.1f} ms'.format(name, millis))
+
+
+if __name__ == '__main__':
+    main()
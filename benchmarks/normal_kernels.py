@@ -0,0 +1,88 @@
+"""
+Micro-benchmark of the NormalDistribution kernels against the
+scipy.stats call sites they replaced
+
+"""
+
+import random
+import timeit
+import numpy as np
+import scipy.stats as si
+from optionmodels.normaldistribution import NormalDistribution
+
+
+def _time_per_call(func, number):
+    """
+    Best of five timings, in microseconds per call
+
+    """
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def run(array_size=10000, number=2000):
+    """
+    Time scalar and array normal cdf, pdf and inverse cdf
+
+    Parameters
+    ----------
+    array_size : Int
+        Length of the array inputs. The default is 10000.
+    number : Int
+        Number of calls per timing run. The default is 2000.
+
+    Returns
+    -------
+    results : Dict
+        Microseconds per call for each case, keyed by
+        (function, input type) with values (scipy.stats, kernel).
+
+    """
+    x = 0.3
+    p = random.random()
+    x_arr = np.random.default_rng(0).standard_normal(array_size)
+    p_arr = np.random.default_rng(1).random(array_size)
+    array_number = max(number // 20, 1)
+
+    cases = {
+        ('cdf', 'scalar'):(
+            lambda: si.norm.cdf(x, 0.0, 1.0),
+            lambda: NormalDistribution.cdf(x), number),
+        ('pdf', 'scalar'):(
+            lambda: si.norm.pdf(x, 0.0, 1.0),
+            lambda: NormalDistribution.pdf(x), number),
+        ('ppf', 'scalar'):(
+            lambda: si.norm.ppf(p, loc=0, scale=1),
+            lambda: NormalDistribution.ppf(p), number),
+        ('cdf', 'array'):(
+            lambda: si.norm.cdf(x_arr, 0.0, 1.0),
+            lambda: NormalDistribution.cdf(x_arr), array_number),
+        ('pdf', 'array'):(
+            lambda: si.norm.pdf(x_arr, 0.0, 1.0),
+            lambda: NormalDistribution.pdf(x_arr), array_number),
+        ('ppf', 'array'):(
+            lambda: si.norm.ppf(p_arr, loc=0, scale=1),
+            lambda: NormalDistribution.ppf(p_arr), array_number),
+        }
+
+    results = {}
+    for key, (scipy_func, kernel_func, calls) in cases.items():
+        results[key] = (_time_per_call(scipy_func, calls),
+                        _time_per_call(kernel_func, calls))
+
+    return results
+
+
+def main():
+    """
+    Print the benchmark table
+
+    """
+    print('{:<6}{:<8}{:>16}{:>16}{:>10}'.format(
+        'func', 'input', 'scipy.stats us', 'kernel us', 'speedup'))
+    for (func, kind), (old, new) in run().items():
+        print('{:<6}{:<8}{:>16.3f}{:>16.3f}{:>9.1f}x'.format(
+            func, kind, old, new, old / new))
+
+
+if __name__ == '__main__':
+    main()
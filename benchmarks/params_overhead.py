@@ -0,0 +1,60 @@
+"""
+Benchmark of the parameter handling overhead on the paths that call the
+pricing kernels repeatedly: implied volatility and the implied
+trinomial tree
+
+"""
+
+import timeit
+from optionmodels.models import Pricer
+
+
+def run(number=20):
+    """
+    Time the parameter-heavy pricing paths
+
+    Parameters
+    ----------
+    number : Int
+        Number of calls per timing run. The default is 20.
+
+    Returns
+    -------
+    results : Dict
+        Milliseconds per call, keyed by case name.
+
+    """
+    pricer = Pricer()
+    cases = {
+        'bsm':lambda: pricer.price(option_method='bsm'),
+        'impliedvol nr':lambda: pricer.impliedvol(
+            vol_method='nr', S=50, K=55, T=1, r=0.05, q=0.01, cm=7.57,
+            epsilon=0.00001, option='put'),
+        'impliedvol bisection':lambda: pricer.impliedvol(
+            vol_method='bisection', S=50, K=55, T=1, r=0.05, q=0.01,
+            cm=7.57, epsilon=0.00001, option='put'),
+        'impliedvol naive':lambda: pricer.impliedvol(
+            vol_method='naive', S=50, K=55, T=1, r=0.05, q=0.01, cm=7.57,
+            epsilon=0.00001, option='put'),
+        'itt':lambda: pricer.price(option_method='itt'),
+        }
+
+    results = {}
+    for name, func in cases.items():
+        results[name] = min(timeit.repeat(
+            func, number=number, repeat=5)) / number * 1e3
+
+    return results
+
+
+def main():
+    """
+    Print the benchmark table
+
+    """
+    for name, millis in run().items():
+        print('{:<24}{:>12.4f} ms'.format(name, millis))
+
+
+if __name__ == '__main__':
+    main()
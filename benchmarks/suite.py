@@ -0,0 +1,364 @@
+"""
+Reproducible benchmark suite covering every pricer_dict method, every
+implied volatility method, the implied volatility surface and the SABR
+calibration.
+
+Each case is timed over a fixed matrix of input sizes and model settings
+and the wall time, per-call latency and peak memory are recorded to a
+JSON baseline. A later run can be compared against the baseline to flag
+regressions.
+
+"""
+
+import datetime
+import functools
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import numpy as np
+import scipy
+from optionmodels import __version__
+from optionmodels.models import Pricer
+from optionmodels.models_params import models_params_dict
+from optionmodels.sabr import SABRVolatility
+from optionmodels.volsurface import VolSurface
+
+# Values taken by each model setting
+SETTINGS_MATRIX = {
+    'steps':[100, 500],
+    'nodes':[50, 100],
+    'steps_itt':[5, 10],
+    'simulations':[1000, 10000],
+    }
+
+# Model settings that each pricing method depends on
+METHOD_SETTINGS = {
+    'euro_bin':['steps'],
+    'crr_bin':['steps'],
+    'lr_bin':['steps'],
+    'tt':['steps'],
+    'itt':['steps_itt'],
+    'efd':['nodes'],
+    'ifd':['steps', 'nodes'],
+    'efd_lns':['steps_itt', 'nodes'],
+    'cn':['steps', 'nodes'],
+    'emc':['simulations'],
+    'emc_greeks':['simulations'],
+    }
+
+# Inputs fixed for particular methods so every setting is valid
+FIXED_INPUTS = {
+    'itt':{'step':4, 'state':4},
+    }
+
+# Number of contracts priced per call by the array methods
+ARRAY_SIZES = [1, 1000, 100000]
+
+# Number of contracts priced per call by the array methods with model
+# settings, whose cost grows with the settings as well
+SETTINGS_ARRAY_SIZES = [1, 100, 1000]
+
+# Option price used for the implied volatility cases, from a 25% vol
+IMPLIED_VOL_INPUTS = {'S':100, 'K':105, 'T':0.5, 'r':0.02, 'q':0.01,
+                      'cm':5.156, 'option':'call'}
+
+# Expiries cycled through by the implied volatility surface cases
+SURFACE_EXPIRIES = [0.1, 0.25, 0.5, 1.0, 2.0]
+
+
+def build_cases(quick=False):
+    """
+    Build the benchmark cases
+
+    Each case is returned as a setup function, so that the inputs of a
+    case, e.g. large contract arrays or a built surface, are only
+    created when the case is run.
+
+    Parameters
+    ----------
+    quick : Bool
+        Only use the smallest setting and array size for each method.
+        The default is False.
+
+    Returns
+    -------
+    cases : Dict
+        Setup function for each case name, taking no arguments and
+        returning the function to time.
+
+    """
+    pricer = Pricer()
+    cases = {}
+
+    def settings_grid(names):
+        grid = [{}]
+        for name in names:
+            values = SETTINGS_MATRIX[name][:1] if quick else (
+                SETTINGS_MATRIX[name])
+            grid = [dict(combo, **{name:value})
+                    for combo in grid for value in values]
+        return grid
+
+    iv_inputs = {key: value for key, value in IMPLIED_VOL_INPUTS.items()
+                 if key not in ('K', 'cm', 'option')}
+
+    def price_array(method, size, settings):
+        strikes = np.linspace(50, 150, size)
+        options = np.where(np.arange(size) % 2, 'put', 'call')
+        return lambda: pricer.price(option_method=method, K=strikes,
+                                    option=options, **settings)
+
+    def impliedvol_model(option_method, settings):
+        inputs = {key: value for key, value in IMPLIED_VOL_INPUTS.items()
+                  if key != 'cm'}
+        price = pricer.price(option_method=option_method, sigma=0.25,
+                             **settings, **inputs)
+        return lambda: pricer.impliedvol(
+            option_method=option_method, cm=price, **settings, **inputs)
+
+    def impliedvol_array(vol_method, size):
+        strikes = np.linspace(50, 150, size)
+        options = np.where(strikes < 100, 'put', 'call')
+        prices = pricer.price(K=strikes, option=options, sigma=0.25,
+                              **iv_inputs)
+        return lambda: pricer.impliedvol(
+            vol_method=vol_method, K=strikes, option=options, cm=prices,
+            **iv_inputs)
+
+    def surface_chain(size):
+        strikes = np.linspace(50, 150, size)
+        expiries = np.resize(SURFACE_EXPIRIES, size)
+        options = np.where(np.arange(size) % 2, 'put', 'call')
+        prices = pricer.price(K=strikes, T=expiries, option=options,
+                              sigma=0.25)
+        return strikes, expiries, options, prices
+
+    def surface_build(size):
+        strikes, expiries, options, prices = surface_chain(size)
+        surface = VolSurface()
+        return lambda: surface.build(K=strikes, T=expiries, cm=prices,
+                                     option=options)
+
+    def surface_update(size):
+        strikes, expiries, options, prices = surface_chain(size)
+        surface = VolSurface()
+        surface.build(K=strikes, T=expiries, cm=prices, option=options)
+
+        # Alternate between two quotes for 1% of the chain every tick
+        rows = np.arange(0, size, 100)
+        ticks = itertools.cycle([prices[rows] * 1.001, prices[rows]])
+        return lambda: surface.update(
+            K=strikes[rows], T=expiries[rows], cm=next(ticks),
+            option=options[rows])
+
+    for method in models_params_dict['pricer_dict']:
+        if method in (models_params_dict['array_methods']
+                      + models_params_dict['strike_array_methods']):
+            sizes = (SETTINGS_ARRAY_SIZES if method in METHOD_SETTINGS
+                     else ARRAY_SIZES)
+            for settings, size in itertools.product(
+                    settings_grid(METHOD_SETTINGS.get(method, [])),
+                    sizes[:1] if quick else sizes):
+                name = ' '.join(['price:{} size={}'.format(method, size)] + [
+                    '{}={}'.format(key, value)
+                    for key, value in settings.items()])
+                cases[name] = functools.partial(
+                    price_array, method, size, settings)
+        else:
+            for settings in settings_grid(METHOD_SETTINGS.get(method, [])):
+                name = ' '.join(['price:{}'.format(method)] + [
+                    '{}={}'.format(key, value)
+                    for key, value in settings.items()])
+                settings.update(FIXED_INPUTS.get(method, {}))
+                cases[name] = functools.partial(
+                    lambda method, settings: lambda: pricer.price(
+                        option_method=method, **settings),
+                    method, settings)
+
+    for vol_method in models_params_dict['implied_vol_method_dict']:
+        cases['impliedvol:{}'.format(vol_method)] = functools.partial(
+            lambda vol_method: lambda: pricer.impliedvol(
+                vol_method=vol_method, **IMPLIED_VOL_INPUTS), vol_method)
+
+    for option_method in models_params_dict['implied_vol_models'][1:]:
+        settings = settings_grid(METHOD_SETTINGS.get(option_method, []))[0]
+        name = ' '.join(['impliedvol:model={}'.format(option_method)] + [
+            '{}={}'.format(key, value) for key, value in settings.items()])
+        cases[name] = functools.partial(
+            impliedvol_model, option_method, settings)
+
+    for vol_method in models_params_dict['array_vol_methods']:
+        for size in ARRAY_SIZES[:1] if quick else ARRAY_SIZES:
+            cases['impliedvol:{} size={}'.format(vol_method, size)] = (
+                functools.partial(impliedvol_array, vol_method, size))
+
+    for size in ARRAY_SIZES[:1] if quick else ARRAY_SIZES:
+        cases['volsurface:build size={}'.format(size)] = functools.partial(
+            surface_build, size)
+        cases['volsurface:update size={}'.format(size)] = (
+            functools.partial(surface_update, size))
+
+    cases['sabr:calibrate'] = lambda: SABRVolatility().calibrate
+
+    return cases
+
+
+def time_case(func, budget=0.5, max_calls=1000):
+    """
+    Time a single case
+
+    Parameters
+    ----------
+    func : Function
+        Function to time, taking no arguments.
+    budget : Float
+        Seconds of timed calls to aim for. At least one call is always
+        timed. The default is 0.5.
+    max_calls : Int
+        Maximum number of timed calls. The default is 1000.
+
+    Returns
+    -------
+    Dict
+        Number of calls, total wall time, median and minimum latency in
+        seconds and peak memory allocated during one call in bytes.
+
+    """
+    # Warm up, e.g. lazy imports, then measure memory on a separate call
+    func()
+    tracemalloc.start()
+    func()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < max_calls:
+        call_start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_start)
+        if time.perf_counter() - start > budget:
+            break
+    wall_time = time.perf_counter() - start
+
+    return {
+        'calls':len(latencies),
+        'wall_time':wall_time,
+        'latency_median':statistics.median(latencies),
+        'latency_min':min(latencies),
+        'peak_memory':peak_memory
+        }
+
+
+def run(quick=False, budget=0.5, name_filter=None, verbose=True):
+    """
+    Run the benchmark suite
+
+    Parameters
+    ----------
+    quick : Bool
+        Only use the smallest setting and array size for each method.
+        The default is False.
+    budget : Float
+        Seconds of timed calls per case. The default is 0.5.
+    name_filter : Str
+        Only run cases whose name contains this string. The default is
+        None.
+    verbose : Bool
+        Print each result as it completes. The default is True.
+
+    Returns
+    -------
+    Dict
+        Run metadata and the results of each case.
+
+    """
+    results = {}
+    for name, setup in build_cases(quick).items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_case(setup(), budget=budget)
+        if verbose:
+            print('{:<40}{:>12.1f} us{:>8} calls{:>12.1f} KiB'.format(
+                name, results[name]['latency_median'] * 1e6,
+                results[name]['calls'], results[name]['peak_memory'] / 1024))
+
+    metadata = {
+        'timestamp':datetime.datetime.now().isoformat(timespec='seconds'),
+        'optionmodels':__version__,
+        'python':sys.version.split()[0],
+        'numpy':np.__version__,
+        'scipy':scipy.__version__,
+        'platform':platform.platform(),
+        'quick':quick,
+        'budget':budget
+        }
+
+    return {'metadata':metadata, 'results':results}
+
+
+def save(report, path):
+    """
+    Write a benchmark report to a JSON file
+
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+
+
+def load(path):
+    """
+    Read a benchmark report from a JSON file
+
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare(baseline, current, threshold=0.2, verbose=True):
+    """
+    Compare two benchmark reports
+
+    Parameters
+    ----------
+    baseline : Dict
+        Reference report.
+    current : Dict
+        New report.
+    threshold : Float
+        Relative increase in median latency or peak memory above which a
+        case is flagged as a regression. The default is 0.2 (20%).
+    verbose : Bool
+        Print the comparison table. The default is True.
+
+    Returns
+    -------
+    regressions : Dict
+        Ratio of current to baseline value for each regressed case and
+        metric, keyed by (case name, metric).
+
+    """
+    regressions = {}
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        ratios = {}
+        for metric in ('latency_median', 'peak_memory'):
+            ratios[metric] = (new[metric] / old[metric] if old[metric]
+                              else 1.0)
+            if ratios[metric] > 1 + threshold:
+                regressions[(name, metric)] = ratios[metric]
+        if verbose:
+            flag = 'REGRESSION' if any(
+                (name, metric) in regressions for metric in ratios) else ''
+            print('{:<40}{:>12.1f} us{:>12.1f} us{:>8.2f}x{:>8.2f}x  {}'.format(
+                name, old['latency_median'] * 1e6,
+                new['latency_median'] * 1e6, ratios['latency_median'],
+                ratios['peak_memory'], flag))
+
+    return regressions
@@ -4,7 +4,7 @@ Analytical option pricing models
 """
 
 import numpy as np
-import scipy.stats as si
+from optionmodels.normaldistribution import NormalDistribution
 from optionmodels.utils import Utils
 # pylint: disable=invalid-name
 
@@ -18,58 +18,77 @@ class AnalyticalMethods():
         """
         Black-Scholes-Merton Option price
 
+        Each of S, K, T, r, q and sigma may be a float or a NumPy array;
+        arrays are broadcast against each other so a whole chain can be
+        priced in a single call.
+
         Parameters
         ----------
-        S : Float
+        S : Float or Array
             Stock Price. The default is 100.
-        K : Float
+        K : Float or Array
             Strike Price. The default is 100.
-        T : Float
+        T : Float or Array
             Time to Maturity.  The default is 0.25 (3 Months).
-        r : Float
+        r : Float or Array
             Interest Rate. The default is 0.005 (50bps)
-        q : Float
+        q : Float or Array
             Dividend Yield.  The default is 0.
-        sigma : Float
+        sigma : Float or Array
             Implied Volatility.  The default is 0.2 (20%).
-        option : Str
-            Type of option. 'put' or 'call'. The default is 'call'.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
 
         Returns
         -------
-        opt_price : Float
+        opt_price : Float or Array
             Option Price.
 
         """
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            option = params['option']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        option = params['option']
+
+        return AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, sigma, Utils.option_sign(option))
+
+
+    @staticmethod
+    def _black_scholes_merton(S, K, T, r, q, sigma, z):
+        """
+        Black-Scholes-Merton Option price from resolved inputs, used by
+        methods that reprice repeatedly.
+
+        Parameters
+        ----------
+        z : Int or Array
+            Payoff sign, 1 for calls and -1 for puts.
 
+        Returns
+        -------
+        opt_price : Float or Array
+            Option Price.
+
+        """
         b = r - q
         carry = np.exp((b - r) * T)
-        d1 = ((np.log(S / K) + (b + (0.5 * sigma ** 2)) * T)
-              / (sigma * np.sqrt(T)))
-        d2 = ((np.log(S / K) + (b - (0.5 * sigma ** 2)) * T)
-              / (sigma * np.sqrt(T)))
+        df = np.exp(-r * T)
+        vol_root_T = sigma * np.sqrt(T)
+        d1 = (np.log(S / K) + (b + (0.5 * sigma ** 2)) * T) / vol_root_T
+        d2 = d1 - vol_root_T
 
         # Cumulative normal distribution function
-        Nd1 = si.norm.cdf(d1, 0.0, 1.0)
-        minusNd1 = si.norm.cdf(-d1, 0.0, 1.0)
-        Nd2 = si.norm.cdf(d2, 0.0, 1.0)
-        minusNd2 = si.norm.cdf(-d2, 0.0, 1.0)
+        Nzd1 = NormalDistribution.cdf(z * d1)
+        Nzd2 = NormalDistribution.cdf(z * d2)
 
-        if option == "call":
-            opt_price = ((S * carry * Nd1) - (K * np.exp(-r * T) * Nd2))
-        if option == 'put':
-            opt_price = ((K * np.exp(-r * T) * minusNd2) -
-                         (S * carry * minusNd1))
+        opt_price = z * ((S * carry * Nzd1) - (K * df * Nzd2))
 
         return opt_price
 
@@ -104,77 +123,350 @@ class AnalyticalMethods():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+
+        return AnalyticalMethods._black_scholes_merton_vega(
+            S, K, T, r, q, sigma)
+
+
+    @staticmethod
+    def _black_scholes_merton_vega(S, K, T, r, q, sigma):
+        """
+        Black-Scholes-Merton Option Vega from resolved inputs, used by
+        methods that reprice repeatedly.
+
+        Returns
+        -------
+        opt_vega : Float or Array
+            Option Vega.
 
+        """
         b = r - q
         carry = np.exp((b - r) * T)
         d1 = ((np.log(S / K) + (b + (0.5 * sigma ** 2)) * T)
               / (sigma * np.sqrt(T)))
-        nd1 = (1 / np.sqrt(2 * np.pi)) * (np.exp(-d1 ** 2 * 0.5))
+        nd1 = NormalDistribution.pdf(d1)
 
         opt_vega = S * carry * nd1 * np.sqrt(T)
 
         return opt_vega
 
 
+    @staticmethod
+    def black_scholes_merton_greeks(**kwargs):
+        """
+        Black-Scholes-Merton analytic Greeks. The d1 / d2 terms and the
+        normal distribution values are calculated once and shared by
+        every Greek that is requested.
+
+        Parameters
+        ----------
+        S : Float or Array
+            Stock Price. The default is 100.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float or Array
+            Dividend Yield.  The default is 0.
+        sigma : Float or Array
+            Implied Volatility.  The default is 0.2 (20%).
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        output_flag : Str or List
+            Any of 'price', 'delta', 'gamma', 'vega', 'theta', 'rho',
+            'vanna', 'volga' or 'charm', a list of these, or 'all'. The
+            default is 'price'.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                Str : Float or Array; the selected Greek
+                List : Dict; the selected Greeks
+                'all' : Dict; Option Price, Delta, Gamma, Vega, Theta,
+                        Rho, Vanna, Volga and Charm
+
+            Theta and Charm are per calendar day, Vega, Vanna and Volga
+            are per unit of volatility and Rho per unit of interest rate.
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        option = params['option']
+        output_flag = params['output_flag']
+
+        greek_names = ['price', 'delta', 'gamma', 'vega', 'theta', 'rho',
+                       'vanna', 'volga', 'charm']
+        if output_flag == 'all':
+            flags = greek_names
+        elif isinstance(output_flag, str):
+            flags = [output_flag]
+        else:
+            flags = list(output_flag)
+
+        # Payoff sign, 1 for calls and -1 for puts
+        z = Utils.option_sign(option)
+
+        b = r - q
+        root_T = np.sqrt(T)
+        carry = np.exp((b - r) * T)
+        df = np.exp(-r * T)
+        vol_root_T = sigma * root_T
+        d1 = (np.log(S / K) + (b + (0.5 * sigma ** 2)) * T) / vol_root_T
+        d2 = d1 - vol_root_T
+
+        # Cumulative normal distribution function
+        Nzd1 = NormalDistribution.cdf(z * d1)
+        Nzd2 = NormalDistribution.cdf(z * d2)
+
+        # Standardised normal density function
+        nd1 = NormalDistribution.pdf(d1)
+
+        vega = S * carry * nd1 * root_T
+
+        greeks = {}
+        for flag in flags:
+            if flag == 'price':
+                greeks['Price'] = z * ((S * carry * Nzd1) - (K * df * Nzd2))
+            elif flag == 'delta':
+                greeks['Delta'] = z * carry * Nzd1
+            elif flag == 'gamma':
+                greeks['Gamma'] = carry * nd1 / (S * vol_root_T)
+            elif flag == 'vega':
+                greeks['Vega'] = vega
+            elif flag == 'theta':
+                greeks['Theta'] = (
+                    - (S * carry * nd1 * sigma / (2 * root_T))
+                    - (z * (b - r) * S * carry * Nzd1)
+                    - (z * r * K * df * Nzd2)) / 365
+            elif flag == 'rho':
+                greeks['Rho'] = z * T * K * df * Nzd2
+            elif flag == 'vanna':
+                greeks['Vanna'] = -carry * nd1 * d2 / sigma
+            elif flag == 'volga':
+                greeks['Volga'] = vega * d1 * d2 / sigma
+            elif flag == 'charm':
+                greeks['Charm'] = -carry * (
+                    nd1 * ((b / vol_root_T) - (d2 / (2 * T)))
+                    + (z * (b - r) * Nzd1)) / 365
+            else:
+                return "Please select a valid output flag"
+
+        if isinstance(output_flag, str) and output_flag != 'all':
+            return greeks[output_flag.capitalize()]
+
+        return greeks
+
+
     @staticmethod
     def black_76(**kwargs):
         """
         Black 76 Futures Option price
 
+        Each of F, K, T, r and sigma may be a float or a NumPy array;
+        arrays are broadcast against each other so a whole chain can be
+        priced in a single call.
+
         Parameters
         ----------
-        F : Float
+        F : Float or Array
             Discounted Futures Price.
-        K : Float
+        K : Float or Array
             Strike Price. The default is 100.
-        T : Float
+        T : Float or Array
             Time to Maturity.  The default is 0.25 (3 Months).
-        r : Float
+        r : Float or Array
             Interest Rate. The default is 0.005 (50bps)
-        sigma : Float
+        sigma : Float or Array
             Implied Volatility.  The default is 0.2 (20%).
-        option : Str
-            Type of option. 'put' or 'call'. The default is 'call'.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
 
         Returns
         -------
-        opt_price : Float
+        opt_price : Float or Array
             Option Price.
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            F = params['F']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            sigma = params['sigma']
-            option = params['option']
-
-        carry = np.exp(-r * T)
-        d1 = (np.log(F / K) + (0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = (np.log(F / K) + (-0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+        params = Utils.init_params(kwargs)
+        F = params['F']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        sigma = params['sigma']
+        option = params['option']
+
+        return AnalyticalMethods._black_76(
+            F, K, T, r, sigma, Utils.option_sign(option))
+
+
+    @staticmethod
+    def _black_76(F, K, T, r, sigma, z):
+        """
+        Black 76 Futures Option price from resolved inputs, used by
+        methods that reprice repeatedly.
+
+        Parameters
+        ----------
+        z : Int or Array
+            Payoff sign, 1 for calls and -1 for puts.
+
+        Returns
+        -------
+        opt_price : Float or Array
+            Option Price.
+
+        """
+        df = np.exp(-r * T)
+        vol_root_T = sigma * np.sqrt(T)
+        d1 = (np.log(F / K) + (0.5 * sigma ** 2) * T) / vol_root_T
+        d2 = d1 - vol_root_T
 
         # Cumulative normal distribution function
-        Nd1 = si.norm.cdf(d1, 0.0, 1.0)
-        minusNd1 = si.norm.cdf(-d1, 0.0, 1.0)
-        Nd2 = si.norm.cdf(d2, 0.0, 1.0)
-        minusNd2 = si.norm.cdf(-d2, 0.0, 1.0)
+        Nzd1 = NormalDistribution.cdf(z * d1)
+        Nzd2 = NormalDistribution.cdf(z * d2)
 
-        if option == "call":
-            opt_price = ((F * carry * Nd1) - (K * np.exp(-r * T) * Nd2))
-        if option == 'put':
-            opt_price = ((K * np.exp(-r * T) * minusNd2)
-                         - (F * carry * minusNd1))
+        opt_price = z * df * ((F * Nzd1) - (K * Nzd2))
 
         return opt_price
+
+
+    @staticmethod
+    def black_76_greeks(**kwargs):
+        """
+        Black 76 Futures Option analytic Greeks. The d1 / d2 terms, the
+        discount factor and the normal distribution values are
+        calculated once and shared by every Greek that is requested.
+
+        Parameters
+        ----------
+        F : Float or Array
+            Discounted Futures Price.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        sigma : Float or Array
+            Implied Volatility.  The default is 0.2 (20%).
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        output_flag : Str or List
+            Any of 'price', 'delta', 'gamma', 'vega' or 'theta', a list of
+            these, or 'all'. The default is 'price'.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                Str : Float or Array; the selected Greek
+                List : Dict; the selected Greeks
+                'all' : Dict; Option Price, Delta, Gamma, Vega and Theta
+
+            Delta and Gamma are with respect to the futures price, Theta
+            is per calendar day and Vega per unit of volatility.
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        F = params['F']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        sigma = params['sigma']
+        option = params['option']
+        output_flag = params['output_flag']
+
+        if output_flag == 'all':
+            flags = ['price', 'delta', 'gamma', 'vega', 'theta']
+        elif isinstance(output_flag, str):
+            flags = [output_flag]
+        else:
+            flags = list(output_flag)
+
+        greeks = AnalyticalMethods._black_76_greeks(
+            F, K, T, r, sigma, Utils.option_sign(option), flags)
+
+        if greeks is None:
+            return "Please select a valid output flag"
+
+        if isinstance(output_flag, str) and output_flag != 'all':
+            return greeks[output_flag.capitalize()]
+
+        return greeks
+
+
+    @staticmethod
+    def _black_76_greeks(F, K, T, r, sigma, z, flags):
+        """
+        Black 76 Futures Option Greeks from resolved inputs, used by
+        methods that need several Greeks of a chain at once.
+
+        Parameters
+        ----------
+        z : Int or Array
+            Payoff sign, 1 for calls and -1 for puts.
+        flags : List
+            Any of 'price', 'delta', 'gamma', 'vega' or 'theta'.
+
+        Returns
+        -------
+        greeks : Dict
+            Option Price and the selected Greeks, keyed by capitalised
+            name, or None if a flag is not recognised.
+
+        """
+        root_T = np.sqrt(T)
+        df = np.exp(-r * T)
+        vol_root_T = sigma * root_T
+        d1 = (np.log(F / K) + (0.5 * sigma ** 2) * T) / vol_root_T
+        d2 = d1 - vol_root_T
+
+        # Cumulative normal distribution function
+        Nzd1 = NormalDistribution.cdf(z * d1)
+        Nzd2 = NormalDistribution.cdf(z * d2)
+
+        # Standardised normal density function
+        nd1 = NormalDistribution.pdf(d1)
+
+        greeks = {}
+        for flag in flags:
+            if flag == 'price':
+                greeks['Price'] = z * df * ((F * Nzd1) - (K * Nzd2))
+            elif flag == 'delta':
+                greeks['Delta'] = z * df * Nzd1
+            elif flag == 'gamma':
+                greeks['Gamma'] = df * nd1 / (F * vol_root_T)
+            elif flag == 'vega':
+                greeks['Vega'] = F * df * nd1 * root_T
+            elif flag == 'theta':
+                greeks['Theta'] = (
+                    - (F * df * nd1 * sigma / (2 * root_T))
+                    + (z * r * df * ((F * Nzd1) - (K * Nzd2)))) / 365
+            else:
+                return None
+
+        return greeks
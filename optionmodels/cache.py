@@ -0,0 +1,413 @@
+"""
+Bounded caches of pricing results and implied volatility seeds
+
+"""
+
+import copy
+import numbers
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+import numpy as np
+
+
+class PricerCache():
+    """
+    Least recently used cache of pricing results with optional time to
+    live, keyed on the method and its inputs quantised to a tolerance so
+    that near identical requests share an entry.
+
+    """
+    # Parameters that do not affect the result
+    ignored_params = ('timing', 'refresh', 'cache', 'cache_size',
+                      'cache_ttl', 'cache_tolerance', 'iv_seed_cache',
+                      'iv_seed_cache_size', 'iv_seed_cache_ttl',
+                      'iv_seed_cache_tolerance', 'underlying')
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 tolerance: float = 1e-8,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Parameters
+        ----------
+        maxsize : Int
+            Maximum number of entries. The default is 1024.
+        ttl : Float
+            Seconds an entry stays valid, or None for no expiry. The
+            default is None.
+        tolerance : Float
+            Float inputs are rounded to a multiple of this before being
+            used in the key. The default is 1e-8.
+        clock : Function
+            Returns the current time in seconds. The default is
+            time.monotonic.
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tolerance = tolerance
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.saved_time = 0.0
+
+
+    def make_key(self, method: str, params) -> Optional[tuple]:
+        """
+        Build the cache key for a call
+
+        Parameters
+        ----------
+        method : Str
+            Name identifying the calculation, e.g. 'price' or
+            'impliedvol'.
+        params : ModelParams
+            Resolved parameters of the call.
+
+        Returns
+        -------
+        Tuple or None
+            The key, or None if the call should not be cached because an
+            input is an array or the method is a Monte Carlo one with no
+            mc_seed, whose result changes on every call.
+
+        """
+        if params['mc_seed'] is None and (
+                params['option_method'] in params['montecarlo_dict']):
+            return None
+
+        key = [method]
+        for name in params['params_list']:
+            if name in self.ignored_params:
+                continue
+            value = params[name]
+            if isinstance(value, np.ndarray):
+                return None
+            if isinstance(value, list):
+                value = tuple(value)
+            if isinstance(value, numbers.Real) and not isinstance(
+                    value, (bool, np.bool_)):
+                value = round(value / self.tolerance)
+            key.append(value)
+
+        return tuple(key)
+
+
+    def get(self, key: tuple):
+        """
+        Look up a key, refreshing its recency on a hit
+
+        Parameters
+        ----------
+        key : Tuple
+            Cache key.
+
+        Returns
+        -------
+        found : Bool
+            Whether a valid entry was found.
+        value : Various
+            The cached result, or None.
+
+        """
+        entry = self.entries.get(key)
+        if entry is not None and self.ttl is not None and (
+                self.clock() > entry[1]):
+            del self.entries[key]
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.saved_time += entry[2]
+
+        return True, entry[0]
+
+
+    def put(self, key: tuple, value, compute_time: float) -> None:
+        """
+        Store a result, evicting the least recently used entries if the
+        cache is full
+
+        Parameters
+        ----------
+        key : Tuple
+            Cache key.
+        value : Various
+            Result to store.
+        compute_time : Float
+            Seconds taken to calculate the result.
+
+        """
+        expiry = None if self.ttl is None else self.clock() + self.ttl
+        self.entries[key] = (value, expiry, compute_time)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+    def call(self, method: str, params, func: Callable):
+        """
+        Return the cached result of func(params=params), calculating and
+        storing it on a miss
+
+        Parameters
+        ----------
+        method : Str
+            Name identifying the calculation.
+        params : ModelParams
+            Resolved parameters of the call.
+        func : Function
+            Pricing or implied volatility method.
+
+        Returns
+        -------
+        Various
+            Result of the method.
+
+        """
+        key = self.make_key(method, params)
+        if key is None:
+            return func(params=params)
+
+        found, value = self.get(key)
+        if not found:
+            start = time.perf_counter()
+            value = func(params=params)
+            self.put(key, value, time.perf_counter() - start)
+
+        # Copy mutable results so callers cannot alter the cached entry
+        if isinstance(value, (dict, np.ndarray)):
+            return copy.deepcopy(value)
+
+        return value
+
+
+    def stats(self) -> dict:
+        """
+        Cache usage statistics
+
+        Returns
+        -------
+        Dict
+            Hits, misses, hit rate, LRU evictions, TTL expirations,
+            current size and compute time saved by hits in seconds.
+
+        """
+        requests = self.hits + self.misses
+
+        return {
+            'hits':self.hits,
+            'misses':self.misses,
+            'hit_rate':self.hits / requests if requests else 0.0,
+            'evictions':self.evictions,
+            'expirations':self.expirations,
+            'size':len(self.entries),
+            'saved_time':self.saved_time
+            }
+
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the statistics
+
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.saved_time = 0.0
+
+
+class IVSeedCache():
+    """
+    Least recently used store of the last implied volatility solved for
+    each contract, with optional time to live, used to warm start Newton
+    on the next quote of the same contract.
+
+    Contracts are keyed on the underlying, strike, time to maturity and
+    option type, with strike and time to maturity rounded to a tolerance.
+    The underlying is an identifier supplied by the caller, e.g. a
+    ticker, rather than the spot price, which moves between quotes of
+    the same contract; without one, contracts on different underlyings
+    with the same terms share an entry. Each entry keeps the Newton steps
+    the contract took from a cold start, so that later warm starts can
+    report the iterations they saved.
+
+    """
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = None,
+                 tolerance: float = 1e-4,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Parameters
+        ----------
+        maxsize : Int
+            Maximum number of contracts. The default is 10000.
+        ttl : Float
+            Seconds a seed stays valid, or None for no expiry. The
+            default is None.
+        tolerance : Float
+            Strike and time to maturity are rounded to a multiple of this
+            before being used in the key. The default is 1e-4.
+        clock : Function
+            Returns the current time in seconds. The default is
+            time.monotonic.
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tolerance = tolerance
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.iterations_saved = 0
+
+
+    def make_keys(self, K, T, z, underlying=None) -> list:
+        """
+        Build the key of each contract
+
+        Parameters
+        ----------
+        K, T : Float or Array
+            Strike and time to maturity.
+        z : Int or Array
+            Payoff sign, 1 for calls and -1 for puts.
+        underlying : Hashable or Array
+            Identifier of the underlying of each contract. The default
+            is None.
+
+        Returns
+        -------
+        List
+            Key of each contract in the broadcast inputs, in flat order.
+
+        """
+        K, T, z, underlying = (np.ravel(x) for x in np.broadcast_arrays(
+            K, T, z, np.asarray(underlying, dtype=object)))
+
+        return list(zip(underlying.tolist(),
+                        np.round(K / self.tolerance).astype(int).tolist(),
+                        np.round(T / self.tolerance).astype(int).tolist(),
+                        np.asarray(z, dtype=int).tolist()))
+
+
+    def get(self, keys: list) -> np.ndarray:
+        """
+        Look up the seed of each contract, refreshing its recency on a hit
+
+        Parameters
+        ----------
+        keys : List
+            Contract keys.
+
+        Returns
+        -------
+        Array
+            Last solved vol of each contract, NaN where there is no
+            valid entry.
+
+        """
+        seeds = np.full(len(keys), np.nan)
+        now = self.clock() if self.ttl is not None else None
+        for row, key in enumerate(keys):
+            entry = self.entries.get(key)
+            if entry is not None and now is not None and now > entry[2]:
+                del self.entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                continue
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            seeds[row] = entry[0]
+
+        return seeds
+
+
+    def put(self, keys: list, vols, iterations) -> None:
+        """
+        Store solved vols, recording the iterations saved by contracts
+        that were warm started, and evict the least recently used
+        contracts if the cache is full
+
+        Parameters
+        ----------
+        keys : List
+            Contract keys.
+        vols : Float or Array
+            Solved vol of each contract, NaN where the solve failed.
+        iterations : Int or Array
+            Newton steps taken by each contract.
+
+        """
+        expiry = None if self.ttl is None else self.clock() + self.ttl
+        for key, vol, steps in zip(keys, np.ravel(vols).tolist(),
+                                   np.ravel(iterations).tolist()):
+            if not vol > 0:
+                continue
+            entry = self.entries.get(key)
+            if entry is None:
+                cold_steps = steps
+            else:
+                cold_steps = entry[1]
+                self.iterations_saved += max(cold_steps - steps, 0)
+            self.entries[key] = (vol, cold_steps, expiry)
+            self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+    def stats(self) -> dict:
+        """
+        Seed cache usage statistics
+
+        Returns
+        -------
+        Dict
+            Hits, misses, hit rate, LRU evictions, TTL expirations,
+            current size and Newton iterations saved by warm starts.
+
+        """
+        requests = self.hits + self.misses
+
+        return {
+            'hits':self.hits,
+            'misses':self.misses,
+            'hit_rate':self.hits / requests if requests else 0.0,
+            'evictions':self.evictions,
+            'expirations':self.expirations,
+            'size':len(self.entries),
+            'iterations_saved':self.iterations_saved
+            }
+
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the statistics
+
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.iterations_saved = 0
@@ -36,11 +36,6 @@ class FiniteDifference():
             Type of option. 'put' or 'call'. The default is 'call'.
         american : Bool
             Whether the option is American. The default is False.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
 
         Returns
         -------
@@ -50,17 +45,16 @@ class FiniteDifference():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            nodes = params['nodes']
-            option = params['option']
-            american = params['american']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        nodes = params['nodes']
+        option = params['option']
+        american = params['american']
 
         if option == 'call':
             z = 1
@@ -134,11 +128,6 @@ class FiniteDifference():
             Type of option. 'put' or 'call'. The default is 'call'.
         american : Bool
             Whether the option is American. The default is False.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
 
         Returns
         -------
@@ -149,18 +138,17 @@ class FiniteDifference():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps = params['steps']
-            nodes = params['nodes']
-            option = params['option']
-            american = params['american']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        steps = params['steps']
+        nodes = params['nodes']
+        option = params['option']
+        american = params['american']
 
         if option == 'call':
             z = 1
@@ -232,11 +220,6 @@ class FiniteDifference():
             Type of option. 'put' or 'call'. The default is 'call'.
         american : Bool
             Whether the option is American. The default is False.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
 
         Returns
         -------
@@ -246,18 +229,17 @@ class FiniteDifference():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps_itt = params['steps_itt']
-            nodes = params['nodes']
-            option = params['option']
-            american = params['american']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        steps_itt = params['steps_itt']
+        nodes = params['nodes']
+        option = params['option']
+        american = params['american']
 
         if option == 'call':
             z = 1
@@ -324,11 +306,6 @@ class FiniteDifference():
             Type of option. 'put' or 'call'. The default is 'call'.
         american : Bool
             Whether the option is American. The default is False.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
 
         Returns
         -------
@@ -338,18 +315,17 @@ class FiniteDifference():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps = params['steps']
-            nodes = params['nodes']
-            option = params['option']
-            american = params['american']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        steps = params['steps']
+        nodes = params['nodes']
+        option = params['option']
+        american = params['american']
 
         if option == 'call':
             z = 1
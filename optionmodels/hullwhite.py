@@ -4,10 +4,10 @@ Hull-White option pricing methods
 """
 
 import numpy as np
-import scipy.stats as si
 from optionmodels.analyticalmethods import AnalyticalMethods
+from optionmodels.normaldistribution import NormalDistribution
 from optionmodels.utils import Utils
-# pylint: disable=invalid-name
+# pylint: disable=invalid-name, protected-access
 
 class HullWhite():
     """
@@ -37,11 +37,6 @@ class HullWhite():
             Vol of vol. The default is 0.5.
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
 
         Returns
         -------
@@ -51,16 +46,15 @@ class HullWhite():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            vvol = params['vvol']
-            option = params['option']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        vvol = params['vvol']
+        option = params['option']
 
         k = vvol ** 2 * T
         ek = np.exp(k)
@@ -68,10 +62,10 @@ class HullWhite():
         d1 = ((np.log(S / K) + (b + (sigma ** 2) / 2) * T)
               / (sigma * np.sqrt(T)))
         d2 = d1 - sigma * np.sqrt(T)
-        Nd1 = si.norm.cdf(d1, 0.0, 1.0)
+        Nd1 = NormalDistribution.cdf(d1)
 
-        cgbs = AnalyticalMethods.black_scholes_merton(
-            S=S, K=K, T=T, r=r, q=q, sigma=sigma, option='call', refresh=True)
+        cgbs = AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, sigma, 1)
 
         # Partial Derivatives
         cVV = (S
@@ -141,11 +135,6 @@ class HullWhite():
             default is 0.
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
 
         Returns
         -------
@@ -155,19 +144,18 @@ class HullWhite():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sig0 = params['sig0']
-            sigLR = params['sigLR']
-            halflife = params['halflife']
-            vvol = params['vvol']
-            rho = params['rho']
-            option = params['option']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sig0 = params['sig0']
+        sigLR = params['sigLR']
+        halflife = params['halflife']
+        vvol = params['vvol']
+        rho = params['rho']
+        option = params['option']
 
         b = r - q
         # Find constant, beta, from Half-life
@@ -189,11 +177,11 @@ class HullWhite():
         d2 = d1 - np.sqrt(vbar * T)
 
         # standardised normal density function
-        nd1 = (1 / np.sqrt(2 * np.pi)) * (np.exp(-d1 ** 2 * 0.5))
+        nd1 = NormalDistribution.pdf(d1)
 
         # Cumulative normal distribution function
-        Nd1 = si.norm.cdf(d1, 0.0, 1.0)
-        Nd2 = si.norm.cdf(d2, 0.0, 1.0)
+        Nd1 = NormalDistribution.cdf(d1)
+        Nd2 = NormalDistribution.cdf(d2)
 
         # Partial derivatives
         cSV = (-S * np.exp((b - r) * T) * nd1 * (d2 / (2 * vbar)))
@@ -3,10 +3,39 @@ Methods for extracting implied volatility from option prices
 
 """
 
+import time
 import numpy as np
 from optionmodels.analyticalmethods import AnalyticalMethods
+from optionmodels.ivseeds import ImpliedVolSeeds
+from optionmodels.normaldistribution import NormalDistribution, INV_ROOT_2PI
 from optionmodels.utils import Utils
-# pylint: disable=invalid-name
+# pylint: disable=invalid-name, protected-access
+
+# Householder steps taken by the rational solver, enough to reach the
+# conditioning limit of the normalised price from the rational seeds
+HOUSEHOLDER_STEPS = 4
+
+# Volatility bracket searched by the Brent solver
+BRENT_BRACKET = (1e-8, 10.0)
+
+# Doublings of the search either side of the guess before the implied
+# parameter bracket is reached
+BRACKET_STEPS = 6
+
+# Status codes returned by the Brent solver
+CONVERGED = 0
+MAX_ITERATIONS = 1
+OUTSIDE_BOUNDS = 2
+NO_BRACKET = 3
+
+# Fields of the per contract diagnostics returned by ImpliedVol.record
+IV_RECORD_DTYPE = np.dtype([
+    ('vol', np.float64),
+    ('status', np.int8),
+    ('iterations', np.int32),
+    ('price_error', np.float64),
+    ('wall_time', np.float64),
+    ])
 
 class ImpliedVol():
     """
@@ -38,65 +67,1249 @@ class ImpliedVol():
             Degree of precision. The default is 0.0001
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
+        iv_seed : Str
+            Initial guess, a key of iv_seed_dict. The default is None,
+            'mk' for a single contract and 'auto' for arrays.
+        iv_warm_start : Float
+            Previous solution used as the initial guess instead, if
+            positive. The default is None.
+        output_flag : Str
+            'all' to also return the diagnostics. The default is 'price',
+            returning only the vol.
 
         Returns
         -------
-        result : Float
-            Implied Volatility.
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations, the number of
+                        Newton steps, and Error, the price at the vol
+                        less cm, where Status is CONVERGED (0),
+                        MAX_ITERATIONS (1) if the steps stop improving
+                        or OUTSIDE_BOUNDS (2)
+                Otherwise : Float; Implied Volatility, or 'NA' if the
+                            iteration fails
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            cm = params['cm']
-            epsilon = params['epsilon']
-            option = params['option']
-
-        # Manaster and Koehler seed value
-        vi = np.sqrt(abs(np.log(S / K) + r * T) * (2 / T))
-
-        ci = AnalyticalMethods.black_scholes_merton(
-            S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option, refresh=True)
-
-        vegai = AnalyticalMethods.black_scholes_merton_vega(
-            S=S, K=K, T=T, r=r, q=q, sigma=vi, refresh=True)
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        cm = params['cm']
+        epsilon = params['epsilon']
+        option = params['option']
+
+        # Payoff sign, 1 for calls and -1 for puts
+        z = Utils.option_sign(option)
+
+        # Seed value, Manaster and Koehler with iv_seed 'mk'
+        vi = ImpliedVolSeeds.seed(S, K, T, r, q, cm, z, params['iv_seed'],
+                                  params['iv_warm_start'])
+
+        # The seed is NaN outside the no arbitrage bounds
+        status = OUTSIDE_BOUNDS if np.isnan(vi) else MAX_ITERATIONS
+
+        ci = AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, vi, z)
+
+        vegai = AnalyticalMethods._black_scholes_merton_vega(
+            S, K, T, r, q, vi)
 
         mindiff = abs(cm - ci)
+        iterations = 0
 
         while abs(cm - ci) >= epsilon and abs(cm - ci) <= mindiff:
             vi = vi - (ci - cm) / vegai
+            iterations += 1
 
-            ci = AnalyticalMethods.black_scholes_merton(
-                S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option, refresh=True)
+            ci = AnalyticalMethods._black_scholes_merton(
+                S, K, T, r, q, vi, z)
 
-            vegai = AnalyticalMethods.black_scholes_merton_vega(
-                S=S, K=K, T=T, r=r, q=q, sigma=vi, refresh=True)
+            vegai = AnalyticalMethods._black_scholes_merton_vega(
+                S, K, T, r, q, vi)
 
             mindiff = abs(cm - ci)
 
         if abs(cm - ci) < epsilon:
             result = vi
+            status = CONVERGED
         else:
             result = 'NA'
 
+        if params['output_flag'] == 'all':
+            return {
+                'Vol':result,
+                'Status':status,
+                'Iterations':iterations,
+                'Error':ci - cm if status == CONVERGED else np.nan
+                }
+
         return result
 
 
+    @staticmethod
+    def implied_vol_newton_raphson_batch(**kwargs):
+        """
+        Finds implied volatility for a whole chain of option prices using
+        Newton-Raphson. Each iteration prices only the rows that have not
+        yet converged, with the price and vega sharing a single d1
+        calculation.
+
+        Each of S, K, T, r, q, cm and option may be a float or a NumPy
+        array; arrays are broadcast against each other.
+
+        Parameters
+        ----------
+        S : Float or Array
+            Stock Price. The default is 100.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float or Array
+            Dividend Yield.  The default is 0.
+        cm : Float or Array
+            # Option price used to solve for vol. The default is 5.
+        epsilon : Float
+            Degree of precision. The default is 0.0001
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        max_iterations : Int
+            Maximum number of Newton steps. The default is 100.
+        iv_seed : Str
+            Initial guess, a key of iv_seed_dict. The default is None,
+            'mk' for a single contract and 'auto' for arrays.
+        iv_warm_start : Float or Array
+            Previous solutions used as the initial guess instead wherever
+            they are positive. The default is None.
+        output_flag : Str
+            'all' to also return the diagnostics of each contract. The
+            default is 'price', returning only the vol.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations, the number of
+                        Newton steps, and Error, the price at the vol
+                        less cm, where Status is CONVERGED (0) or that
+                        of the Brent fallback
+                Otherwise : Float or Array; Implied Volatility, NaN where
+                            the price is outside the no arbitrage bounds
+                            or neither Newton-Raphson nor the Brent
+                            solver used as a fallback converges
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, cm, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['cm'], z))
+        epsilon = params['epsilon']
+
+        # Seeds are NaN outside the no arbitrage bounds
+        vi = np.array(ImpliedVolSeeds.seed(
+            S, K, T, r, q, cm, z, params['iv_seed'],
+            params['iv_warm_start']))
+
+        result, iterations = ImpliedVol._newton_batch(
+            S, K, T, r, q, cm, z, vi, epsilon, params['max_iterations'])
+
+        status = np.where(np.isfinite(result), CONVERGED, OUTSIDE_BOUNDS)
+
+        # Fall back to the Brent solver for rows Newton failed on
+        failed = np.flatnonzero(np.isnan(result) & np.isfinite(vi))
+        if failed.size:
+            brent, brent_status, _, _ = ImpliedVol._brent(
+                S, K, T, r, q, cm, z, epsilon, params['max_iterations'],
+                rows=failed)
+            result.flat[failed] = brent.flat[failed]
+            status.flat[failed] = brent_status.flat[failed]
+
+        return ImpliedVol._output(
+            params['output_flag'], result, status, iterations,
+            contract=(S, K, T, r, q, cm, z))
+
+
+    @staticmethod
+    def _newton_batch(S, K, T, r, q, cm, z, vi, epsilon, max_iterations):
+        """
+        Masked Newton-Raphson iteration over broadcast contract arrays
+
+        Parameters
+        ----------
+        vi : Array
+            Seed volatilities, NaN for rows that should not be solved.
+
+        Returns
+        -------
+        result : Array
+            Implied Volatility, NaN where the iteration fails.
+        iterations : Array
+            Newton steps taken by each row, 0 for rows that are not
+            solved and max_iterations for rows still iterating at the
+            end.
+
+        """
+        result = np.full(vi.shape, np.nan)
+        iterations = np.zeros(vi.shape, dtype=int)
+        idx = np.flatnonzero(np.isfinite(vi))
+
+        # Far from the root the tails can underflow or overflow, which
+        # the convergence and finiteness checks handle
+        with np.errstate(all='ignore'):
+            for _ in range(max_iterations):
+                if idx.size == 0:
+                    break
+
+                ci, vegai = ImpliedVol._price_and_vega(
+                    S.flat[idx], K.flat[idx], T.flat[idx], r.flat[idx],
+                    q.flat[idx], vi.flat[idx], z.flat[idx])
+                diff = ci - cm.flat[idx]
+
+                # Store converged rows and drop them from the working set
+                converged = np.abs(diff) < epsilon
+                result.flat[idx[converged]] = vi.flat[idx[converged]]
+
+                # Halve the vol instead of stepping through zero
+                step = vi.flat[idx] - diff / vegai
+                step = np.where(step > 0, step, 0.5 * vi.flat[idx])
+                keep = ~converged & np.isfinite(step)
+                idx = idx[keep]
+                vi.flat[idx] = step[keep]
+                iterations.flat[idx] += 1
+
+        return result, iterations
+
+
+    @staticmethod
+    def seed_iterations(**kwargs):
+        """
+        Compare the initial guesses in iv_seed_dict, and a fixed seed of
+        sigma, by the Newton-Raphson steps each needs to solve a set of
+        option prices.
+
+        Parameters
+        ----------
+        S, K, T, r, q, cm, option : Float or Array
+            Contracts and prices, as for implied_vol_newton_raphson_batch.
+        epsilon : Float
+            Degree of precision. The default is 0.0001
+        max_iterations : Int
+            Maximum number of Newton steps. The default is 100.
+        sigma : Float
+            Fixed seed used as a baseline. The default is 0.2 (20%).
+
+        Returns
+        -------
+        report : Dict
+            For each seed, the mean and maximum iterations of the rows
+            that converged and the number of rows that failed.
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, cm, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['cm'], z))
+
+        seeds = {name: np.array(ImpliedVolSeeds.seed(
+            S, K, T, r, q, cm, z, name)) for name in params['iv_seed_dict']}
+        seeds['sigma'] = np.where(
+            np.isfinite(seeds['auto']), params['sigma'], np.nan)
+
+        report = {}
+        for name, vi in seeds.items():
+            result, iterations = ImpliedVol._newton_batch(
+                S, K, T, r, q, cm, z, vi, params['epsilon'],
+                params['max_iterations'])
+            solved = np.isfinite(result)
+            report[name] = {
+                'mean':float(iterations[solved].mean()) if solved.any()
+                       else np.nan,
+                'max':int(iterations[solved].max()) if solved.any() else 0,
+                'failed':int(np.isfinite(vi).sum() - solved.sum())
+                }
+
+        return report
+
+
+    @staticmethod
+    def record(vol_method, **kwargs):
+        """
+        Solve with any implied vol method and return a structured array
+        of diagnostics for each contract, so that failures can be
+        filtered and iteration counts monitored without checks in Python
+        on each result.
+
+        Parameters
+        ----------
+        vol_method : Function
+            Implied vol method that supports output_flag 'all', e.g.
+            ImpliedVol.implied_vol_brent, or a partial of
+            implied_vol_model or implied_parameter bound to a model.
+        **kwargs : Various
+            Parameters of vol_method.
+
+        Returns
+        -------
+        record : Structured Array or Record
+            Fields of IV_RECORD_DTYPE in the broadcast shape of the
+            inputs, or a single record for scalar inputs:
+                vol : Implied Volatility, or the solved parameter, NaN
+                      where the solver failed
+                status : CONVERGED (0), MAX_ITERATIONS (1),
+                         OUTSIDE_BOUNDS (2) or NO_BRACKET (3)
+                iterations : Steps or model evaluations taken
+                price_error : Price at the vol less cm, NaN where the
+                              solver failed
+                wall_time : Seconds taken by the call, shared equally
+                            between the contracts solved together
+
+        """
+        params = Utils.init_params(kwargs)
+
+        start = time.perf_counter()
+        result = vol_method(params=params.replace(output_flag='all'))
+        wall_time = time.perf_counter() - start
+
+        # The scalar solvers return 'NA' when they fail
+        vol = result['Vol']
+        if isinstance(vol, str):
+            vol = np.nan
+
+        record = np.empty(np.shape(vol), dtype=IV_RECORD_DTYPE)
+        record['vol'] = vol
+        record['status'] = result['Status']
+        record['iterations'] = result['Iterations']
+        record['price_error'] = result['Error']
+        record['wall_time'] = wall_time / max(record.size, 1)
+
+        if record.ndim == 0:
+            return record[()]
+
+        return record
+
+
+    @staticmethod
+    def _price_and_vega(S, K, T, r, q, sigma, z):
+        """
+        Black-Scholes-Merton price and vega from one set of d1 / d2
+        terms, used by the Newton based solvers.
+
+        Returns
+        -------
+        opt_price : Array
+            Option Price.
+        opt_vega : Array
+            Option Vega.
+
+        """
+        root_T = np.sqrt(T)
+        carry_S = S * np.exp(-q * T)
+        df_K = K * np.exp(-r * T)
+        vol_root_T = sigma * root_T
+        d1 = (np.log(carry_S / df_K) / vol_root_T) + (0.5 * vol_root_T)
+        d2 = d1 - vol_root_T
+
+        opt_price = z * ((carry_S * NormalDistribution.cdf(z * d1))
+                         - (df_K * NormalDistribution.cdf(z * d2)))
+        opt_vega = carry_S * NormalDistribution.pdf(d1) * root_T
+
+        return opt_price, opt_vega
+
+
+    @staticmethod
+    def _price_error(S, K, T, r, q, cm, z, sigma):
+        """
+        Black-Scholes-Merton price at the solved vol less the quote, NaN
+        where there is no vol
+
+        """
+        with np.errstate(all='ignore'):
+            opt_price, _ = ImpliedVol._price_and_vega(
+                S, K, T, r, q, sigma, z)
+
+        return opt_price - cm
+
+
+    @staticmethod
+    def _output(output_flag, result, status, iterations, error=None,
+                contract=None):
+        """
+        Return the vol alone or, with output_flag 'all', a dict of the
+        vol and its diagnostics, as scalars for scalar inputs
+
+        Parameters
+        ----------
+        error : Array
+            Price error of each row. The default is None, in which case
+            it is found from the Black-Scholes-Merton price of the
+            contract, a tuple of S, K, T, r, q, cm and z.
+
+        """
+        if output_flag != 'all':
+            return float(result) if result.ndim == 0 else result
+
+        if error is None:
+            error = ImpliedVol._price_error(*contract, result)
+
+        if result.ndim == 0:
+            result, status, iterations, error = (
+                float(result), int(status), int(iterations), float(error))
+
+        return {
+            'Vol':result,
+            'Status':status,
+            'Iterations':iterations,
+            'Error':error
+            }
+
+
+    @staticmethod
+    def implied_vol_rational(**kwargs):
+        """
+        Finds implied volatility to close to machine precision in a fixed
+        number of steps, following the approach of Jaeckel's "Let's Be
+        Rational". The price is normalised to an out of the money Black
+        call in log moneyness x and total volatility s, seeded from
+        rational approximations of the lower and upper branches either
+        side of the inflection point and refined with Householder steps
+        on objectives that are close to linear on each branch.
+
+        Each of S, K, T, r, q, cm and option may be a float or a NumPy
+        array; arrays are broadcast against each other.
+
+        Parameters
+        ----------
+        S : Float or Array
+            Stock Price. The default is 100.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float or Array
+            Dividend Yield.  The default is 0.
+        cm : Float or Array
+            # Option price used to solve for vol. The default is 5.
+        epsilon : Float
+            Price tolerance for a CONVERGED status. The default is 0.0001
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        output_flag : Str
+            'all' to also return the diagnostics of each contract. The
+            default is 'price', returning only the vol.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations, the
+                        HOUSEHOLDER_STEPS taken, and Error, the price at
+                        the vol less cm, where Status is CONVERGED (0),
+                        MAX_ITERATIONS (1) if the price at the vol is
+                        further than epsilon from cm or OUTSIDE_BOUNDS (2)
+                Otherwise : Float or Array; Implied Volatility, NaN
+                            where the price is outside the no arbitrage
+                            bounds
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, cm, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['cm'], z))
+
+        result = ImpliedVol._rational_vol(S, K, T, r, q, cm, z)
+        solved = np.isfinite(result)
+        status = np.where(solved, CONVERGED, OUTSIDE_BOUNDS)
+
+        # Reprice so that rows the fixed steps leave short of epsilon are
+        # not reported as converged
+        error = None
+        if params['output_flag'] == 'all':
+            error = ImpliedVol._price_error(S, K, T, r, q, cm, z, result)
+            status = np.where(np.abs(error) > params['epsilon'],
+                              MAX_ITERATIONS, status)
+
+        return ImpliedVol._output(
+            params['output_flag'], result, status,
+            np.where(solved, HOUSEHOLDER_STEPS, 0), error=error)
+
+
+    @staticmethod
+    def _rational_vol(S, K, T, r, q, cm, z):
+        """
+        Rational solver over broadcast contract arrays
+
+        Returns
+        -------
+        result : Array
+            Implied Volatility, NaN where the price is outside the no
+            arbitrage bounds.
+
+        """
+        with np.errstate(all='ignore'):
+            x, beta, active = ImpliedVolSeeds.normalise(
+                S, K, T, r, q, cm, z)
+            s = ImpliedVol._rational_total_vol(beta, x)
+
+        return np.where(active, s / np.sqrt(np.where(T > 0, T, 1)),
+                        np.nan)
+
+
+    @staticmethod
+    def _rational_total_vol(beta, x):
+        """
+        Total volatility s = sigma * sqrt(T) of a normalised out of the
+        money call price beta at log moneyness x <= 0, starting from the
+        rational seeds.
+
+        Below the inflection point s_c = sqrt(2|x|) the objective is
+        1 / ln(b) - 1 / ln(beta), which is close to quadratic in s for
+        small prices, and above it b - beta. Each Householder step is
+        kept inside the branch that contains the root.
+
+        Returns
+        -------
+        s : Array
+            Total volatility.
+
+        """
+        s_c, lower = ImpliedVolSeeds.inflection(x, beta)
+        log_beta = np.log(beta)
+        s = ImpliedVolSeeds.rational(x, beta)
+
+        for _ in range(HOUSEHOLDER_STEPS):
+            log_scale, scaled = ImpliedVolSeeds.normalised_black(x, s)
+
+            # Derivatives of b relative to the vega b'
+            h = x * x / s ** 3 - 0.25 * s
+            k = h * h - 3 * x * x / s ** 4 - 0.25
+
+            # Lower branch: g = 1 / L with L = ln(b), L' = b' / b
+            L = log_scale + np.log(scaled)
+            L1 = INV_ROOT_2PI / scaled
+            L2 = L1 * h - L1 ** 2
+            L3 = L1 * k - 3 * L1 ** 2 * h + 2 * L1 ** 3
+            g_lower = 1 / L - 1 / log_beta
+            g1_lower = -L1 / L ** 2
+            g2_lower = -L2 / L ** 2 + 2 * L1 ** 2 / L ** 3
+            g3_lower = (-L3 / L ** 2 + 6 * L1 * L2 / L ** 3
+                        - 6 * L1 ** 3 / L ** 4)
+
+            # Upper branch: g = b - beta
+            vega = INV_ROOT_2PI * np.exp(log_scale)
+            g = np.where(lower, g_lower, np.exp(log_scale) * scaled - beta)
+            g1 = np.where(lower, g1_lower, vega)
+            g2 = np.where(lower, g2_lower, vega * h)
+            g3 = np.where(lower, g3_lower, vega * k)
+
+            # Third order Householder step
+            nu = -g / g1
+            h2 = g2 / g1
+            h3 = g3 / g1
+            step = s + nu * (1 + 0.5 * h2 * nu) / (
+                1 + nu * (h2 + h3 * nu / 6))
+
+            # Keep the step inside the branch containing the root
+            step = np.where(np.isfinite(step), step, s)
+            step = np.where(lower & (step <= 0), 0.5 * s, step)
+            step = np.where(lower & (step > s_c), 0.5 * (s + s_c), step)
+            s = np.where(~lower & (step < s_c), 0.5 * (s + s_c), step)
+
+        return s
+
+
+    @staticmethod
+    def implied_vol_table(**kwargs):
+        """
+        Finds approximate implied volatility by bilinear interpolation in
+        a precomputed table of total volatility over normalised log
+        moneyness and normalised price, see ImpliedVolTable, optionally
+        polished with one Newton-Raphson step. Intended for screening and
+        bulk processing of very large numbers of quotes, which should be
+        passed in arrays of a few million at a time.
+
+        Each of S, K, T, r, q, cm and option may be a float or a NumPy
+        array; arrays are broadcast against each other.
+
+        Parameters
+        ----------
+        S : Float or Array
+            Stock Price. The default is 100.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float or Array
+            Dividend Yield.  The default is 0.
+        cm : Float or Array
+            # Option price used to solve for vol. The default is 5.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        iv_table : Str or Array
+            Path of a table saved by ImpliedVolTable.build, which is
+            memory-mapped, or the table itself. The default is None, a
+            table built in memory on first use.
+        iv_table_polish : Bool
+            Whether to take one Newton-Raphson step from the interpolated
+            vol. The default is True.
+        output_flag : Str
+            'all' to also return the diagnostics of each contract. The
+            default is 'price', returning only the vol.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations, the number of
+                        Newton steps taken, and Error, the price at the
+                        vol less cm, where Status is CONVERGED (0) or
+                        OUTSIDE_BOUNDS (2)
+                Otherwise : Float or Array; Implied Volatility, NaN
+                            where the price is outside the no arbitrage
+                            bounds or the table
+
+        """
+
+        # The table module is only loaded when it is used
+        # pylint: disable=import-outside-toplevel
+        from optionmodels.ivtable import ImpliedVolTable
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, cm, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['cm'], z))
+        table = ImpliedVolTable.load(params['iv_table'])
+
+        with np.errstate(all='ignore'):
+            x, beta, active = ImpliedVolSeeds.normalise(
+                S, K, T, r, q, cm, z)
+            result = np.where(active, ImpliedVolTable.lookup(
+                x, beta, table) / np.sqrt(np.where(T > 0, T, 1)), np.nan)
+
+            # Keep the interpolated vol where the step is not usable
+            polished = np.zeros(result.shape, dtype=int)
+            if params['iv_table_polish']:
+                ci, vegai = ImpliedVol._price_and_vega(
+                    S, K, T, r, q, result, z)
+                step = result - (ci - cm) / vegai
+                polished = np.isfinite(step) & (step > 0)
+                result = np.where(polished, step, result)
+
+        return ImpliedVol._output(
+            params['output_flag'], result,
+            np.where(np.isfinite(result), CONVERGED, OUTSIDE_BOUNDS),
+            polished.astype(int), contract=(S, K, T, r, q, cm, z))
+
+
+    @staticmethod
+    def implied_vol_brent(**kwargs):
+        """
+        Finds implied volatility using Brent's method, bracketing the
+        root between BRENT_BRACKET and using inverse quadratic or secant
+        interpolation, falling back to bisection whenever the
+        interpolated step would not shrink the bracket fast enough. Each
+        trial vol is priced exactly once and the bracket end prices are
+        reused.
+
+        Each of S, K, T, r, q, cm and option may be a float or a NumPy
+        array; arrays are broadcast against each other and solved
+        together.
+
+        Parameters
+        ----------
+        S : Float or Array
+            Stock Price. The default is 100.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float or Array
+            Dividend Yield.  The default is 0.
+        cm : Float or Array
+            # Option price used to solve for vol. The default is 5.
+        epsilon : Float
+            Degree of precision. The default is 0.0001
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        max_iterations : Int
+            Maximum number of steps. The default is 100.
+        output_flag : Str
+            'all' to also return the diagnostics of each contract. The
+            default is 'price', returning only the vol.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations and Error, the
+                        price at the vol less cm, where Status is
+                        CONVERGED (0), MAX_ITERATIONS (1), OUTSIDE_BOUNDS
+                        (2) or NO_BRACKET (3)
+                Otherwise : Float or Array; Implied Volatility, NaN
+                            unless the solver converged
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, cm, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['cm'], z))
+
+        result, status, iterations, error = ImpliedVol._brent(
+            S, K, T, r, q, cm, z, params['epsilon'],
+            params['max_iterations'])
+
+        return ImpliedVol._output(
+            params['output_flag'], result, status, iterations, error)
+
+
+    @staticmethod
+    def _brent(S, K, T, r, q, cm, z, epsilon, max_iterations, rows=None):
+        """
+        Brent implied vol search over broadcast contract arrays,
+        bracketed by BRENT_BRACKET
+
+        Parameters
+        ----------
+        rows : Array
+            Flat indices of the rows to solve. The default is None, all
+            rows.
+
+        Returns
+        -------
+        result : Array
+            Implied Volatility, NaN unless the row converged.
+        status : Array
+            Status code of each row.
+        iterations : Array
+            Number of trial vols priced after the bracket ends.
+        error : Array
+            Price at the vol less cm, NaN unless the row converged.
+
+        """
+        result = np.full(cm.shape, np.nan)
+        status = np.full(cm.shape, OUTSIDE_BOUNDS)
+        iterations = np.zeros(cm.shape, dtype=int)
+        error = np.full(cm.shape, np.nan)
+        if rows is None:
+            rows = np.arange(cm.size)
+
+        def objective(idx, vol):
+            return AnalyticalMethods._black_scholes_merton(
+                S.flat[idx], K.flat[idx], T.flat[idx], r.flat[idx],
+                q.flat[idx], vol, z.flat[idx]) - cm.flat[idx]
+
+        # Only prices strictly inside the no arbitrage bounds have a vol
+        forward_S = S.flat[rows] * np.exp(-q.flat[rows] * T.flat[rows])
+        forward_K = K.flat[rows] * np.exp(-r.flat[rows] * T.flat[rows])
+        inside = ((cm.flat[rows] > np.maximum(
+            z.flat[rows] * (forward_S - forward_K), 0))
+                  & (cm.flat[rows] < np.where(
+                      z.flat[rows] > 0, forward_S, forward_K))
+                  & (T.flat[rows] > 0))
+        idx = rows[inside]
+        ImpliedVol._brent_search(
+            objective, idx, np.full(idx.shape, BRENT_BRACKET[0]),
+            np.full(idx.shape, BRENT_BRACKET[1]), epsilon, max_iterations,
+            result, status, iterations, error=error)
+
+        return result, status, iterations, error
+
+
+    @staticmethod
+    def _brent_search(objective, idx, a, b, epsilon, max_iterations,
+                      result, status, iterations, fa=None, fb=None,
+                      error=None):
+        """
+        Vectorised Brent root search, after the zbrent routine of
+        Numerical Recipes, writing the root, status code, number of
+        trials and residual of each row into the output arrays
+
+        Parameters
+        ----------
+        objective : Function
+            Takes the flat indices of the rows and a trial value for each
+            and returns the residual of each row.
+        idx : Array
+            Flat indices of the rows to solve.
+        a, b : Array
+            Ends of the interval searched for each row.
+        result, status, iterations : Array
+            Outputs, updated in place for the rows solved.
+        fa, fb : Array
+            Residuals at the ends, if already known. The default is None.
+        error : Array
+            Output for the residual at each root, if wanted. The default
+            is None.
+
+        """
+        with np.errstate(all='ignore'):
+            if fa is None:
+                fa = objective(idx, a)
+            if fb is None:
+                fb = objective(idx, b)
+
+            # The root may still be beyond the reach of the bracket
+            bracketed = np.sign(fa) * np.sign(fb) <= 0
+            status.flat[idx[~bracketed]] = NO_BRACKET
+            status.flat[idx[bracketed]] = MAX_ITERATIONS
+            idx, a, b, fa, fb = (
+                v[bracketed] for v in (idx, a, b, fa, fb))
+            c, fc = b.copy(), fb.copy()
+            d = b - a
+            e = d.copy()
+
+            for iteration in range(max_iterations + 1):
+                if idx.size == 0:
+                    break
+
+                # Keep the root between b and c, with b the best estimate
+                same = np.sign(fb) == np.sign(fc)
+                c = np.where(same, a, c)
+                fc = np.where(same, fa, fc)
+                d = np.where(same, b - a, d)
+                e = np.where(same, d, e)
+                swap = np.abs(fc) < np.abs(fb)
+                a = np.where(swap, b, a)
+                fa = np.where(swap, fb, fa)
+                b, c = np.where(swap, c, b), np.where(swap, a, c)
+                fb, fc = np.where(swap, fc, fb), np.where(swap, fa, fc)
+
+                tol = 2 * np.finfo(float).eps * np.abs(b) + 1e-15
+                xm = 0.5 * (c - b)
+
+                # Store converged rows and drop them from the working set
+                done = (np.abs(fb) <= epsilon) | (np.abs(xm) <= tol)
+                result.flat[idx[done]] = b[done]
+                status.flat[idx[done]] = CONVERGED
+                iterations.flat[idx[done]] = iteration
+                if error is not None:
+                    error.flat[idx[done]] = fb[done]
+                keep = ~done
+                idx, a, b, c, fa, fb, fc, d, e, tol, xm = (
+                    v[keep] for v in (idx, a, b, c, fa, fb, fc, d, e, tol,
+                                      xm))
+                if idx.size == 0 or iteration == max_iterations:
+                    break
+
+                # Secant when a and c coincide, otherwise inverse
+                # quadratic interpolation
+                s = fb / fa
+                secant = a == c
+                qa = fa / fc
+                rb = fb / fc
+                p = np.where(
+                    secant, 2 * xm * s,
+                    s * (2 * xm * qa * (qa - rb) - (b - a) * (rb - 1)))
+                qq = np.where(secant, 1 - s, (qa - 1) * (rb - 1) * (s - 1))
+                qq = np.where(p > 0, -qq, qq)
+                p = np.abs(p)
+
+                # Accept the interpolation only if it falls inside the
+                # bracket and shrinks faster than bisection
+                interpolate = ((np.abs(e) >= tol) & (np.abs(fa) > np.abs(fb))
+                               & (2 * p < np.minimum(
+                                   3 * xm * qq - np.abs(tol * qq),
+                                   np.abs(e * qq))))
+                e = np.where(interpolate, d, xm)
+                d = np.where(interpolate, p / qq, xm)
+
+                a, fa = b, fb
+                b = b + np.where(np.abs(d) > tol, d, np.copysign(tol, xm))
+                fb = objective(idx, b)
+
+        iterations.flat[idx] = max_iterations
+
+
+    @staticmethod
+    def implied_vol_model(model, **kwargs):
+        """
+        Finds the volatility at which a numerical pricing model, such as
+        the American binomial and trinomial trees or the finite
+        difference methods, reprices the option.
+
+        Rather than root searching on the model alone the quote is first
+        de-Americanised: the gap between the model and
+        Black-Scholes-Merton prices at the current vol, which is the
+        early exercise premium plus the discretisation error of the
+        model, is removed from the quote and the European equivalent is
+        inverted with the rational solver. The gap changes slowly with
+        vol, so one model evaluation lands close to the root, and secant
+        steps on the model price then finish the solve. A few model
+        evaluations per contract are usually enough.
+
+        Each of S, K, T, r, q, cm and option may be a float or a NumPy
+        array; arrays are broadcast against each other. Each trial prices
+        every unsolved contract in a single call for the array_methods
+        and one contract at a time otherwise.
+
+        Parameters
+        ----------
+        model : Function
+            Pricing method from pricer_dict, e.g.
+            LatticeMethods.cox_ross_rubinstein_binomial, which takes its
+            settings such as steps and american from the other
+            parameters.
+        S : Float or Array
+            Stock Price. The default is 100.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float or Array
+            Dividend Yield.  The default is 0.
+        cm : Float or Array
+            # Option price used to solve for vol. The default is 5.
+        epsilon : Float
+            Degree of precision. The default is 0.0001
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        max_iterations : Int
+            Maximum number of model evaluations per contract. The default
+            is 100.
+        output_flag : Str
+            'all' to also return the diagnostics of each contract. The
+            default is 'price', returning only the vol.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations, the number of
+                        model evaluations, and Error, the model price at
+                        the vol less cm, where Status is CONVERGED (0),
+                        MAX_ITERATIONS (1) or OUTSIDE_BOUNDS (2)
+                Otherwise : Float or Array; Implied Volatility, NaN
+                            unless the solver converged
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, cm, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['cm'], z))
+        epsilon = params['epsilon']
+        max_iterations = params['max_iterations']
+
+        result = np.full(cm.shape, np.nan)
+        status = np.full(cm.shape, OUTSIDE_BOUNDS)
+        iterations = np.zeros(cm.shape, dtype=int)
+        error = np.full(cm.shape, np.nan)
+        batched = params['option_method'] in params['array_methods']
+
+        def model_price(idx, vol):
+            if batched:
+                return model(params=params.replace(
+                    S=S.flat[idx], K=K.flat[idx], T=T.flat[idx],
+                    r=r.flat[idx], q=q.flat[idx], sigma=vol,
+                    option=z.flat[idx] > 0, output_flag='price'))
+
+            return np.array([model(params=params.replace(
+                S=S.flat[i], K=K.flat[i], T=T.flat[i], r=r.flat[i],
+                q=q.flat[i], sigma=v, option='call' if z.flat[i] > 0 else (
+                    'put'), output_flag='price'))
+                             for i, v in zip(idx, vol)], dtype=float)
+
+        def contract(idx):
+            return (S.flat[idx], K.flat[idx], T.flat[idx], r.flat[idx],
+                    q.flat[idx])
+
+        # Start from the quote treated as a European price
+        idx = np.flatnonzero((cm > 0) & (T > 0))
+        status.flat[idx] = MAX_ITERATIONS
+        vol = ImpliedVol._rational_vol(
+            *contract(idx), cm.flat[idx], z.flat[idx])
+        vol = np.where(np.isfinite(vol), vol, params['sigma'])
+        prev_vol = prev_diff = None
+
+        with np.errstate(all='ignore'):
+            for iteration in range(1, max_iterations + 1):
+                if idx.size == 0:
+                    break
+
+                diff = model_price(idx, vol) - cm.flat[idx]
+                iterations.flat[idx] = iteration
+
+                # Store converged rows and drop them from the working set
+                done = np.abs(diff) <= epsilon
+                result.flat[idx[done]] = vol[done]
+                status.flat[idx[done]] = CONVERGED
+                error.flat[idx[done]] = diff[done]
+                keep = ~done
+                idx, vol, diff = idx[keep], vol[keep], diff[keep]
+                if prev_vol is not None:
+                    prev_vol, prev_diff = prev_vol[keep], prev_diff[keep]
+                if idx.size == 0 or iteration == max_iterations:
+                    break
+
+                # Invert the quote less the gap between the model and
+                # Black-Scholes-Merton prices at the current vol
+                bsm_price, bsm_vega = ImpliedVol._price_and_vega(
+                    *contract(idx), vol, z.flat[idx])
+                step = ImpliedVol._rational_vol(
+                    *contract(idx), bsm_price - diff, z.flat[idx])
+
+                # Secant on the model price once two trials are known
+                if prev_vol is not None:
+                    secant = vol - diff * (vol - prev_vol) / (
+                        diff - prev_diff)
+                    step = np.where(np.isfinite(secant) & (secant > 0),
+                                    secant, step)
+
+                # Newton on the Black-Scholes-Merton vega when the
+                # European equivalent is outside the no arbitrage bounds
+                newton = vol - diff / bsm_vega
+                step = np.where(np.isfinite(step), step, np.where(
+                    newton > 0, newton, 0.5 * vol))
+
+                prev_vol, prev_diff = vol, diff
+                vol = step
+
+        return ImpliedVol._output(
+            params['output_flag'], result, status, iterations, error)
+
+
+    @staticmethod
+    def implied_parameter(model, **kwargs):
+        """
+        Finds the value of any model parameter, by default sigma, at
+        which a pricing method reprices the option, using Brent's method
+        on the model price. Suited to models with no analytic vega, such
+        as Hull-White or Monte Carlo, and to parameters other than the
+        vol, such as vvol.
+
+        Each trial prices every unsolved contract together, in a single
+        call for the array_methods and one contract at a time otherwise.
+        Engines that draw random numbers are given the same mc_seed at
+        every trial, so that nearby trials reuse the same paths and the
+        model price is a smooth function of the parameter.
+
+        Each of S, K, T, r, q, cm and option may be a float or a NumPy
+        array; arrays are broadcast against each other.
+
+        Parameters
+        ----------
+        model : Function
+            Pricing method from pricer_dict, which takes its other
+            settings, e.g. simulations or vvol, from the parameters.
+        S : Float or Array
+            Stock Price. The default is 100.
+        K : Float or Array
+            Strike Price. The default is 100.
+        T : Float or Array
+            Time to Maturity.  The default is 0.25 (3 Months).
+        r : Float or Array
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float or Array
+            Dividend Yield.  The default is 0.
+        cm : Float or Array
+            # Option price used to solve for the parameter. The default
+            is 5.
+        epsilon : Float
+            Degree of precision. The default is 0.0001
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+        implied_param : Str
+            Name of the parameter to solve for. The default is 'sigma'.
+        implied_param_bracket : Tuple
+            Range searched for the parameter. The default is (0.01, 3.0).
+        mc_seed : Int
+            Seed of the Monte Carlo draws. The default is None, which
+            uses a seed of 0 for the solve.
+        max_iterations : Int
+            Maximum number of trials after the bracket ends. The default
+            is 100.
+        output_flag : Str
+            'all' to also return the diagnostics of each contract. The
+            default is 'price', returning only the parameter.
+
+        Returns
+        -------
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, the solved parameter, Status,
+                        Iterations, the number of model evaluations, and
+                        Error, the model price at the parameter less cm,
+                        where Status is CONVERGED (0), MAX_ITERATIONS
+                        (1), OUTSIDE_BOUNDS (2) or NO_BRACKET (3)
+                Otherwise : Float or Array; Solved parameter, NaN unless
+                            the solver converged
+
+        """
+
+        # Update pricing input parameters to default if not supplied
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, cm, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['cm'], z))
+        name = params['implied_param']
+        if params['mc_seed'] is None:
+            params = params.replace(mc_seed=0)
+        batched = params['option_method'] in params['array_methods']
+
+        result = np.full(cm.shape, np.nan)
+        status = np.full(cm.shape, OUTSIDE_BOUNDS)
+        iterations = np.zeros(cm.shape, dtype=int)
+        error = np.full(cm.shape, np.nan)
+
+        def model_price(S, K, T, r, q, z, value):
+            inputs = {'S':S, 'K':K, 'T':T, 'r':r, 'q':q, 'option':z,
+                      'output_flag':'price'}
+            inputs[name] = value
+            return model(params=params.replace(**inputs))
+
+        def objective(idx, value):
+            if batched:
+                return model_price(
+                    S.flat[idx], K.flat[idx], T.flat[idx], r.flat[idx],
+                    q.flat[idx], z.flat[idx] > 0, value) - cm.flat[idx]
+
+            return np.array([model_price(
+                S.flat[i], K.flat[i], T.flat[i], r.flat[i], q.flat[i],
+                'call' if z.flat[i] > 0 else 'put', trial)
+                             for i, trial in zip(idx, value.tolist())],
+                            dtype=float) - cm.flat[idx]
+
+        # Bracket the root nearest the current value of the parameter
+        idx = np.flatnonzero(cm > 0)
+        found, a, b, fa, fb, evaluations = ImpliedVol._bracket_search(
+            objective, idx, np.broadcast_to(
+                params[name], cm.shape).flat[idx],
+            params['implied_param_bracket'])
+        status.flat[idx[~found]] = NO_BRACKET
+        ImpliedVol._brent_search(
+            objective, idx[found], a[found], b[found], params['epsilon'],
+            params['max_iterations'], result, status, iterations,
+            fa[found], fb[found], error)
+        iterations.flat[idx] += evaluations
+
+        return ImpliedVol._output(
+            params['output_flag'], result, status, iterations, error)
+
+
+    @staticmethod
+    def _bracket_search(objective, idx, guess, bounds):
+        """
+        Search outwards from a guess for the nearest change of sign of
+        the objective, after the zbrac routine of Numerical Recipes. The
+        interval either side of the guess starts at 1 / 2^BRACKET_STEPS
+        of the bounds and doubles each step until it reaches them, so
+        that a model which is only well behaved near the root, such as a
+        series expansion, is not evaluated far from it unless needed.
+
+        Parameters
+        ----------
+        objective : Function
+            Takes the flat indices of the rows and a trial value for each
+            and returns the residual of each row.
+        idx : Array
+            Flat indices of the rows to solve.
+        guess : Array
+            Starting value for each row, clipped to the bounds.
+        bounds : Tuple
+            Lowest and highest values searched.
+
+        Returns
+        -------
+        found : Array
+            Whether a change of sign was found for each row.
+        a, b, fa, fb : Array
+            Ends of the tightest interval found and their residuals.
+        evaluations : Array
+            Number of objective evaluations for each row.
+
+        """
+        lower, upper = (float(bound) for bound in bounds)
+        with np.errstate(all='ignore'):
+            guess = np.clip(np.asarray(guess, dtype=float), lower, upper)
+            f_guess = objective(idx, guess)
+
+        # Inner ends of each side, moved outwards as the search widens
+        a, fa = guess.copy(), f_guess.copy()
+        b, fb = guess.copy(), f_guess.copy()
+        inner_a, inner_fa = a.copy(), fa.copy()
+        inner_b, inner_fb = b.copy(), fb.copy()
+        found = np.abs(f_guess) == 0
+        evaluations = np.ones(idx.shape, dtype=int)
+
+        width = (upper - lower) / 2 ** BRACKET_STEPS
+        for _ in range(BRACKET_STEPS + 1):
+            rows = np.flatnonzero(~found)
+            if rows.size == 0:
+                break
+
+            outer_a = np.maximum(guess[rows] - width, lower)
+            outer_b = np.minimum(guess[rows] + width, upper)
+            with np.errstate(all='ignore'):
+                f_outer_a = objective(idx[rows], outer_a)
+                f_outer_b = objective(idx[rows], outer_b)
+            evaluations[rows] += 2
+
+            # Take the upper side first when both change sign
+            change_b = np.sign(f_outer_b) * np.sign(inner_fb[rows]) <= 0
+            change_a = ~change_b & (
+                np.sign(f_outer_a) * np.sign(inner_fa[rows]) <= 0)
+            a[rows] = np.where(change_b, inner_b[rows], outer_a)
+            fa[rows] = np.where(change_b, inner_fb[rows], f_outer_a)
+            b[rows] = np.where(change_a, inner_a[rows], outer_b)
+            fb[rows] = np.where(change_a, inner_fa[rows], f_outer_b)
+            found[rows] = change_a | change_b
+
+            inner_a[rows], inner_fa[rows] = outer_a, f_outer_a
+            inner_b[rows], inner_fb[rows] = outer_b, f_outer_b
+            width *= 2
+
+        return found, a, b, fa, fb, evaluations
+
+
     @staticmethod
     def implied_vol_bisection(**kwargs):
         """
-        Finds implied volatility using bisection method.
+        Finds implied volatility using bisection method, interpolating
+        between the bracket ends. Returns 'NA' if the price is not within
+        epsilon after max_iterations steps.
 
         Parameters
         ----------
@@ -116,70 +1329,80 @@ class ImpliedVol():
             Degree of precision. The default is 0.0001
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
+        max_iterations : Int
+            Maximum number of steps. The default is 100.
+        output_flag : Str
+            'all' to also return the diagnostics. The default is 'price',
+            returning only the vol.
 
         Returns
         -------
-        result : Float
-            Implied Volatility.
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations and Error, the
+                        price at the vol less cm, where Status is
+                        CONVERGED (0) or MAX_ITERATIONS (1)
+                Otherwise : Float; Implied Volatility, or 'NA' if the
+                            iteration fails
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            cm = params['cm']
-            epsilon = params['epsilon']
-            option = params['option']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        cm = params['cm']
+        epsilon = params['epsilon']
+        option = params['option']
+
+        # Payoff sign, 1 for calls and -1 for puts
+        z = Utils.option_sign(option)
 
         vLow = 0.005
         vHigh = 4
-        cLow = AnalyticalMethods.black_scholes_merton(
-            S=S, K=K, T=T, r=r, q=q, sigma=vLow, option=option, refresh=True)
+        cLow = AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, vLow, z)
 
-        cHigh = AnalyticalMethods.black_scholes_merton(
-            S=S, K=K, T=T, r=r, q=q, sigma=vHigh, option=option, refresh=True)
-
-        counter = 0
+        cHigh = AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, vHigh, z)
 
         vi = vLow + (cm - cLow) * (vHigh - vLow) / (cHigh - cLow)
+        ci = AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, vi, z)
 
-        while abs(cm - AnalyticalMethods.black_scholes_merton(
-                S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                refresh=True)) > epsilon:
-
-            counter = counter + 1
-            if counter == 100:
-                result = 'NA'
+        # Each trial vol is priced once and replaces the bracket end on
+        # the same side of the target, keeping its known price
+        for iterations in range(params['max_iterations']):
+            if abs(cm - ci) <= epsilon:
+                result = vi
+                status = CONVERGED
+                break
 
-            if AnalyticalMethods.black_scholes_merton(
-                    S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                    refresh=True) < cm:
-                vLow = vi
+            if ci < cm:
+                vLow, cLow = vi, ci
 
             else:
-                vHigh = vi
-
-            cLow = AnalyticalMethods.black_scholes_merton(
-                S=S, K=K, T=T, r=r, q=q, sigma=vLow, option=option,
-                refresh=True)
-
-            cHigh = AnalyticalMethods.black_scholes_merton(
-                S=S, K=K, T=T, r=r, q=q, sigma=vHigh, option=option,
-                refresh=True)
+                vHigh, cHigh = vi, ci
 
             vi = vLow + (cm - cLow) * (vHigh - vLow) / (cHigh - cLow)
+            ci = AnalyticalMethods._black_scholes_merton(
+                S, K, T, r, q, vi, z)
 
-        result = vi
+        else:
+            result = 'NA'
+            status = MAX_ITERATIONS
+            iterations = params['max_iterations']
+
+        if params['output_flag'] == 'all':
+            return {
+                'Vol':result,
+                'Status':status,
+                'Iterations':iterations,
+                'Error':ci - cm if status == CONVERGED else np.nan
+                }
 
         return result
 
@@ -208,37 +1431,52 @@ class ImpliedVol():
             Degree of precision. The default is 0.0001
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
+        iv_seed : Str
+            Initial guess, a key of iv_seed_dict. The default is None,
+            'auto', as the search walks from the seed in fixed steps.
+        max_iterations : Int
+            Maximum number of trial vols. The default is 100.
+        output_flag : Str
+            'all' to also return the diagnostics. The default is 'price',
+            returning only the vol.
 
         Returns
         -------
-        result : Float
-            Implied Volatility.
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations, the number of
+                        trial vols priced, and Error, the price at the
+                        vol less cm, where Status is CONVERGED (0),
+                        MAX_ITERATIONS (1) if the search stops short of
+                        epsilon after max_iterations trial vols or
+                        OUTSIDE_BOUNDS (2)
+                Otherwise : Float; Implied Volatility, NaN if the price
+                            is outside the no arbitrage bounds
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            cm = params['cm']
-            epsilon = params['epsilon']
-            option = params['option']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        cm = params['cm']
+        epsilon = params['epsilon']
+        option = params['option']
+        max_iterations = params['max_iterations']
+
+        # Payoff sign, 1 for calls and -1 for puts
+        z = Utils.option_sign(option)
 
         # Seed vol
-        vi = 0.2
+        vi = ImpliedVolSeeds.seed(
+            S, K, T, r, q, cm, z, params['iv_seed'] or 'auto')
 
         # Calculate starting option price using this vol
-        ci = AnalyticalMethods.black_scholes_merton(
-            S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option, refresh=True)
+        ci = AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, vi, z)
 
         # Initial price difference
         price_diff = cm - ci
@@ -253,8 +1491,9 @@ class ImpliedVol():
         shift = 0.01
 
         price_diff_start = price_diff
+        iterations = 0
 
-        while abs(price_diff) > epsilon:
+        while abs(price_diff) > epsilon and iterations < max_iterations:
 
             # If the price difference changes sign after the vol shift,
             # reduce the decimal by one and reverse the sign
@@ -268,8 +1507,9 @@ class ImpliedVol():
             price_diff_start = price_diff
 
             # Calculate the option price with new vol
-            ci = AnalyticalMethods.black_scholes_merton(
-                S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option, refresh=True)
+            ci = AnalyticalMethods._black_scholes_merton(
+                S, K, T, r, q, vi, z)
+            iterations += 1
 
             # Price difference after shifting vol
             price_diff = cm - ci
@@ -280,6 +1520,14 @@ class ImpliedVol():
 
         result = vi
 
+        if params['output_flag'] == 'all':
+            return {
+                'Vol':result,
+                'Status':ImpliedVol._search_status(vi, price_diff, epsilon),
+                'Iterations':iterations,
+                'Error':ci - cm
+                }
+
         return result
 
 
@@ -307,89 +1555,132 @@ class ImpliedVol():
             Degree of precision. The default is 0.0001
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
+        iv_seed : Str
+            Initial guess, a key of iv_seed_dict. The default is None,
+            'auto', as the search walks from the seed in fixed steps.
+        max_iterations : Int
+            Maximum number of trial vols. The default is 100.
+        output_flag : Str
+            'all' to also return the diagnostics. The default is 'price',
+            returning only the vol.
 
         Returns
         -------
-        result : Float
-            Implied Volatility.
+        result : Various
+            Depending on output flag:
+                'all' : Dict; Vol, Status, Iterations, the number of
+                        trial vols priced, and Error, the price at the
+                        vol less cm, where Status is CONVERGED (0),
+                        MAX_ITERATIONS (1) if the search stops short of
+                        epsilon after max_iterations trial vols or
+                        OUTSIDE_BOUNDS (2)
+                Otherwise : Float; Implied Volatility, NaN if the price
+                            is outside the no arbitrage bounds
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            cm = params['cm']
-            epsilon = params['epsilon']
-            option = params['option']
-
-        vi = 0.2
-        ci = AnalyticalMethods.black_scholes_merton(
-            S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option, refresh=True)
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        cm = params['cm']
+        epsilon = params['epsilon']
+        option = params['option']
+        max_iterations = params['max_iterations']
+
+        # Payoff sign, 1 for calls and -1 for puts
+        z = Utils.option_sign(option)
+
+        vi = ImpliedVolSeeds.seed(
+            S, K, T, r, q, cm, z, params['iv_seed'] or 'auto')
+        ci = AnalyticalMethods._black_scholes_merton(
+            S, K, T, r, q, vi, z)
 
         price_diff = cm - ci
         if price_diff > 0:
             flag = 1
         else:
             flag = -1
-        while abs(price_diff) > epsilon:
-            while price_diff * flag > 0:
-                ci = AnalyticalMethods.black_scholes_merton(
-                    S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                    refresh=True)
+        iterations = 0
+        while abs(price_diff) > epsilon and iterations < max_iterations:
+            while price_diff * flag > 0 and iterations < max_iterations:
+                ci = AnalyticalMethods._black_scholes_merton(
+                    S, K, T, r, q, vi, z)
+                iterations += 1
 
                 price_diff = cm - ci
                 vi += (0.01 * flag)
 
-            while price_diff * flag < 0:
-                ci = AnalyticalMethods.black_scholes_merton(
-                    S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                    refresh=True)
+            while price_diff * flag < 0 and iterations < max_iterations:
+                ci = AnalyticalMethods._black_scholes_merton(
+                    S, K, T, r, q, vi, z)
+                iterations += 1
 
                 price_diff = cm - ci
                 vi -= (0.001 * flag)
 
-            while price_diff * flag > 0:
-                ci = AnalyticalMethods.black_scholes_merton(
-                    S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                    refresh=True)
+            while price_diff * flag > 0 and iterations < max_iterations:
+                ci = AnalyticalMethods._black_scholes_merton(
+                    S, K, T, r, q, vi, z)
+                iterations += 1
 
                 price_diff = cm - ci
                 vi += (0.0001 * flag)
 
-            while price_diff * flag < 0:
-                ci = AnalyticalMethods.black_scholes_merton(
-                    S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                    refresh=True)
+            while price_diff * flag < 0 and iterations < max_iterations:
+                ci = AnalyticalMethods._black_scholes_merton(
+                    S, K, T, r, q, vi, z)
+                iterations += 1
 
                 price_diff = cm - ci
                 vi -= (0.00001 * flag)
 
-            while price_diff * flag > 0:
-                ci = AnalyticalMethods.black_scholes_merton(
-                    S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                    refresh=True)
+            while price_diff * flag > 0 and iterations < max_iterations:
+                ci = AnalyticalMethods._black_scholes_merton(
+                    S, K, T, r, q, vi, z)
+                iterations += 1
 
                 price_diff = cm - ci
                 vi += (0.000001 * flag)
 
-            while price_diff * flag < 0:
-                ci = AnalyticalMethods.black_scholes_merton(
-                    S=S, K=K, T=T, r=r, q=q, sigma=vi, option=option,
-                    refresh=True)
+            while price_diff * flag < 0 and iterations < max_iterations:
+                ci = AnalyticalMethods._black_scholes_merton(
+                    S, K, T, r, q, vi, z)
+                iterations += 1
 
                 price_diff = cm - ci
                 vi -= (0.0000001 * flag)
 
         result = vi
 
+        if params['output_flag'] == 'all':
+            return {
+                'Vol':result,
+                'Status':ImpliedVol._search_status(vi, price_diff, epsilon),
+                'Iterations':iterations,
+                'Error':AnalyticalMethods._black_scholes_merton(
+                    S, K, T, r, q, result, z) - cm
+                }
+
         return result
+
+
+    @staticmethod
+    def _search_status(vi, price_diff, epsilon):
+        """
+        Status of the naive searches, which start from a NaN seed
+        outside the no arbitrage bounds and otherwise stop when the
+        price difference is within epsilon, no longer finite or the
+        max_iterations trial vols have been priced
+
+        """
+        if np.isnan(vi):
+            return OUTSIDE_BOUNDS
+
+        if abs(price_diff) <= epsilon:
+            return CONVERGED
+
+        return MAX_ITERATIONS
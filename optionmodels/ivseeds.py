@@ -0,0 +1,282 @@
+"""
+Initial guesses for the implied volatility solvers
+
+"""
+
+import math
+import numpy as np
+from optionmodels.models_params import models_params_dict
+from optionmodels.normaldistribution import NormalDistribution, ROOT_2
+# pylint: disable=invalid-name
+
+# Normalising constant of the at the money Black price, b ~ s / sqrt(2 pi)
+ROOT_2PI = math.sqrt(2 * math.pi)
+
+
+class ImpliedVolSeeds():
+    """
+    Initial guesses for the implied volatility solvers.
+
+    Every seed works on the price normalised to an out of the money Black
+    call, beta, at log moneyness x = -|ln(F / K)| and returns the total
+    volatility s = sigma * sqrt(T), so the same seeds serve calls, puts
+    and any carry.
+
+    Scalar inputs are kept as scalars throughout, as the seeds are also
+    used by the single contract solvers. Far from the root the tail
+    terms can overflow or divide by zero, so the solvers evaluate the
+    seeds with floating point warnings suppressed.
+
+    """
+    @staticmethod
+    def _where(condition, x, y):
+        """
+        np.where that returns a scalar for scalar inputs
+
+        """
+        if np.ndim(condition) == 0:
+            return x if condition else y
+
+        return np.where(condition, x, y)
+
+
+    @classmethod
+    def normalise(cls, S, K, T, r, q, cm, z):
+        """
+        Normalise option prices to out of the money Black calls
+
+        Parameters
+        ----------
+        S, K, T, r, q : Float or Array
+            Contract terms.
+        cm : Float or Array
+            Option price.
+        z : Int or Array
+            Payoff sign, 1 for calls and -1 for puts.
+
+        Returns
+        -------
+        x : Float or Array
+            Log moneyness -|ln(F / K)|.
+        beta : Float or Array
+            Time value divided by the discounted geometric mean of the
+            forward and strike. Rows outside the bounds are set to a
+            valid placeholder.
+        active : Bool or Array
+            Whether the price is strictly inside the no arbitrage bounds.
+
+        """
+        F = S * np.exp((r - q) * T)
+        x = np.log(F / K)
+
+        # Put-call parity removes any intrinsic value
+        beta = cm / (np.exp(-r * T) * np.sqrt(F * K)) - np.maximum(
+            z * (np.exp(0.5 * x) - np.exp(-0.5 * x)), 0)
+        x = -np.abs(x)
+
+        active = (beta > 0) & (beta < np.exp(0.5 * x)) & (T > 0)
+        beta = cls._where(active, beta, 0.5 * np.exp(0.5 * x))
+
+        return x, beta, active
+
+
+    @staticmethod
+    def normalised_black(x, s):
+        """
+        Normalised out of the money Black call price
+        b = exp(x/2) N(x/s + s/2) - exp(-x/2) N(x/s - s/2), x <= 0, split
+        as b = exp(log_scale) * scaled so that tiny prices do not
+        underflow.
+
+        Returns
+        -------
+        log_scale : Float or Array
+            -(x^2 / s^2 + s^2 / 4) / 2, the log of sqrt(2 pi) times the
+            normalised vega.
+        scaled : Float or Array
+            Price divided by exp(log_scale).
+
+        """
+        d1 = x / s + 0.5 * s
+        log_scale = -0.5 * (x * x / (s * s) + 0.25 * s * s)
+        scaled = 0.5 * (NormalDistribution.erfcx(-d1 / ROOT_2)
+                        - NormalDistribution.erfcx((s - d1) / ROOT_2))
+
+        return log_scale, scaled
+
+
+    @classmethod
+    def inflection(cls, x, beta):
+        """
+        Inflection point s_c = sqrt(2|x|) of the normalised price and
+        whether each price lies on the branch below it
+
+        Returns
+        -------
+        s_c : Float or Array
+            Total volatility at the inflection point.
+        lower : Bool or Array
+            Whether the root is below s_c.
+
+        """
+        ax = np.abs(x)
+        s_c = np.sqrt(2 * ax)
+        log_scale, scaled = cls.normalised_black(
+            x, cls._where(ax > 0, s_c, 1))
+        lower = beta < cls._where(ax > 0, np.exp(log_scale) * scaled, 0)
+
+        return s_c, lower
+
+
+    @staticmethod
+    def manaster_koehler(x, beta):
+        """
+        Manaster and Koehler (1982) seed, the inflection point
+        s = sqrt(2|x|) from which Newton's method converges
+        monotonically. It is zero at the money.
+
+        """
+        return np.sqrt(2 * np.abs(x)) + 0 * beta
+
+
+    @staticmethod
+    def brenner_subrahmanyam(x, beta):
+        """
+        Brenner and Subrahmanyam (1988) at the money approximation
+        s = sqrt(2 pi) C / S, applied to the straddle so that it is the
+        same for calls and puts.
+
+        """
+        return ROOT_2PI * (beta - np.sinh(0.5 * x))
+
+
+    @staticmethod
+    def corrado_miller(x, beta):
+        """
+        Corrado and Miller (1996) quadratic approximation, accurate over
+        a wider range of moneyness than Brenner and Subrahmanyam. The
+        square root term is floored at zero where it is undefined.
+
+        """
+        forward = np.exp(0.5 * x)
+        strike = np.exp(-0.5 * x)
+        straddle = beta + 0.5 * (strike - forward)
+        root = np.sqrt(np.maximum(
+            straddle ** 2 - (forward - strike) ** 2 / math.pi, 0))
+
+        return ROOT_2PI / (forward + strike) * (straddle + root)
+
+
+    @classmethod
+    def rational(cls, x, beta):
+        """
+        Seeds from the asymptotic forms of the normalised price either
+        side of the inflection point, as used by "Let's Be Rational".
+
+        Below s_c it is the better, in the 1 / ln(b) objective, of the
+        small volatility form
+        b ~ 2 pi |x| / (3 sqrt(3)) N(-|x| / (sqrt(3) s))^3 and the near
+        the money form b ~ 2 N(s/2) - 1 - |x|/2. Above s_c it uses
+        b_max - b ~ (exp(x/2) + exp(-x/2)) N(-s/2).
+
+        """
+        ax = np.abs(x)
+        s_c, lower = cls.inflection(x, beta)
+        log_beta = np.log(beta)
+
+        def log_price(s):
+            log_scale, scaled = cls.normalised_black(x, s)
+            return log_scale + np.log(scaled)
+
+        u = np.cbrt(3 * math.sqrt(3) * beta / (2 * math.pi * ax))
+        s_tail = -ax / (math.sqrt(3) * NormalDistribution.ppf(u))
+        s_tail = cls._where((u < 0.5) & (s_tail < s_c), s_tail, s_c)
+        s_atm = np.minimum(2 * NormalDistribution.ppf(
+            0.5 * (1 + beta + 0.5 * ax)), s_c)
+        s_lower = cls._where(
+            np.abs(1 / log_price(s_atm) - 1 / log_beta)
+            < np.abs(1 / log_price(s_tail) - 1 / log_beta),
+            s_atm, s_tail)
+
+        b_max = np.exp(0.5 * x)
+        s_upper = -2 * NormalDistribution.ppf(
+            (b_max - beta) / (b_max + 1 / b_max))
+
+        return cls._where(lower, s_lower, s_upper)
+
+
+    @classmethod
+    def auto(cls, x, beta):
+        """
+        Choose between the Corrado-Miller and rational seeds for each
+        contract, keeping the one whose normalised price is closer to
+        beta in log terms. Corrado-Miller wins close to the money and at
+        moderate moneyness with low total variance, the rational seeds in
+        the wings, where Corrado-Miller can be far from the root.
+
+        """
+        s_cm = cls.corrado_miller(x, beta)
+        s_rational = cls.rational(x, beta)
+        log_beta = np.log(beta)
+
+        error = {}
+        for name, s in (('cm', s_cm), ('rational', s_rational)):
+            log_scale, scaled = cls.normalised_black(x, s)
+            error[name] = np.abs(log_scale + np.log(scaled) - log_beta)
+
+        return cls._where((s_cm > 0) & (error['cm'] < error['rational']),
+                        s_cm, s_rational)
+
+
+    @classmethod
+    def seed(cls, S, K, T, r, q, cm, z, seed_method=None,
+             warm_start=None):
+        """
+        Initial implied volatility guess
+
+        Parameters
+        ----------
+        S, K, T, r, q : Float or Array
+            Contract terms.
+        cm : Float or Array
+            Option price.
+        z : Int or Array
+            Payoff sign, 1 for calls and -1 for puts.
+        seed_method : Str
+            Key of iv_seed_dict, 'mk', 'bs', 'corrado', 'rational' or
+            'auto'. The default is None, which uses 'mk' for a single
+            contract, where Newton-Raphson from the cheaper seed is
+            faster overall, and 'auto' for arrays.
+        warm_start : Float or Array
+            Previous solutions used as the seed wherever they are finite
+            and positive, e.g. from an IVSeedCache. The default is None.
+
+        Returns
+        -------
+        Float or Array
+            Volatility seed, NaN where the price is outside the no
+            arbitrage bounds. Seeds that are not positive, e.g.
+            Manaster-Koehler at the money, fall back to
+            Brenner-Subrahmanyam.
+
+        """
+        if seed_method is None:
+            seed_method = 'auto' if any(
+                np.ndim(x) for x in (S, K, T, r, q, cm, z)) else 'mk'
+
+        with np.errstate(all='ignore'):
+            x, beta, active = cls.normalise(S, K, T, r, q, cm, z)
+            s = getattr(cls, models_params_dict['iv_seed_dict'][
+                seed_method])(x, beta)
+            s = cls._where(np.isfinite(s) & (s > 0), s,
+                           cls.brenner_subrahmanyam(x, beta))
+            sigma = s / np.sqrt(cls._where(T > 0, T, 1))
+            if warm_start is not None:
+                sigma = cls._where(np.isfinite(warm_start) & (
+                    warm_start > 0), warm_start, sigma)
+            sigma = cls._where(active, sigma, np.nan)
+
+        if np.ndim(sigma) == 0:
+            return float(sigma)
+
+        return sigma
@@ -0,0 +1,139 @@
+"""
+Precomputed implied volatility lookup table
+
+"""
+
+import numpy as np
+from optionmodels.impliedvol import ImpliedVol
+# pylint: disable=invalid-name, protected-access
+
+# Most negative normalised log moneyness x = -|ln(F / K)| in the table.
+# The x axis is uniform in sqrt(|x|), so that nodes cluster at the money
+# where low total vols change quickly with x
+TABLE_X_MIN = -4.0
+
+# Range of the logit of the price axis, ln(u / (1 - u)), where u is the
+# out of the money call price as a fraction of the forward
+TABLE_V_RANGE = (-30.0, 20.0)
+
+# Default number of nodes on the x and price axes
+TABLE_SHAPE = (401, 801)
+
+
+class ImpliedVolTable():
+    """
+    Total volatility s = sigma * sqrt(T) tabulated over normalised log
+    moneyness and normalised price, for approximate inversion of large
+    volumes of quotes by bilinear interpolation.
+
+    The table is a plain float32 array, so it can be saved with np.save
+    and memory-mapped from disk. The axis ranges are fixed by TABLE_X_MIN
+    and TABLE_V_RANGE and the number of nodes is read from the shape.
+    Prices beyond the table, e.g. below exp(-30) of the forward, return
+    NaN.
+
+    """
+    # Tables already built or loaded, keyed by path, None for the default
+    _tables = {}
+
+    @staticmethod
+    def build(shape=TABLE_SHAPE, path=None):
+        """
+        Build a lookup table, solving each node with the rational solver
+
+        Parameters
+        ----------
+        shape : Tuple
+            Number of nodes on the x and price axes. The default is
+            TABLE_SHAPE.
+        path : Str
+            File to save the table to with np.save. The default is None.
+
+        Returns
+        -------
+        table : Array
+            Total volatility at each node.
+
+        """
+        x = -np.linspace(0, np.sqrt(-TABLE_X_MIN), shape[0])[:, None] ** 2
+        v = np.linspace(TABLE_V_RANGE[0], TABLE_V_RANGE[1], shape[1])
+        beta = np.exp(0.5 * x) / (1 + np.exp(-v))
+
+        with np.errstate(all='ignore'):
+            table = ImpliedVol._rational_total_vol(
+                *np.broadcast_arrays(beta, x)).astype(np.float32)
+
+        if path is not None:
+            np.save(path, table)
+
+        return table
+
+
+    @classmethod
+    def load(cls, table=None):
+        """
+        Return a lookup table, building or reading it on first use
+
+        Parameters
+        ----------
+        table : Str or Array
+            Path of a table saved with np.save, which is memory-mapped
+            rather than read into memory, or the table itself. The default
+            is None, the table of TABLE_SHAPE built in memory.
+
+        Returns
+        -------
+        Array
+            Lookup table.
+
+        """
+        if isinstance(table, np.ndarray):
+            return table
+
+        if table not in cls._tables:
+            cls._tables[table] = (cls.build() if table is None else np.load(
+                table, mmap_mode='r'))
+
+        return cls._tables[table]
+
+
+    @staticmethod
+    def lookup(x, beta, table):
+        """
+        Interpolate the total volatility of normalised prices
+
+        Parameters
+        ----------
+        x : Array
+            Log moneyness -|ln(F / K)|.
+        beta : Array
+            Normalised out of the money call price, as returned by
+            ImpliedVolSeeds.normalise.
+        table : Array
+            Lookup table.
+
+        Returns
+        -------
+        Array
+            Total volatility, NaN outside the table.
+
+        """
+        nx, nv = table.shape
+        u = beta * np.exp(-0.5 * x)
+
+        # Fractional node positions on each axis
+        fx = np.sqrt(-x) * ((nx - 1) / np.sqrt(-TABLE_X_MIN))
+        fv = (np.log(u) - np.log1p(-u) - TABLE_V_RANGE[0]) * (
+            (nv - 1) / (TABLE_V_RANGE[1] - TABLE_V_RANGE[0]))
+        inside = (fx <= nx - 1) & (fv >= 0) & (fv <= nv - 1)
+
+        i = np.minimum(np.where(inside, fx, 0).astype(int), nx - 2)
+        j = np.minimum(np.where(inside, fv, 0).astype(int), nv - 2)
+        wx = fx - i
+        wv = fv - j
+
+        lower = table[i, j] + wv * (table[i, j + 1] - table[i, j])
+        upper = table[i + 1, j] + wv * (
+            table[i + 1, j + 1] - table[i + 1, j])
+
+        return np.where(inside, lower + wx * (upper - lower), np.nan)
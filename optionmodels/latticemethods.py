@@ -3,7 +3,6 @@ Lattice based option pricing models
 
 """
 import numpy as np
-from scipy.special import comb
 from optionmodels.utils import Utils
 # pylint: disable=invalid-name
 
@@ -15,14 +14,23 @@ class LatticeMethods():
     @staticmethod
     def european_binomial(**kwargs):
         """
-        European Binomial Option price.
-        Combinatorial function limit c1000
+        European Binomial Option price, from the terminal distribution
+        of the Cox-Ross-Rubinstein tree.
+
+        The binomial weights are computed in log space with gammaln, so
+        that hundreds of thousands of steps neither overflow nor
+        underflow, and summed from the tails inwards so that every
+        strike on the same tree is priced from one pass over the
+        terminal nodes.
+
+        K and option may be NumPy arrays, which are broadcast against
+        each other. The other contract inputs must be shared.
 
         Parameters
         ----------
         S : Float
             Stock Price. The default is 100.
-        K : Float
+        K : Float or Array
             Strike Price. The default is 100.
         T : Float
             Time to Maturity.  The default is 0.25 (3 Months).
@@ -34,51 +42,72 @@ class LatticeMethods():
             Implied Volatility.  The default is 0.2 (20%).
         steps : Int
             Number of time steps. The default is 1000.
-        option : Str
-            Type of option. 'put' or 'call'. The default is 'call'.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
 
         Returns
         -------
-        Float
+        Float or Array
             European Binomial Option Price.
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps = params['steps']
-            option = params['option']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        steps = params['steps']
+        option = params['option']
+
+        if any(np.ndim(x) for x in (S, T, r, q, sigma)):
+            raise ValueError(
+                'european_binomial takes arrays of K and option only; S, '
+                'T, r, q and sigma must be shared')
+
+        # Imported here so that scipy is only loaded if this model is used
+        # pylint: disable=import-outside-toplevel
+        from scipy.special import gammaln
 
         b = r - q
         dt = T / steps
         u = np.exp(sigma * np.sqrt(dt))
         d = 1 / u
         p = (np.exp(b * dt) - d) / (u - d)
-        a = int(np.log(K / (S * (d ** steps))) / np.log(u / d)) + 1
-
-        val = 0
 
-        if option == 'call':
-            for j in range(a, steps + 1):
-                val = (
-                    val + (comb(steps, j) * (p ** j)
-                           * ((1 - p) ** (steps - j))
-                           * ((S * (u ** j) * (d ** (steps - j))) - K)))
-        if option == 'put':
-            for j in range(0, a):
-                val = (
-                    val + (comb(steps, j) * (p ** j)
-                           * ((1 - p) ** (steps - j))
-                           * (K - ((S * (u ** j)) * (d ** (steps - j))))))
+        # Log of the terminal prices S * u^j * d^(steps - j) and of their
+        # binomial probabilities
+        j = np.arange(steps + 1)
+        log_spot = np.log(S) + (2 * j - steps) * sigma * np.sqrt(dt)
+        log_weight = (gammaln(steps + 1) - gammaln(j + 1)
+                      - gammaln(steps - j + 1) + j * np.log(p)
+                      + (steps - j) * np.log1p(-p))
+        weight = np.exp(log_weight)
+        weighted_spot = np.exp(log_weight + log_spot)
+
+        # Probability and expected terminal price above and below each
+        # node, accumulated from the smallest terms in each tail
+        above = np.concatenate((np.cumsum(weight[::-1])[::-1], [0]))
+        above_spot = np.concatenate((
+            np.cumsum(weighted_spot[::-1])[::-1], [0]))
+        below = np.concatenate(([0], np.cumsum(weight)))
+        below_spot = np.concatenate(([0], np.cumsum(weighted_spot)))
+
+        # Calls pay at the nodes above the strike and puts below it
+        K, z = np.broadcast_arrays(K, Utils.option_sign(option))
+        a = np.searchsorted(log_spot, np.log(K), side='right')
+        val = np.where(z > 0, above_spot[a] - K * above[a],
+                       K * below[a] - below_spot[a])
+
+        result = np.exp(-r * T) * val
+        if result.ndim == 0:
+            return float(result)
 
-        return np.exp(-r * T) * val
+        return result
 
 
     @staticmethod
@@ -86,11 +115,16 @@ class LatticeMethods():
         """
         Cox-Ross-Rubinstein Binomial model
 
+        K and option may be NumPy arrays, which are broadcast against
+        each other and rolled back together through one tree, so that a
+        whole expiry slice costs little more than a single contract. The
+        other contract inputs, which set the tree, must be shared.
+
         Parameters
         ----------
         S : Float
             Stock Price. The default is 100.
-        K : Float
+        K : Float or Array
             Strike Price. The default is 100.
         T : Float
             Time to Maturity.  The default is 0.25 (3 Months).
@@ -102,8 +136,9 @@ class LatticeMethods():
             Implied Volatility.  The default is 0.2 (20%).
         steps : Int
             Number of time steps. The default is 1000.
-        option : Str
-            Type of option. 'put' or 'call'. The default is 'call'.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
         output_flag : Str
             Whether to return 'price', 'delta', 'gamma', 'theta' or
             'all'. The default is 'price'.
@@ -114,33 +149,32 @@ class LatticeMethods():
         -------
         result : Various
             Depending on output flag:
-                'price' : Float; Option Price
-                'delta' : Float; Option Delta
-                'gamma' : Float; Option Gamma
-                'theta' : Float; Option Theta
-                'all' : Tuple; Option Price, Option Delta, Option
+                'price' : Float or Array; Option Price
+                'delta' : Float or Array; Option Delta
+                'gamma' : Float or Array; Option Gamma
+                'theta' : Float or Array; Option Theta
+                'all' : Dict; Option Price, Option Delta, Option
                         Gamma, Option Theta
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps = params['steps']
-            option = params['option']
-            output_flag = params['output_flag']
-            american = params['american']
-
-        if option == 'call':
-            z = 1
-        else:
-            z = -1
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        steps = params['steps']
+        option = params['option']
+        output_flag = params['output_flag']
+        american = params['american']
+
+        if any(np.ndim(x) for x in (S, T, r, q, sigma)):
+            raise ValueError(
+                'cox_ross_rubinstein_binomial takes arrays of K and option '
+                'only; S, T, r, q and sigma must be shared')
 
         b = r - q
         dt = T / steps
@@ -148,25 +182,34 @@ class LatticeMethods():
         d = 1 / u
         p = (np.exp(b * dt) - d) / (u - d)
         df = np.exp(-r * dt)
-        optionvalue = np.zeros((steps + 2))
-        returnvalue = np.zeros((4))
 
-        for i in range(steps + 1):
-            optionvalue[i] = max(
-                0, z * (S * (u ** i) * (d ** (steps - i)) - K))
+        # Contracts sharing the tree run along each row
+        K, z = np.broadcast_arrays(K, Utils.option_sign(option))
+        shape = K.shape
+        K, z = K.reshape(1, -1).astype(float), z.reshape(1, -1)
+        returnvalue = [np.zeros(K.shape[1]) for _ in range(4)]
+
+        # Node i of time step j has price S * u^(2i - j), so every level
+        # of the tree is a stride 2 view of the same powers of u
+        spot = (S * u ** np.arange(-steps, steps + 1))[:, None]
 
+        optionvalue = np.maximum(z * (spot[::2] - K), 0)
+        rollback = np.empty_like(optionvalue)
 
+        # Each step writes the leading rows of the other buffer, after
+        # which the buffer just read is free for the exercise values
         for j in range(steps - 1, -1, -1):
-            for i in range(j + 1):
-                if american:
-                    optionvalue[i] = (
-                        (p * optionvalue[i + 1])
-                        + ((1 - p) * optionvalue[i])) * df
-                else:
-                    optionvalue[i] = max(
-                        (z * (S * (u ** i) * (d ** (j - i)) - K)),
-                        ((p * optionvalue[i + 1])
-                         + ((1 - p) * optionvalue[i])) * df)
+            value = np.multiply(optionvalue[:j + 1], (1 - p) * df,
+                                out=rollback[:j + 1])
+            value += np.multiply(optionvalue[1:j + 2], p * df,
+                                 out=optionvalue[1:j + 2])
+            if american:
+                exercise = np.multiply(spot[steps - j:steps + j + 1:2], z,
+                                       out=optionvalue[:j + 1])
+                exercise -= z * K
+                np.maximum(value, exercise, out=value)
+
+            optionvalue, rollback = rollback, optionvalue
 
             if j == 2:
                 returnvalue[2] = (((optionvalue[2] - optionvalue[1])
@@ -175,14 +218,19 @@ class LatticeMethods():
                                    / (S - S * (d ** 2)))
                                   / (0.5 * (S * (u ** 2) - S * (d ** 2))))
 
-                returnvalue[3] = optionvalue[1]
+                returnvalue[3] = optionvalue[1].copy()
 
             if j == 1:
                 returnvalue[1] = ((
                     optionvalue[1] - optionvalue[0]) / (S * u - S * d))
 
         returnvalue[3] = (returnvalue[3] - optionvalue[0]) / (2 * dt) / 365
-        returnvalue[0] = optionvalue[0]
+        returnvalue[0] = optionvalue[0].copy()
+
+        if shape:
+            returnvalue = [x.reshape(shape) for x in returnvalue]
+        else:
+            returnvalue = [float(x[0]) for x in returnvalue]
 
         if output_flag == 'price':
             result = returnvalue[0]
@@ -206,24 +254,33 @@ class LatticeMethods():
         """
         Leisen Reimer Binomial
 
+        The Peizer-Pratt inversion is only accurate for an odd number of
+        steps, so an even number of steps is increased by one.
+
+        Each of S, K, T, r, q, sigma and option may be a float or a NumPy
+        array; arrays are broadcast against each other and the contracts
+        are rolled back through their trees together.
+
         Parameters
         ----------
-        S : Float
+        S : Float or Array
             Stock Price. The default is 100.
-        K : Float
+        K : Float or Array
             Strike Price. The default is 100.
-        T : Float
+        T : Float or Array
             Time to Maturity.  The default is 0.25 (3 Months).
-        r : Float
+        r : Float or Array
             Interest Rate. The default is 0.005 (50bps)
-        q : Float
+        q : Float or Array
             Dividend Yield.  The default is 0.
-        sigma : Float
+        sigma : Float or Array
             Implied Volatility.  The default is 0.2 (20%).
         steps : Int
-            Number of time steps. The default is 1000.
-        option : Str
-            Type of option. 'put' or 'call'. The default is 'call'.
+            Number of time steps, shared by every contract. The default
+            is 1000, which is priced with 1001 steps.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
         output_flag : Str
             Whether to return 'price', 'delta', 'gamma' or 'all'. The
             default is 'price'.
@@ -234,32 +291,64 @@ class LatticeMethods():
         -------
         result : Various
             Depending on output flag:
-                'price' : Float; Option Price
-                'delta' : Float; Option Delta
-                'gamma' : Float; Option Gamma
-                'all' : Tuple; Option Price, Option Delta, Option Gamma
+                'price' : Float or Array; Option Price
+                'delta' : Float or Array; Option Delta
+                'gamma' : Float or Array; Option Gamma
+                'all' : Dict; Option Price, Option Delta, Option Gamma
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps = params['steps']
-            option = params['option']
-            output_flag = params['output_flag']
-            american = params['american']
+        params = Utils.init_params(kwargs)
+        z = Utils.option_sign(params['option'])
+        S, K, T, r, q, sigma, z = (
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                params['S'], params['K'], params['T'], params['r'],
+                params['q'], params['sigma'], z))
+        output_flag = params['output_flag']
+
+        returnvalue = LatticeMethods._leisen_reimer_binomial(
+            *(x.ravel() for x in (S, K, T, r, q, sigma, z)),
+            params['steps'] + 1 - params['steps'] % 2, params['american'])
+        returnvalue = [
+            float(x[0]) if S.ndim == 0 else x.reshape(S.shape)
+            for x in returnvalue]
 
-        if option == 'call':
-            z = 1
-        else:
-            z = -1
+        if output_flag == 'price':
+            result = returnvalue[0]
+        if output_flag == 'delta':
+            result = returnvalue[1]
+        if output_flag == 'gamma':
+            result = returnvalue[2]
+        if output_flag == 'all':
+            result = {'Price':returnvalue[0],
+                      'Delta':returnvalue[1],
+                      'Gamma':returnvalue[2]}
 
+        return result
+
+
+    @staticmethod
+    def _leisen_reimer_binomial(S, K, T, r, q, sigma, z, steps, american):
+        """
+        Leisen Reimer Binomial over flat arrays of contracts, rolling
+        back one time step of every tree per array operation.
+
+        Parameters
+        ----------
+        S, K, T, r, q, sigma : Array
+            Contract inputs, each of shape (contracts,).
+        z : Array
+            Payoff sign, 1 for calls and -1 for puts.
+        steps : Int
+            Odd number of time steps.
+
+        Returns
+        -------
+        returnvalue : List
+            Arrays of Option Price, Delta and Gamma.
+
+        """
         b = r - q
         d1 = ((np.log(S / K) + (b + (0.5 * sigma ** 2)) * T)
               / (sigma * np.sqrt(T)))
@@ -279,54 +368,42 @@ class LatticeMethods():
         u = np.exp(b * dt) * hd1 / hd2
         d = (np.exp(b * dt) - p * u) / (1 - p)
         df = np.exp(-r * dt)
+        returnvalue = [np.zeros(S.shape) for _ in range(3)]
 
-        optionvalue = np.zeros((steps + 1))
-        returnvalue = np.zeros((4))
+        # Node i of time step j has price S * d^j * (u / d)^i, so the
+        # powers of u / d are shared by every level of the tree. Nodes
+        # run down the rows and contracts along each row
+        ratio = (u / d) ** np.arange(steps + 1)[:, None]
 
-        for i in range(steps + 1):
-            optionvalue[i] = max(0, z * (S * (u ** i) * (
-                d ** (steps - i)) - K))
+        optionvalue = np.maximum(z * (S * d ** steps * ratio - K), 0)
+        up = np.empty_like(optionvalue)
+        p_up = p * df
+        p_down = (1 - p) * df
 
+        # Each step overwrites the leading rows of the same buffers
         for j in range(steps - 1, -1, -1):
-            for i in range(j + 1):
-                if american:
-                    optionvalue[i] = (
-                        (p * optionvalue[i + 1])
-                        + ((1 - p) * optionvalue[i])) * df
-                else:
-                    optionvalue[i] = max(
-                        (z * (S * (u ** i) * (d ** (j - i)) - K)),
-                        ((p * optionvalue[i + 1])
-                         + ((1 - p) * optionvalue[i])) * df)
+            value = optionvalue[:j + 1]
+            np.multiply(optionvalue[1:j + 2], p_up, out=up[:j + 1])
+            value *= p_down
+            value += up[:j + 1]
+            if american:
+                exercise = np.multiply(ratio[:j + 1], z * S * d ** j,
+                                       out=up[:j + 1])
+                exercise -= z * K
+                np.maximum(value, exercise, out=value)
 
             if j == 2:
                 returnvalue[2] = (
-                    ((optionvalue[2] - optionvalue[1])
-                     / (S * (u ** 2) - S * u * d)
-                     - (optionvalue[1] - optionvalue[0])
-                     / (S * u * d - S * (d ** 2)))
+                    ((value[2] - value[1]) / (S * (u ** 2) - S * u * d)
+                     - (value[1] - value[0]) / (S * u * d - S * (d ** 2)))
                     / (0.5 * (S * (u ** 2) - S * (d ** 2))))
 
-                returnvalue[3] = optionvalue[1]
-
             if j == 1:
-                returnvalue[1] = ((optionvalue[1] - optionvalue[0])
-                                  / (S * u - S * d))
+                returnvalue[1] = (value[1] - value[0]) / (S * u - S * d)
 
-        returnvalue[0] = optionvalue[0]
+        returnvalue[0] = optionvalue[0].copy()
 
-        if output_flag == 'price':
-            result = returnvalue[0]
-        if output_flag == 'delta':
-            result = returnvalue[1]
-        if output_flag == 'gamma':
-            result = returnvalue[2]
-        if output_flag == 'all':
-            result = {'Price':returnvalue[0],
-                      'Delta':returnvalue[1],
-                      'Gamma':returnvalue[2]}
-
-        return result
+        return returnvalue
 
 
     @staticmethod
@@ -334,11 +411,16 @@ class LatticeMethods():
         """
         Trinomial Tree
 
+        K and option may be NumPy arrays, which are broadcast against
+        each other and priced together on one tree. The other contract
+        inputs, which set the node prices and probabilities, must be
+        shared.
+
         Parameters
         ----------
         S : Float
             Stock Price. The default is 100.
-        K : Float
+        K : Float or Array
             Strike Price. The default is 100.
         T : Float
             Time to Maturity.  The default is 0.25 (3 Months).
@@ -350,8 +432,9 @@ class LatticeMethods():
             Implied Volatility.  The default is 0.2 (20%).
         steps : Int
             Number of time steps. The default is 1000.
-        option : Str
-            Type of option, 'put' or 'call'. The default is 'call'.
+        option : Str or Array
+            Type of option, 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
         output_flag : Str
             Whether to return 'price', 'delta', 'gamma', 'theta' or
             'all'. The default is 'price'.
@@ -362,34 +445,73 @@ class LatticeMethods():
         -------
         result : Various
             Depending on output flag:
-                'price' : Float; Option Price
-                'delta' : Float; Option Delta
-                'gamma' : Float; Option Gamma
-                'theta' : Float; Option Theta
-                'all' : Tuple; Option Price, Option Delta, Option Gamma,
+                'price' : Float or Array; Option Price
+                'delta' : Float or Array; Option Delta
+                'gamma' : Float or Array; Option Gamma
+                'theta' : Float or Array; Option Theta
+                'all' : Dict; Option Price, Option Delta, Option Gamma,
                         Option Theta
 
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps = params['steps']
-            option = params['option']
-            output_flag = params['output_flag']
-            american = params['american']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        steps = params['steps']
+        option = params['option']
+        output_flag = params['output_flag']
+        american = params['american']
+
+        if any(np.ndim(x) for x in (S, T, r, q, sigma)):
+            raise ValueError(
+                'trinomial_tree takes arrays of K and option only; S, T, '
+                'r, q and sigma must be shared')
+
+        returnvalue = LatticeMethods._trinomial_tree(
+            S, K, T, r, q, sigma, steps, Utils.option_sign(option), american)
 
-        if option == 'call':
-            z = 1
-        else:
-            z = -1
+        if output_flag == 'price':
+            result = returnvalue[0]
+        if output_flag == 'delta':
+            result = returnvalue[1]
+        if output_flag == 'gamma':
+            result = returnvalue[2]
+        if output_flag == 'theta':
+            result = returnvalue[3]
+        if output_flag == 'all':
+            result = {'Price':returnvalue[0],
+                      'Delta':returnvalue[1],
+                      'Gamma':returnvalue[2],
+                      'Theta':returnvalue[3]}
+
+        return result
+
+
+    @staticmethod
+    def _trinomial_tree(S, K, T, r, q, sigma, steps, z, american):
+        """
+        Trinomial Tree from resolved inputs, used by methods that reprice
+        repeatedly.
+
+        Parameters
+        ----------
+        K : Float or Array
+            Strike Price of each contract sharing the tree.
+        z : Int or Array
+            Payoff sign, 1 for calls and -1 for puts.
+
+        Returns
+        -------
+        returnvalue : List
+            Option Price, Delta, Gamma and Theta, as floats for scalar K
+            and z and otherwise as arrays of their broadcast shape.
 
+        """
         b = r - q
         dt = T / steps
         u = np.exp(sigma * np.sqrt(2 * dt))
@@ -402,26 +524,41 @@ class LatticeMethods():
                  - np.exp(-sigma * np.sqrt(dt / 2)))) ** 2
         pm = 1 - pu - pd
         df = np.exp(-r * dt)
-        optionvalue = np.zeros((steps * 2 + 2))
-        returnvalue = np.zeros((4))
 
-        for i in range(2 * steps + 1):
-            optionvalue[i] = max(
-                0, z * (S * (u ** max(i - steps, 0))
-                        * (d ** (max((steps - i), 0))) - K))
+        # Contracts sharing the tree run along each row
+        K, z = np.broadcast_arrays(K, z)
+        shape = K.shape
+        K, z = K.reshape(1, -1).astype(float), z.reshape(1, -1)
+        returnvalue = [np.zeros(K.shape[1]) for _ in range(4)]
 
+        # Node i of time step j has price S * u^(i - j), so every level
+        # of the tree is a slice of the terminal price grid
+        spot = (S * u ** np.arange(-steps, steps + 1))[:, None]
 
-        for j in range(steps - 1, -1, -1):
-            for i in range(j * 2 + 1):
-
-                optionvalue[i] = (pu * optionvalue[i + 2]
-                                  + pm * optionvalue[i + 1]
-                                  + pd * optionvalue[i]) * df
+        optionvalue = np.maximum(z * (spot - K), 0)
+        rollback = np.empty_like(optionvalue)
+        scratch = np.empty_like(optionvalue)
 
-                if american:
-                    optionvalue[i] = max(
-                        z * (S * (u ** max(i - j, 0))
-                             * (d ** (max((j - i), 0))) - K), optionvalue[i])
+        # Each step writes the leading rows of the other buffer, after
+        # which the buffer just read is free for the exercise values.
+        # The middle branch is weighted in the scratch buffer, so the up
+        # branch, read last, can be weighted in place
+        for j in range(steps - 1, -1, -1):
+            nodes = j * 2 + 1
+            value = np.multiply(optionvalue[:nodes], pd * df,
+                                out=rollback[:nodes])
+            value += np.multiply(optionvalue[1:nodes + 1], pm * df,
+                                 out=scratch[:nodes])
+            value += np.multiply(optionvalue[2:nodes + 2], pu * df,
+                                 out=optionvalue[2:nodes + 2])
+
+            if american:
+                exercise = np.multiply(spot[steps - j:steps + j + 1], z,
+                                       out=optionvalue[:nodes])
+                exercise -= z * K
+                np.maximum(value, exercise, out=value)
+
+            optionvalue, rollback = rollback, optionvalue
 
             if j == 1:
                 returnvalue[1] = (
@@ -432,27 +569,16 @@ class LatticeMethods():
                      - (optionvalue[1] - optionvalue[0]) / (S - S * d ))
                     / (0.5 * ((S * u) - (S * d))))
 
-                returnvalue[3] = optionvalue[0]
+                returnvalue[3] = optionvalue[1].copy()
 
         returnvalue[3] = (returnvalue[3] - optionvalue[0]) / dt / 365
 
-        returnvalue[0] = optionvalue[0]
+        returnvalue[0] = optionvalue[0].copy()
 
-        if output_flag == 'price':
-            result = returnvalue[0]
-        if output_flag == 'delta':
-            result = returnvalue[1]
-        if output_flag == 'gamma':
-            result = returnvalue[2]
-        if output_flag == 'theta':
-            result = returnvalue[3]
-        if output_flag == 'all':
-            result = {'Price':returnvalue[0],
-                      'Delta':returnvalue[1],
-                      'Gamma':returnvalue[2],
-                      'Theta':returnvalue[3]}
+        if not shape:
+            return [float(x[0]) for x in returnvalue]
 
-        return result
+        return [x.reshape(shape) for x in returnvalue]
 
 
     @classmethod
@@ -522,20 +648,19 @@ class LatticeMethods():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            steps_itt = params['steps_itt']
-            option = params['option']
-            output_flag = params['output_flag']
-            step = params['step']
-            state = params['state']
-            skew = params['skew']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        steps_itt = params['steps_itt']
+        option = params['option']
+        output_flag = params['output_flag']
+        step = params['step']
+        state = params['state']
+        skew = params['skew']
 
         if option == 'call':
             z = 1
@@ -574,10 +699,9 @@ class LatticeMethods():
 
                         val = val + ad[n, j] * (Si1 - Fj)
 
-                    optionvalue = cls.trinomial_tree(
-                        S=S, K=Si1, T=(n + 1) * dt, r=r, q=q, sigma=sigmai,
-                        steps=(n + 1), option='put', output_flag='price',
-                        american=False, refresh=True)
+                    optionvalue = cls._trinomial_tree(
+                        S, Si1, (n + 1) * dt, r, q, sigmai, (n + 1), -1,
+                        False)[0]
 
                     qi = ((np.exp(r * dt) * optionvalue - val)
                           / (ad[n, i] * (Si1 - Si)))
@@ -585,10 +709,9 @@ class LatticeMethods():
                     pi = (Fi + qi * (Si1 - Si) - Si1) / (Si2 - Si1)
 
                 else:
-                    optionvalue = cls.trinomial_tree(
-                        S=S, K=Si1, T=(n + 1) * dt, r=r, q=q, sigma=sigmai,
-                        steps=(n + 1), option='call', output_flag='price',
-                        american=False, refresh=True)
+                    optionvalue = cls._trinomial_tree(
+                        S, Si1, (n + 1) * dt, r, q, sigmai, (n + 1), 1,
+                        False)[0]
 
                     val = 0
                     for j in range(i + 1, n * 2 + 1):
@@ -4,15 +4,24 @@ Option pricing models and tools
 """
 
 import copy
-from optionmodels.analyticalmethods import AnalyticalMethods # pylint: disable=unused-import
-from optionmodels.finitedifferencemethods import FiniteDifference
-from optionmodels.impliedvol import ImpliedVol
-from optionmodels.latticemethods import LatticeMethods
+import functools
+import importlib
+import numpy as np
+from optionmodels.cache import IVSeedCache, PricerCache
 from optionmodels.models_params import models_params_dict
-from optionmodels.montecarlo import MonteCarlo
-from optionmodels.hullwhite import HullWhite
 from optionmodels.utils import Utils
 
+# Modules holding the pricing classes named in pricer_dict, which are
+# imported on first use
+opt_mappings = {
+    'AnalyticalMethods':'optionmodels.analyticalmethods',
+    'FiniteDifference':'optionmodels.finitedifferencemethods',
+    'LatticeMethods':'optionmodels.latticemethods',
+    'MonteCarlo':'optionmodels.montecarlo',
+    'HullWhite':'optionmodels.hullwhite',
+    'ImpliedVol':'optionmodels.impliedvol'
+    }
+
 class Pricer():
     """
     Option pricing models and tools
@@ -33,6 +42,132 @@ class Pricer():
 
         self.params = params
 
+        # Result cache, created when caching is first requested
+        self.cache = None
+        if params['cache']:
+            self._get_cache(params)
+
+        # Implied vol seed cache, created when warm starts are requested
+        self.iv_seed_cache = None
+        if params['iv_seed_cache']:
+            self._get_iv_seed_cache(params)
+
+
+    @staticmethod
+    def _pricer_class(pricer_type):
+        """
+        Return the class holding a group of pricing methods, importing
+        its module the first time it is used.
+
+        Parameters
+        ----------
+        pricer_type : Str
+            Class name, as used in pricer_dict.
+
+        Returns
+        -------
+        Class
+            Pricing class.
+
+        """
+        module = importlib.import_module(opt_mappings[pricer_type])
+
+        return getattr(module, pricer_type)
+
+
+    def _get_cache(self, params):
+        """
+        Return the Pricer's result cache, creating it from the cache_size,
+        cache_ttl and cache_tolerance parameters on first use.
+
+        Parameters
+        ----------
+        params : ModelParams
+            Resolved parameters of the call.
+
+        Returns
+        -------
+        PricerCache
+            Result cache; see PricerCache.stats for hit rate statistics.
+
+        """
+        if self.cache is None:
+            self.cache = PricerCache(
+                maxsize=params['cache_size'], ttl=params['cache_ttl'],
+                tolerance=params['cache_tolerance'])
+
+        return self.cache
+
+
+    def _get_iv_seed_cache(self, params):
+        """
+        Return the Pricer's implied vol seed cache, creating it from the
+        iv_seed_cache_size, iv_seed_cache_ttl and iv_seed_cache_tolerance
+        parameters on first use.
+
+        Parameters
+        ----------
+        params : ModelParams
+            Resolved parameters of the call.
+
+        Returns
+        -------
+        IVSeedCache
+            Seed cache; see IVSeedCache.stats for the iterations saved.
+
+        """
+        if self.iv_seed_cache is None:
+            self.iv_seed_cache = IVSeedCache(
+                maxsize=params['iv_seed_cache_size'],
+                ttl=params['iv_seed_cache_ttl'],
+                tolerance=params['iv_seed_cache_tolerance'])
+
+        return self.iv_seed_cache
+
+
+    def _warm_start(self, vol_method, params):
+        """
+        Solve with Newton-Raphson from the last vol solved for each
+        contract, falling back to iv_seed for contracts not in the seed
+        cache, and store the new solutions. Contracts are identified by
+        the underlying parameter as well as their terms, so that chains
+        on several underlyings can share one Pricer.
+
+        Parameters
+        ----------
+        vol_method : Function
+            implied_vol_newton_raphson or
+            implied_vol_newton_raphson_batch.
+        params : ModelParams
+            Resolved parameters of the call.
+
+        Returns
+        -------
+        Float or Array
+            Implied Volatility, as returned by vol_method.
+
+        """
+        seed_cache = self._get_iv_seed_cache(params)
+        K, T, z, underlying = np.broadcast_arrays(
+            params['K'], params['T'], Utils.option_sign(params['option']),
+            np.asarray(params['underlying'], dtype=object), params['S'],
+            params['r'], params['q'], params['cm'])[:4]
+        shape = K.shape
+        keys = seed_cache.make_keys(K, T, z, underlying)
+        seeds = seed_cache.get(keys)
+
+        result = vol_method(params=params.replace(
+            iv_warm_start=seeds.reshape(shape) if shape else seeds[0],
+            output_flag='all'))
+        vol = np.nan if isinstance(result['Vol'], str) else result['Vol']
+        seed_cache.put(keys, np.broadcast_to(vol, shape),
+                       np.broadcast_to(result['Iterations'], shape))
+
+        if params['output_flag'] == 'all':
+            return result
+
+        return result['Vol']
+
 
     @Utils.timer
     def price(self, **kwargs):
@@ -62,27 +197,187 @@ class Pricer():
             Option Price.
 
         """
-        for param, value in self.params.items():
-            if param not in kwargs:
-                kwargs[param] = value
+        # Resolve the parameters once for this call
+        params = self.params.replace(**kwargs)
 
-        opt_mappings = {
-            'AnalyticalMethods':AnalyticalMethods,
-            'FiniteDifference':FiniteDifference,
-            'LatticeMethods':LatticeMethods,
-            'MonteCarlo':MonteCarlo,
-            'HullWhite':HullWhite
-            }
+        pricer_type, method = params['pricer_dict'][params['option_method']]
+        pricing_method = getattr(self._pricer_class(pricer_type), method)
 
-        method = kwargs['pricer_dict'][kwargs['option_method']][1]
-        pricer_type = opt_mappings[
-            kwargs['pricer_dict'][kwargs['option_method']][0]]
+        if params['cache']:
+            return self._get_cache(params).call(
+                'price', params, pricing_method)
 
-        option_price = getattr(pricer_type, method)(**kwargs)
+        option_price = pricing_method(params=params)
 
         return option_price
 
 
+    def bind(self, **kwargs):
+        """
+        Resolve the pricing method and fixed parameters once and return a
+        function that only takes the inputs that vary between calls.
+
+        Parameters
+        ----------
+        option_method : Str
+            Key of the pricing method in pricer_dict. The default is 'bsm'.
+        **kwargs : Various
+            Any other parameters to fix, e.g. K, T, r, q or steps; those
+            not supplied take the Pricer's values.
+
+        Returns
+        -------
+        bound_pricer : Function
+            Takes keyword arguments for the varying inputs, e.g. S and
+            sigma, and returns the output of the bound pricing method.
+
+        """
+        params = self.params.replace(**kwargs)
+        pricer_type, method = params['pricer_dict'][params['option_method']]
+        pricing_method = getattr(self._pricer_class(pricer_type), method)
+        replace = params.replace
+
+        def bound_pricer(**inputs):
+            return pricing_method(params=replace(**inputs))
+
+        return bound_pricer
+
+
+    @Utils.timer
+    def price_many(self, contracts, **kwargs):
+        """
+        Price a book of contracts which may use different pricing methods
+        and model settings.
+
+        Rows are grouped by option_method and by the model settings that
+        are not contract inputs (e.g. steps, nodes, american). Groups
+        using a method in array_methods are priced in a single call with
+        array inputs. Groups using a method in strike_array_methods are
+        split further by the contract inputs other than K and option,
+        and each set of rows sharing a tree is priced in one call. Other
+        groups are priced row by row from parameters resolved once per
+        group.
+
+        Parameters
+        ----------
+        contracts : Structured Array, DataFrame or Dict
+            Table of contracts with columns named as in params_list, e.g.
+            option_method, S, K, T, r, q, sigma, option and steps. Values
+            not given as columns take the Pricer's values.
+        **kwargs : Various
+            Parameters applied to every row that has no column for them.
+            The output_flag must select a single value per contract.
+
+        Returns
+        -------
+        prices : Array
+            Output of the pricing method for each row, in input order.
+
+        """
+        columns = self._contract_columns(contracts)
+        n_rows = len(next(iter(columns.values())))
+        base_params = self.params.replace(**kwargs)
+        contract_names = [name for name in columns
+                          if name in base_params['array_params']]
+        setting_names = [name for name in columns
+                         if name not in base_params['array_params']]
+
+        tree_names = [name for name in contract_names
+                      if name not in ('K', 'option')]
+        prices = np.empty(n_rows, dtype=float)
+
+        for rows in self._group_rows(columns, setting_names,
+                                     np.arange(n_rows)):
+            params = base_params.replace(
+                **{name: columns[name][rows[0]] for name in setting_names})
+            pricer_type, method = params['pricer_dict'][
+                params['option_method']]
+            pricing_method = getattr(self._pricer_class(pricer_type), method)
+
+            if params['option_method'] in params['array_methods']:
+                prices[rows] = pricing_method(params=params.replace(
+                    **{name: columns[name][rows] for name in contract_names}))
+            elif params['option_method'] in params['strike_array_methods']:
+                for tree_rows in self._group_rows(columns, tree_names, rows):
+                    prices[tree_rows] = pricing_method(params=params.replace(
+                        **{name: columns[name][tree_rows[0]]
+                           for name in tree_names},
+                        **{name: columns[name][tree_rows]
+                           for name in ('K', 'option') if name in columns}))
+            else:
+                for row in rows:
+                    prices[row] = pricing_method(params=params.replace(
+                        **{name: columns[name][row]
+                           for name in contract_names}))
+
+        return prices
+
+
+    @staticmethod
+    def _group_rows(columns, names, rows):
+        """
+        Split rows into groups with equal values in the given columns
+
+        Parameters
+        ----------
+        columns : Dict
+            Array of values for each column name.
+        names : List
+            Columns to group by.
+        rows : Array
+            Row numbers to split.
+
+        Returns
+        -------
+        List
+            Row numbers of each group, keeping their order within it.
+
+        """
+        # Label each row with the group of rows sharing its values
+        group = np.zeros(rows.size, dtype=np.int64)
+        for name in names:
+            _, labels = np.unique(columns[name][rows], return_inverse=True)
+            _, group = np.unique(
+                group * (labels.max() + 1) + labels.ravel(),
+                return_inverse=True)
+
+        order = np.argsort(group, kind='stable')
+        splits = np.flatnonzero(np.diff(group[order])) + 1
+
+        return np.split(rows[order], splits)
+
+
+    @staticmethod
+    def _contract_columns(contracts):
+        """
+        Convert a table of contracts to a dictionary of column arrays
+
+        Parameters
+        ----------
+        contracts : Structured Array, DataFrame or Dict
+            Table of contracts.
+
+        Returns
+        -------
+        columns : Dict
+            Array of values for each column name.
+
+        """
+        if isinstance(contracts, np.ndarray):
+            names = contracts.dtype.names
+        elif hasattr(contracts, 'columns'):
+            names = list(contracts.columns)
+        else:
+            names = list(contracts)
+
+        if not names:
+            raise ValueError(
+                'contracts must be a structured array, DataFrame or dict '
+                'of columns')
+
+        return {name: np.asarray(contracts[name]) for name in names}
+
+
     @Utils.timer
     def impliedvol(self, **kwargs):
         """
@@ -106,6 +401,21 @@ class Pricer():
             Degree of precision. The default is 0.0001
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
+        option_method : Str
+            Model to invert, a key of implied_vol_models. 'bsm' and
+            'black76' use vol_method; the lattice and finite difference
+            models are inverted with ImpliedVol.implied_vol_model and the
+            others with ImpliedVol.implied_parameter. The default is
+            'bsm'.
+        implied_param : Str
+            Parameter to solve for. Any other than 'sigma', e.g. 'vvol',
+            is found with ImpliedVol.implied_parameter. The default is
+            'sigma'.
+        output_flag : Str
+            'all' for a dict of the vol and its diagnostics, or 'record'
+            for a structured array of vol, status, iterations,
+            price_error and wall_time per contract, see
+            ImpliedVol.record. The default is 'price'.
 
         Returns
         -------
@@ -113,15 +423,50 @@ class Pricer():
             Implied Volatility.
 
         """
-        for param, value in self.params.items():
-            if param not in kwargs:
-                kwargs[param] = value
-
-        for key, value in kwargs['implied_vol_method_dict'].items():
-            if str(kwargs['vol_method']) == key:
-                vol = getattr(ImpliedVol, value)(**kwargs)
-
-        return vol
+        # Resolve the parameters once for this call
+        params = self.params.replace(**kwargs)
+
+        option_method = params['option_method']
+        if option_method not in params['implied_vol_models']:
+            return "Please select a valid option method"
+
+        implied_vol = params['implied_param'] == 'sigma'
+
+        # Black-76 is Black-Scholes-Merton on the futures price with the
+        # carry equal to the interest rate
+        if option_method == 'black76' and implied_vol:
+            params = params.replace(
+                S=params['F'], q=params['r'], option_method='bsm')
+            option_method = 'bsm'
+
+        if option_method != 'bsm' or not implied_vol:
+            pricer_type, method = params['pricer_dict'][option_method]
+            solver = ('implied_vol_model' if implied_vol and (
+                option_method in params['lattice_dict']
+                or option_method in params['finite_difference_dict'])
+                      else 'implied_parameter')
+            vol_method = functools.partial(
+                getattr(self._pricer_class('ImpliedVol'), solver),
+                getattr(self._pricer_class(pricer_type), method))
+
+        else:
+            for key, value in params['implied_vol_method_dict'].items():
+                if str(params['vol_method']) == key:
+                    vol_method = getattr(
+                        self._pricer_class('ImpliedVol'), value)
+                    if params['iv_seed_cache'] and key in ('nr', 'nr_batch'):
+                        vol_method = functools.partial(
+                            self._warm_start, vol_method)
+
+        if params['output_flag'] == 'record':
+            vol_method = functools.partial(
+                self._pricer_class('ImpliedVol').record, vol_method)
+
+        if params['cache']:
+            return self._get_cache(params).call(
+                'impliedvol', params, vol_method)
+
+        return vol_method(params=params)
 
 
     @Utils.timer
@@ -152,13 +497,13 @@ class Pricer():
             Option Price.
 
         """
-        for param, value in self.params.items():
-            if param not in kwargs:
-                kwargs[param] = value
+        # Resolve the parameters once for this call
+        params = self.params.replace(**kwargs)
 
-        method = kwargs['lattice_dict'][kwargs['option_method']]
+        method = params['lattice_dict'][params['option_method']]
 
-        option_price = getattr(LatticeMethods, method)(**kwargs)
+        option_price = getattr(
+            self._pricer_class('LatticeMethods'), method)(params=params)
 
         return option_price
 
@@ -191,13 +536,13 @@ class Pricer():
             Option Price.
 
         """
-        for param, value in self.params.items():
-            if param not in kwargs:
-                kwargs[param] = value
+        # Resolve the parameters once for this call
+        params = self.params.replace(**kwargs)
 
-        method = kwargs['finite_difference_dict'][kwargs['option_method']]
+        method = params['finite_difference_dict'][params['option_method']]
 
-        option_price = getattr(FiniteDifference, method)(**kwargs)
+        option_price = getattr(
+            self._pricer_class('FiniteDifference'), method)(params=params)
 
         return option_price
 
@@ -230,13 +575,13 @@ class Pricer():
             Option Price.
 
         """
-        for param, value in self.params.items():
-            if param not in kwargs:
-                kwargs[param] = value
+        # Resolve the parameters once for this call
+        params = self.params.replace(**kwargs)
 
-        method = kwargs['montecarlo_dict'][kwargs['option_method']]
+        method = params['montecarlo_dict'][params['option_method']]
 
-        option_price = getattr(MonteCarlo, method)(**kwargs)
+        option_price = getattr(
+            self._pricer_class('MonteCarlo'), method)(params=params)
 
         return option_price
 
@@ -269,12 +614,12 @@ class Pricer():
             Option Price.
 
         """
-        for param, value in self.params.items():
-            if param not in kwargs:
-                kwargs[param] = value
+        # Resolve the parameters once for this call
+        params = self.params.replace(**kwargs)
 
-        method = kwargs['hullwhite_dict'][kwargs['option_method']]
+        method = params['hullwhite_dict'][params['option_method']]
 
-        option_price = getattr(HullWhite, method)(**kwargs)
+        option_price = getattr(
+            self._pricer_class('HullWhite'), method)(params=params)
 
         return option_price
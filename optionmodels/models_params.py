@@ -1,8 +1,12 @@
 """
-Dictionary of key models parameters
+Dictionary of key models parameters and the resolved parameter object
+passed to the pricing methods
 
 """
 
+from functools import partial
+from types import MappingProxyType
+
 models_params_dict = {
     'S':100,
     'F':100,
@@ -28,15 +32,35 @@ models_params_dict = {
     'rho':0,
     'cm':5.0,
     'epsilon':0.0001,
+    'max_iterations':100,
     'refresh':True,
     'timing':False,
+    'cache':False,
+    'cache_size':1024,
+    'cache_ttl':None,
+    'cache_tolerance':1e-8,
     'option_method':'bsm',
     'vol_method':'nr',
+    'iv_seed':None,
+    'iv_warm_start':None,
+    'iv_seed_cache':False,
+    'iv_seed_cache_size':10000,
+    'iv_seed_cache_ttl':None,
+    'iv_seed_cache_tolerance':1e-4,
+    'underlying':None,
+    'iv_table':None,
+    'iv_table_polish':True,
+    'implied_param':'sigma',
+    'implied_param_bracket':(0.01, 3.0),
+    'mc_seed':None,
+    'surface_vol_method':'rational',
 
     'pricer_dict':{
         'bsm':('AnalyticalMethods', 'black_scholes_merton'),
         'bsm_vega':('AnalyticalMethods', 'black_scholes_merton_vega'),
+        'bsm_greeks':('AnalyticalMethods', 'black_scholes_merton_greeks'),
         'black76':('AnalyticalMethods', 'black_76'),
+        'black76_greeks':('AnalyticalMethods', 'black_76_greeks'),
         'euro_bin':('LatticeMethods', 'european_binomial'),
         'crr_bin':('LatticeMethods', 'cox_ross_rubinstein_binomial'),
         'lr_bin':('LatticeMethods', 'leisen_reimer_binomial'),
@@ -81,14 +105,89 @@ models_params_dict = {
         'hw88':'hull_white_88'
         },
 
+    # Pricing methods that accept arrays of contract inputs
+    'array_methods':[
+        'bsm',
+        'bsm_vega',
+        'bsm_greeks',
+        'black76',
+        'black76_greeks',
+        'lr_bin'
+        ],
+
+    # Lattice methods that accept arrays of K and option, priced on one
+    # shared tree
+    'strike_array_methods':[
+        'euro_bin',
+        'crr_bin',
+        'tt'
+        ],
+
+    # Implied volatility methods that accept arrays of contract inputs
+    'array_vol_methods':[
+        'nr_batch',
+        'rational',
+        'brent',
+        'table'
+        ],
+
+    # Contract inputs that can differ row by row within a batch; other
+    # parameters define the groups a book of contracts is priced in
+    'array_params':[
+        'S',
+        'F',
+        'K',
+        'T',
+        'r',
+        'q',
+        'sigma',
+        'option',
+        'vvol',
+        'sig0',
+        'sigLR',
+        'halflife',
+        'rho',
+        'cm'
+        ],
+
+    # Pricing methods whose implied volatility can be extracted
+    'implied_vol_models':[
+        'bsm',
+        'black76',
+        'euro_bin',
+        'crr_bin',
+        'lr_bin',
+        'tt',
+        'efd',
+        'ifd',
+        'efd_lns',
+        'cn',
+        'emc',
+        'hw87',
+        'hw88'
+        ],
+
     # Dictionary of interpolation methods used in implied vol calculation
     'implied_vol_method_dict':{
         'nr':'implied_vol_newton_raphson',
+        'nr_batch':'implied_vol_newton_raphson_batch',
+        'rational':'implied_vol_rational',
+        'brent':'implied_vol_brent',
+        'table':'implied_vol_table',
         'bisection':'implied_vol_bisection',
         'naive':'implied_vol_naive',
         'naive_verbose':'implied_vol_naive_verbose'
         },
 
+    # Dictionary of initial guesses used by the implied vol methods
+    'iv_seed_dict':{
+        'mk':'manaster_koehler',
+        'bs':'brenner_subrahmanyam',
+        'corrado':'corrado_miller',
+        'rational':'rational',
+        'auto':'auto'
+        },
+
     'params_list':[
         'S',
         'F',
@@ -114,10 +213,28 @@ models_params_dict = {
         'rho',
         'cm',
         'epsilon',
+        'max_iterations',
         'timing',
         'refresh',
+        'cache',
+        'cache_size',
+        'cache_ttl',
+        'cache_tolerance',
         'option_method',
-        'vol_method'
+        'vol_method',
+        'iv_seed',
+        'iv_warm_start',
+        'iv_seed_cache',
+        'iv_seed_cache_size',
+        'iv_seed_cache_ttl',
+        'iv_seed_cache_tolerance',
+        'underlying',
+        'iv_table',
+        'iv_table_polish',
+        'implied_param',
+        'implied_param_bracket',
+        'mc_seed',
+        'surface_vol_method'
         ]
     }
 
@@ -134,3 +251,130 @@ sabr_params_dict = {
     'timing':False,
     'output_flag':'price'
     }
+
+
+class ModelParams():
+    """
+    Immutable, slotted set of pricing parameters with any value not
+    supplied taken from models_params_dict.
+
+    It is resolved once per Pricer call and passed to the pricing
+    methods, which use it as given rather than merging the defaults
+    again. Values are read either as attributes or by key.
+
+    """
+    __slots__ = ('_params',)
+
+    # Defaults with the lookup tables frozen so they can be shared safely
+    _defaults = {
+        key: (MappingProxyType(value) if isinstance(value, dict)
+              else tuple(value) if isinstance(value, list) else value)
+        for key, value in models_params_dict.items()}
+
+    def __init__(self, **kwargs):
+        self._check_names(kwargs)
+        object.__setattr__(self, '_params', {**self._defaults, **kwargs})
+
+
+    def __getattr__(self, key):
+        if key == '_params':
+            raise AttributeError(key)
+        try:
+            return self._params[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+
+    def __setattr__(self, key, value):
+        raise AttributeError('ModelParams is immutable, use replace()')
+
+
+    def __getitem__(self, key):
+        return self._params[key]
+
+
+    def __contains__(self, key):
+        return key in self._params
+
+
+    def __iter__(self):
+        return iter(self._params)
+
+
+    def __repr__(self):
+        return 'ModelParams({})'.format(', '.join(
+            '{}={!r}'.format(key, self._params[key])
+            for key in models_params_dict['params_list']))
+
+
+    def __copy__(self):
+        return self
+
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+    def __reduce__(self):
+        # Only pickle the values that differ from the shared defaults
+        changed = {key: value for key, value in self._params.items()
+                   if value is not self._defaults[key]}
+        return (partial(ModelParams, **changed), ())
+
+
+    @classmethod
+    def _check_names(cls, inputs):
+        """
+        Raise a TypeError for any parameter name that is not recognised
+
+        """
+        unknown = inputs.keys() - cls._defaults.keys()
+        if unknown:
+            raise TypeError('Unknown parameters: {}'.format(
+                ', '.join(sorted(unknown))))
+
+
+    def keys(self):
+        """
+        Parameter names, allowing the object to be unpacked with **
+
+        """
+        return self._params.keys()
+
+
+    def items(self):
+        """
+        Parameter names and values
+
+        """
+        return self._params.items()
+
+
+    def get(self, key, default=None):
+        """
+        Parameter value if the name is known, otherwise the default
+
+        """
+        return self._params.get(key, default)
+
+
+    def replace(self, **changes):
+        """
+        Copy of the parameters with the supplied values changed
+
+        Parameters
+        ----------
+        **changes : Various
+            Parameter values to change.
+
+        Returns
+        -------
+        ModelParams
+            New parameter object.
+
+        """
+        self._check_names(changes)
+        new = object.__new__(ModelParams)
+        object.__setattr__(new, '_params', {**self._params, **changes})
+
+        return new
@@ -3,9 +3,8 @@ MonteCarlo option methods
 
 """
 
-import random
 import numpy as np
-from scipy.stats import norm
+from optionmodels.normaldistribution import NormalDistribution
 from optionmodels.utils import Utils
 # pylint: disable=invalid-name
 
@@ -37,11 +36,9 @@ class MonteCarlo():
             Number of Monte Carlo runs. The default is 10000.
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
+        mc_seed : Int
+            Seed of the random draws, so that runs can be repeated. The
+            default is None, drawing from fresh entropy.
 
         Returns
         -------
@@ -51,16 +48,19 @@ class MonteCarlo():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            simulations = params['simulations']
-            option = params['option']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        simulations = params['simulations']
+        option = params['option']
+
+        # Draw every path at once; seeded runs repeat exactly
+        uniforms = np.random.default_rng(params['mc_seed']).random(
+            simulations)
 
         if option == 'call':
             z = 1
@@ -70,16 +70,11 @@ class MonteCarlo():
         b = r - q
         Drift = (b - (sigma ** 2) / 2) * T
         sigmarT = sigma * np.sqrt(T)
-        val = 0
 
-        counter = 1
-        while counter < simulations + 1:
-            St = S * np.exp(
-                Drift + sigmarT * norm.ppf(random.random(), loc=0, scale=1))
-            val = val + max(z * (St - K), 0)
-            counter += 1
+        St = S * np.exp(Drift + sigmarT * NormalDistribution.ppf(uniforms))
+        val = np.maximum(z * (St - K), 0).sum()
 
-        result = np.exp(-r * T) * val / simulations
+        result = float(np.exp(-r * T) * val / simulations)
 
         return result
 
@@ -107,14 +102,12 @@ class MonteCarlo():
             Number of Monte Carlo runs. The default is 10000.
         option : Str
             Type of option. 'put' or 'call'. The default is 'call'.
+        mc_seed : Int
+            Seed of the random draws, so that runs can be repeated. The
+            default is None, drawing from fresh entropy.
         output_flag : Str
             Whether to return 'price', 'delta', 'gamma', 'theta',
             'vega' or 'all'. The default is 'price'.
-        default : Bool
-            Whether the function is being called directly (in which
-            case values that are not supplied are set to default
-            values) or called from another function where they have
-            already been updated.
 
         Returns
         -------
@@ -131,17 +124,20 @@ class MonteCarlo():
         """
 
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_params(kwargs)
-            S = params['S']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            q = params['q']
-            sigma = params['sigma']
-            simulations = params['simulations']
-            option = params['option']
-            output_flag = params['output_flag']
+        params = Utils.init_params(kwargs)
+        S = params['S']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        q = params['q']
+        sigma = params['sigma']
+        simulations = params['simulations']
+        option = params['option']
+        output_flag = params['output_flag']
+
+        # Draw every path at once; seeded runs repeat exactly
+        uniforms = np.random.default_rng(params['mc_seed']).random(
+            simulations)
 
         if option == 'call':
             z = 1
@@ -151,23 +147,12 @@ class MonteCarlo():
         b = r - q
         Drift = (b - (sigma ** 2) / 2) * T
         sigmarT = sigma * np.sqrt(T)
-        val = 0
-        deltasum = 0
-        gammasum = 0
         output = np.zeros((5))
 
-        counter = 1
-        while counter < simulations + 1:
-            St = S * np.exp(
-                Drift + sigmarT * norm.ppf(random.random(), loc=0, scale=1))
-            val = val + max(z * (St - K), 0)
-            if z == 1 and St > K:
-                deltasum = deltasum + St
-            if z == -1 and St < K:
-                deltasum = deltasum + St
-            if abs(St - K) < 2:
-                gammasum = gammasum + 1
-            counter += 1
+        St = S * np.exp(Drift + sigmarT * NormalDistribution.ppf(uniforms))
+        val = np.maximum(z * (St - K), 0).sum()
+        deltasum = St[z * (St - K) > 0].sum()
+        gammasum = np.count_nonzero(np.abs(St - K) < 2)
 
         # Option Value
         output[0] = np.exp(-r * T) * val / simulations
@@ -0,0 +1,124 @@
+"""
+Standard normal distribution kernels shared by the pricing models
+
+"""
+
+import importlib
+import math
+from typing import Union
+import numpy as np
+# pylint: disable=invalid-name
+
+# Normalising constant of the standard normal density
+INV_ROOT_2PI = 1 / math.sqrt(2 * math.pi)
+
+# Used to express the normal cdf in terms of the complementary error
+# function
+ROOT_2 = math.sqrt(2)
+
+
+class NormalDistribution():
+    """
+    Standard normal cdf, pdf and inverse cdf for scalars and arrays.
+
+    Scalars are evaluated with the math module and arrays with the
+    scipy.special ufuncs, avoiding the argument checking and
+    broadcasting overhead of the scipy.stats distribution objects.
+    scipy.special is only imported the first time it is needed.
+
+    """
+    _special = None
+
+    @classmethod
+    def _scipy_special(cls):
+        """
+        Import scipy.special on first use
+
+        """
+        if cls._special is None:
+            cls._special = importlib.import_module('scipy.special')
+
+        return cls._special
+
+
+    @classmethod
+    def cdf(cls, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Standard normal cumulative distribution function
+
+        Parameters
+        ----------
+        x : Float or Array
+            Input value.
+
+        Returns
+        -------
+        Float or Array
+            Probability that a standard normal variate is below x.
+
+        """
+        if isinstance(x, (float, int)):
+            return 0.5 * math.erfc(-x / ROOT_2)
+
+        return cls._scipy_special().ndtr(x)
+
+
+    @classmethod
+    def pdf(cls, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Standard normal probability density function
+
+        Parameters
+        ----------
+        x : Float or Array
+            Input value.
+
+        Returns
+        -------
+        Float or Array
+            Density of the standard normal distribution at x.
+
+        """
+        if isinstance(x, (float, int)):
+            return INV_ROOT_2PI * math.exp(-0.5 * x * x)
+
+        return INV_ROOT_2PI * np.exp(-0.5 * np.square(x))
+
+
+    @classmethod
+    def ppf(cls, p: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Standard normal inverse cumulative distribution function
+
+        Parameters
+        ----------
+        p : Float or Array
+            Probability.
+
+        Returns
+        -------
+        Float or Array
+            Value x such that cdf(x) = p.
+
+        """
+        return cls._scipy_special().ndtri(p)
+
+
+    @classmethod
+    def erfcx(cls, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Scaled complementary error function, exp(x^2) * erfc(x), used to
+        evaluate far tail probabilities without underflow
+
+        Parameters
+        ----------
+        x : Float or Array
+            Input value.
+
+        Returns
+        -------
+        Float or Array
+            Scaled complementary error function at x.
+
+        """
+        return cls._scipy_special().erfcx(x)
@@ -9,7 +9,7 @@ import numpy as np
 from optionmodels.analyticalmethods import AnalyticalMethods
 from optionmodels.models_params import sabr_params_dict
 from optionmodels.utils import Utils
-# pylint: disable=invalid-name
+# pylint: disable=invalid-name, protected-access
 
 class SABRVolatility():
     """
@@ -48,35 +48,41 @@ class SABRVolatility():
         """
         Run the SABR calibration
 
+        K may be an array of strikes, in which case the smile across the
+        whole strike grid is calibrated and priced in a single pass.
+
         Returns
         -------
-        Float
-            Black-76 equivalent SABR volatility and price.
+        Float or Array
+            Black-76 equivalent SABR volatility and / or price, or with
+            output_flag 'greeks' a dict of the Black-76 Price, Delta,
+            Gamma, Vega and Theta at the SABR volatility.
 
         """
-        if 'refresh' not in kwargs:
-            kwargs['refresh'] = True
-
         # Update pricing input parameters to default if not supplied
-        if 'refresh' in kwargs and kwargs['refresh']:
-            params = Utils.init_sabr_params(kwargs)
-            F = params['F']
-            K = params['K']
-            T = params['T']
-            r = params['r']
-            atmvol = params['atmvol']
-            beta = params['beta']
-            volvol = params['volvol']
-            rho = params['rho']
-            output_flag = params['output_flag']
-            option = params['option']
+        params = Utils.init_sabr_params(kwargs)
+        F = params['F']
+        K = params['K']
+        T = params['T']
+        r = params['r']
+        atmvol = params['atmvol']
+        beta = params['beta']
+        volvol = params['volvol']
+        rho = params['rho']
+        output_flag = params['output_flag']
+        option = params['option']
 
         black_vol = self._alpha_sabr(
             F, K, T, beta, volvol, rho, self._find_alpha(
                 F=F, T=T, atmvol=atmvol, beta=beta, volvol=volvol, rho=rho,))
 
-        black_price = AnalyticalMethods.black_76(
-            F=F, K=K, T=T, r=r, sigma=black_vol, option=option, refresh=True)
+        if output_flag == 'greeks':
+            return AnalyticalMethods._black_76_greeks(
+                F, K, T, r, black_vol, Utils.option_sign(option),
+                ['price', 'delta', 'gamma', 'vega', 'theta'])
+
+        black_price = AnalyticalMethods._black_76(
+            F, K, T, r, black_vol, Utils.option_sign(option))
 
         output_dict = {
             'vol':black_vol,
@@ -107,47 +113,47 @@ class SABRVolatility():
 
         Parameters
         ----------
+        K : Float or Array
+            Strike Price.
         Alpha : Float
             Alpha value.
 
         Returns
         -------
-        result : Float
+        result : Float or Array
             Black-76 equivalent SABR volatility.
 
         """
+        log_FK = np.log(F / K)
+        FK_beta = (F * K) ** ((1 - beta) / 2)
 
-        dSABR = np.zeros(4)
-        dSABR[1] = (
+        dSABR_1 = (
             alpha
-            / ((F * K) ** ((1 - beta) / 2)
+            / (FK_beta
                * (1
                   + (((1 - beta) ** 2) / 24)
-                  * (np.log(F / K) ** 2)
+                  * (log_FK ** 2)
                   + ((1 - beta) ** 4 / 1920)
-                  * (np.log(F / K) ** 4))))
-
-        if abs(F - K) > 10 ** -8:
-            sabrz = (volvol / alpha) * (F * K) ** (
-                (1 - beta) / 2) * np.log(F / K)
-            y = (np.sqrt(1 - 2 * rho * sabrz + (
-                sabrz ** 2)) + sabrz - rho) / (1 - rho)
-            if abs(y - 1) < 10 ** -8:
-                dSABR[2] = 1
-            elif y > 0:
-                dSABR[2] = sabrz / np.log(y)
-            else:
-                dSABR[2] = 1
-        else:
-            dSABR[2] = 1
-
-        dSABR[3] = (1 + ((((1 - beta) ** 2 / 24) * alpha ** 2 / (
+                  * (log_FK ** 4))))
+
+        # z / x(z) term, set to 1 at the money and where x(z) is undefined
+        sabrz = (volvol / alpha) * FK_beta * log_FK
+        y = (np.sqrt(1 - 2 * rho * sabrz + (
+            sabrz ** 2)) + sabrz - rho) / (1 - rho)
+        valid = (np.abs(F - K) > 10 ** -8) & (np.abs(y - 1) >= 10 ** -8) & (
+            y > 0)
+        dSABR_2 = np.where(
+            valid, sabrz / np.log(np.where(valid, y, np.e)), 1)
+
+        dSABR_3 = (1 + ((((1 - beta) ** 2 / 24) * alpha ** 2 / (
             (F * K) ** (1 - beta))) + (
-                0.25 * rho * beta * volvol * alpha) / (
-                    (F * K) ** ((1 - beta) / 2)) + (
-                        2 - 3 * rho ** 2) * volvol ** 2 / 24) * T)
+                0.25 * rho * beta * volvol * alpha) / FK_beta + (
+                    2 - 3 * rho ** 2) * volvol ** 2 / 24) * T)
+
+        result = dSABR_1 * dSABR_2 * dSABR_3
 
-        result = dSABR[1] * dSABR[2] * dSABR[3]
+        if np.ndim(result) == 0:
+            return float(result)
 
         return result
 
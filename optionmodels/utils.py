@@ -3,11 +3,11 @@ Utility functions for refreshing parameters and timing
 
 """
 
-import copy
 import time
-from typing import Callable
+from typing import Callable, Union
 from functools import wraps
-from optionmodels.models_params import models_params_dict, sabr_params_dict
+import numpy as np
+from optionmodels.models_params import ModelParams, sabr_params_dict
 
 
 class Utils():
@@ -46,26 +46,32 @@ class Utils():
 
 
     @staticmethod
-    def init_params(inputs: dict) -> dict:
+    def init_params(inputs: dict) -> ModelParams:
         """
-        Initialise parameter dictionary
+        Initialise parameter object
         Parameters
         ----------
         inputs : Dict
-            Dictionary of parameters supplied to the function.
+            Dictionary of parameters supplied to the function. An already
+            resolved ModelParams object may be supplied under the key
+            'params', in which case it is used as given with any other
+            inputs replacing its values.
         Returns
         -------
-        params : Dict
-            Dictionary of parameters.
+        params : ModelParams
+            Immutable parameter object with defaults filled in.
         """
-        # Copy the default parameters
-        params = copy.deepcopy(models_params_dict)
+        params = inputs.get('params')
 
-        # For all the supplied arguments
-        for key, value in inputs.items():
+        # Merge the supplied arguments with the default parameters
+        if params is None:
+            return ModelParams(**inputs)
 
-            # Replace the default parameter with that provided
-            params[key] = value
+        # Use the parameters resolved by the caller
+        if len(inputs) > 1:
+            return params.replace(**{
+                key: value for key, value in inputs.items()
+                if key != 'params'})
 
         return params
 
@@ -84,7 +90,7 @@ class Utils():
             Dictionary of parameters.
         """
         # Copy the default parameters
-        params = copy.deepcopy(sabr_params_dict)
+        params = dict(sabr_params_dict)
 
         # For all the supplied arguments
         for key, value in inputs.items():
@@ -93,3 +99,27 @@ class Utils():
             params[key] = value
 
         return params
+
+
+    @staticmethod
+    def option_sign(option: Union[str, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        Convert option type to payoff sign, 1 for a call and -1 for a put
+        Parameters
+        ----------
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls.
+        Returns
+        -------
+        z : Int or Array
+            Payoff sign, matching the shape of the input.
+        """
+        if isinstance(option, str):
+            return 1 if option == 'call' else -1
+
+        option = np.asarray(option)
+        if option.dtype == bool:
+            return np.where(option, 1, -1)
+
+        return np.where(option == 'call', 1, -1)
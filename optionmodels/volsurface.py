@@ -0,0 +1,368 @@
+"""
+Implied volatility surface built incrementally from an option chain
+
+"""
+
+import numpy as np
+from optionmodels.analyticalmethods import AnalyticalMethods
+from optionmodels.impliedvol import ImpliedVol
+from optionmodels.utils import Utils
+# pylint: disable=invalid-name
+
+# Inputs that move every contract on the surface
+MARKET_PARAMS = ('S', 'r', 'q')
+
+# Inputs that identify or quote individual contracts
+CONTRACT_PARAMS = ('K', 'T', 'cm', 'option')
+
+
+class VolSurface():
+    """
+    Implied volatility surface over a strike x expiry grid.
+
+    The whole chain is solved in one batch with the surface_vol_method,
+    one of the array_vol_methods. Contracts are identified by strike,
+    expiry and option type; when quotes change only the changed
+    contracts are solved again and only the expiry slices holding them
+    are rebuilt. A change in S, r or q moves every contract and
+    re-solves the whole chain.
+
+    Each grid point takes the vol of the out of the money contract at
+    that strike and expiry, or the in the money one if that is the only
+    quote that solves. Gaps within a slice are filled linearly in strike.
+    The surface is interpolated linearly in strike and in total variance
+    across expiries, with flat extrapolation beyond the grid.
+
+    """
+    def __init__(self, **kwargs):
+
+        # Store initial inputs
+        inputs = {}
+        for key, value in kwargs.items():
+            inputs[key] = value
+
+        # Initialise system parameters
+        params = Utils.init_params(inputs)
+
+        self.params = params
+
+        # Contract arrays and their lookup, filled by build
+        self.strikes = np.empty(0)
+        self.expiries = np.empty(0)
+        self.grid = np.empty((0, 0))
+        self._index = {}
+        self._K = np.empty(0)
+        self._T = np.empty(0)
+        self._z = np.empty(0)
+        self._cm = np.empty(0)
+        self._vol = np.empty(0)
+        self._strike_idx = np.empty(0, dtype=int)
+        self._expiry_idx = np.empty(0, dtype=int)
+
+
+    def build(self, **kwargs):
+        """
+        Solve every contract in an option chain and build the grid
+
+        Parameters
+        ----------
+        S : Float
+            Stock Price. The default is 100.
+        K : Array
+            Strike Price of each contract.
+        T : Array
+            Time to Maturity of each contract.
+        r : Float
+            Interest Rate. The default is 0.005 (50bps)
+        q : Float
+            Dividend Yield.  The default is 0.
+        cm : Array
+            Option price of each contract.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+
+        Returns
+        -------
+        Dict
+            Number of Contracts solved and Slices built.
+
+        """
+        self.params = self.params.replace(**kwargs)
+        K, T, z, cm = self._contracts(self.params)
+
+        # Later quotes replace earlier ones for the same contract
+        keys = list(zip(K.tolist(), T.tolist(), z.tolist()))
+        self._index = dict(zip(keys, range(len(keys))))
+        rows = np.fromiter(self._index.values(), dtype=int,
+                           count=len(self._index))
+        self._K, self._T, self._z, self._cm = K[rows], T[rows], z[rows], (
+            cm[rows])
+        self._index = dict(zip(self._index, range(rows.size)))
+
+        self._vol = self._solve(np.arange(rows.size))
+        self._build_grid()
+
+        return {'Contracts':rows.size, 'Slices':self.expiries.size}
+
+
+    def update(self, **kwargs):
+        """
+        Apply new quotes, solving only the contracts whose price has
+        changed and rebuilding only the slices that hold them
+
+        Parameters
+        ----------
+        S : Float
+            Stock Price. If it changes, or r or q change, every contract
+            is solved again.
+        K : Array
+            Strike Price of each quoted contract.
+        T : Array
+            Time to Maturity of each quoted contract.
+        cm : Array
+            Option price of each quoted contract. Contracts not already
+            on the surface are added.
+        option : Str or Array
+            Type of option. 'put' or 'call', an array of these strings or
+            a boolean array which is True for calls. The default is 'call'.
+
+        Returns
+        -------
+        Dict
+            Number of Contracts solved and Slices rebuilt.
+
+        """
+        market_moved = any(
+            key in kwargs and np.any(kwargs[key] != self.params[key])
+            for key in MARKET_PARAMS)
+        self.params = self.params.replace(**{
+            key: value for key, value in kwargs.items()
+            if key not in CONTRACT_PARAMS})
+
+        changed = np.empty(0, dtype=int)
+        new_points = False
+        if 'cm' in kwargs:
+            K, T, z, cm = self._contracts(self.params.replace(**{
+                key: value for key, value in kwargs.items()
+                if key in CONTRACT_PARAMS}))
+            changed, new_points = self._apply_quotes(K, T, z, cm)
+
+        if market_moved:
+            self._vol = self._solve(np.arange(self._cm.size))
+            self._build_grid()
+            return {'Contracts':self._cm.size, 'Slices':self.expiries.size}
+
+        if changed.size:
+            self._vol[changed] = self._solve(changed)
+
+        # New strikes or expiries change the shape of the grid
+        if new_points:
+            self._build_grid()
+            return {'Contracts':changed.size, 'Slices':self.expiries.size}
+
+        slices = np.unique(self._expiry_idx[changed])
+        self._fill_slices(slices)
+
+        return {'Contracts':changed.size, 'Slices':slices.size}
+
+
+    def vol(self, K, T):
+        """
+        Interpolated implied volatility
+
+        Parameters
+        ----------
+        K : Float or Array
+            Strike Price.
+        T : Float or Array
+            Time to Maturity.
+
+        Returns
+        -------
+        Float or Array
+            Implied Volatility, linear in strike and in total variance
+            across expiries.
+
+        """
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float),
+                                   np.asarray(T, dtype=float))
+
+        # Bracketing grid points and weights, flat beyond the grid
+        i, wk = self._bracket(self.strikes, K)
+        j, wt = self._bracket(self.expiries, T)
+
+        def slice_vol(col):
+            return ((1 - wk) * self.grid[i - 1, col]
+                    + wk * self.grid[i, col])
+
+        var_lower = slice_vol(j - 1) ** 2 * self.expiries[j - 1]
+        var_upper = slice_vol(j) ** 2 * self.expiries[j]
+        result = np.sqrt(((1 - wt) * var_lower + wt * var_upper)
+                         / np.where(T > 0, T, 1))
+
+        # Hold the vol flat outside the expiry range
+        result = np.where(T <= self.expiries[0], slice_vol(0), result)
+        result = np.where(T >= self.expiries[-1], slice_vol(-1), result)
+
+        if result.ndim == 0:
+            return float(result)
+
+        return result
+
+
+    def price(self, **kwargs):
+        """
+        Black-Scholes-Merton price at the interpolated volatility
+
+        Parameters
+        ----------
+        K : Float or Array
+            Strike Price.
+        T : Float or Array
+            Time to Maturity.
+        option : Str or Array
+            Type of option. 'put' or 'call'. The default is 'call'.
+
+        Returns
+        -------
+        Float or Array
+            Option Price.
+
+        """
+        params = self.params.replace(**kwargs)
+
+        return AnalyticalMethods.black_scholes_merton(params=params.replace(
+            sigma=self.vol(params['K'], params['T'])))
+
+
+    @staticmethod
+    def _contracts(params):
+        """
+        Broadcast the contract inputs to flat arrays
+
+        """
+        z = Utils.option_sign(params['option'])
+        K, T, z, cm = (
+            np.array(x, dtype=float).ravel() for x in np.broadcast_arrays(
+                params['K'], params['T'], z, params['cm']))
+
+        return K, T, z, cm
+
+
+    def _apply_quotes(self, K, T, z, cm):
+        """
+        Store new quotes, adding contracts not yet on the surface
+
+        Returns
+        -------
+        changed : Array
+            Rows whose price differs from the stored quote.
+        new_points : Bool
+            Whether a new strike or expiry was added to the grid.
+
+        """
+        rows = np.array([self._index.get(key, -1) for key in zip(
+            K.tolist(), T.tolist(), z.tolist())], dtype=int)
+
+        new = np.flatnonzero(rows < 0)
+        new_points = False
+        if new.size:
+            # Keep the last quote for any contract repeated in the batch
+            added = {}
+            for n in new:
+                added[(K[n], T[n], z[n])] = n
+            first = self._cm.size
+            for offset, key in enumerate(added):
+                self._index[key] = first + offset
+            new = np.fromiter(added.values(), dtype=int, count=len(added))
+            self._K = np.append(self._K, K[new])
+            self._T = np.append(self._T, T[new])
+            self._z = np.append(self._z, z[new])
+            self._cm = np.append(self._cm, np.full(new.size, np.nan))
+            self._vol = np.append(self._vol, np.full(new.size, np.nan))
+            rows[rows < 0] = [self._index[key] for key in zip(
+                K[rows < 0].tolist(), T[rows < 0].tolist(),
+                z[rows < 0].tolist())]
+            new_points = not (np.isin(K[new], self.strikes).all()
+                              and np.isin(T[new], self.expiries).all())
+            if not new_points:
+                self._strike_idx = np.append(self._strike_idx, np.searchsorted(
+                    self.strikes, K[new]))
+                self._expiry_idx = np.append(
+                    self._expiry_idx, np.searchsorted(self.expiries, T[new]))
+
+        changed = rows[~(self._cm[rows] == cm)]
+        self._cm[rows] = cm
+
+        return np.unique(changed), new_points
+
+
+    def _solve(self, rows):
+        """
+        Implied volatility of the given contract rows
+
+        """
+        vol_method = getattr(ImpliedVol, self.params[
+            'implied_vol_method_dict'][self.params['surface_vol_method']])
+
+        return np.asarray(vol_method(params=self.params.replace(
+            K=self._K[rows], T=self._T[rows], cm=self._cm[rows],
+            option=self._z[rows] > 0, output_flag='price')))
+
+
+    def _build_grid(self):
+        """
+        Rebuild the strike and expiry axes and every slice
+
+        """
+        self.strikes, self._strike_idx = np.unique(
+            self._K, return_inverse=True)
+        self.expiries, self._expiry_idx = np.unique(
+            self._T, return_inverse=True)
+        self.grid = np.full((self.strikes.size, self.expiries.size), np.nan)
+        self._fill_slices(np.arange(self.expiries.size))
+
+
+    def _fill_slices(self, slices):
+        """
+        Rebuild the grid columns of the given expiry slices
+
+        """
+        if slices.size == 0:
+            return
+
+        self.grid[:, slices] = np.nan
+        rows = np.flatnonzero(np.isin(self._expiry_idx, slices))
+        rows = rows[np.isfinite(self._vol[rows])]
+
+        # Write in the money vols first so out of the money ones win
+        forward = self.params['S'] * np.exp(
+            (self.params['r'] - self.params['q']) * self._T[rows])
+        otm = (self._z[rows] > 0) == (self._K[rows] >= forward)
+        rows = np.concatenate((rows[~otm], rows[otm]))
+        self.grid[self._strike_idx[rows], self._expiry_idx[rows]] = (
+            self._vol[rows])
+
+        # Fill gaps linearly in strike, flat beyond the quoted strikes
+        for col in slices:
+            quoted = np.isfinite(self.grid[:, col])
+            if quoted.any() and not quoted.all():
+                self.grid[:, col] = np.interp(
+                    self.strikes, self.strikes[quoted],
+                    self.grid[quoted, col])
+
+
+    @staticmethod
+    def _bracket(axis, x):
+        """
+        Upper bracketing index and linear weight of each x on an axis
+
+        """
+        i = np.clip(np.searchsorted(axis, x), 1, max(axis.size - 1, 1))
+        if axis.size == 1:
+            return np.zeros(x.shape, dtype=int), np.zeros(x.shape)
+
+        weight = np.clip((x - axis[i - 1]) / (axis[i] - axis[i - 1]), 0, 1)
+
+        return i, weight
@@ -3,9 +3,21 @@ Unit tests for option pricing and implied volatility models
 
 """
 
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+import numpy as np
+import scipy.stats as si
+from cache import IVSeedCache, PricerCache
+from impliedvol import ImpliedVol
+from ivseeds import ImpliedVolSeeds
+from ivtable import ImpliedVolTable
 from models import Pricer
+from normaldistribution import NormalDistribution
 from sabr import SABRVolatility
+from volsurface import VolSurface
 
 class ModelsTestCase(unittest.TestCase):
     """
@@ -37,6 +49,98 @@ class ModelsTestCase(unittest.TestCase):
                   timing=True))
 
 
+    def test_black_scholes_merton_chain(self):
+
+        strikes = np.linspace(80, 120, 9)
+        options = np.where(strikes < 100, 'put', 'call')
+
+        # Test if a chain of mixed calls and puts is priced in one call
+        chain = Pricer().price(option_method='bsm', K=strikes, option=options)
+        self.assertIsInstance(chain, np.ndarray)
+        self.assertEqual(chain.shape, strikes.shape)
+
+        # Test if the chain matches pricing each contract separately
+        for strike, option, price in zip(strikes, options, chain):
+            self.assertAlmostEqual(price, Pricer().price(
+                option_method='bsm', K=strike, option=option))
+
+        # Test if a boolean call mask gives the same result
+        np.testing.assert_allclose(Pricer().price(
+            option_method='bsm', K=strikes, option=strikes >= 100), chain)
+
+        # Print the output from running the function
+        print("Chain black_scholes_merton: ", chain)
+
+
+    def test_bind(self):
+
+        bsm = Pricer().bind(option_method='bsm', K=55, T=1, r=0.05, q=0.01,
+                            option='put')
+        crr = Pricer().bind(option_method='crr_bin', steps=200)
+
+        # Test if the output is a float
+        self.assertIsInstance(bsm(S=50, sigma=0.3), float)
+        self.assertIsInstance(crr(S=105), float)
+
+        # Test if the bound pricer matches the full pricing call
+        for spot in [45, 50, 55]:
+            self.assertAlmostEqual(bsm(S=spot, sigma=0.3), Pricer().price(
+                option_method='bsm', S=spot, K=55, T=1, r=0.05, q=0.01,
+                sigma=0.3, option='put'))
+        self.assertAlmostEqual(crr(S=105), Pricer().price(
+            option_method='crr_bin', S=105, steps=200))
+
+        # Print the output from running the function
+        print("Bound black_scholes_merton: ", bsm(S=50, sigma=0.3))
+
+
+    def test_price_many(self):
+
+        book = np.zeros(6, dtype=[
+            ('option_method', 'U8'), ('S', 'f8'), ('F', 'f8'), ('K', 'f8'),
+            ('T', 'f8'), ('sigma', 'f8'), ('option', 'U4'), ('steps', 'i8')])
+        book['option_method'] = [
+            'bsm', 'crr_bin', 'black76', 'bsm', 'crr_bin', 'crr_bin']
+        book['S'] = [100, 100, 100, 95, 90, 105]
+        book['F'] = 100
+        book['K'] = [100, 95, 105, 100, 100, 110]
+        book['T'] = [0.25, 0.5, 1, 0.25, 0.75, 0.5]
+        book['sigma'] = [0.2, 0.25, 0.3, 0.2, 0.35, 0.15]
+        book['option'] = ['call', 'put', 'call', 'put', 'call', 'put']
+        book['steps'] = [100, 100, 100, 100, 200, 100]
+
+        # Test if the output is an array aligned with the input rows
+        prices = Pricer().price_many(book, timing=True)
+        self.assertIsInstance(prices, np.ndarray)
+        self.assertEqual(prices.shape, book.shape)
+
+        # Test if each row matches pricing the contract on its own
+        for row, price in zip(book, prices):
+            self.assertAlmostEqual(price, Pricer().price(
+                **{name: row[name].item() for name in book.dtype.names}))
+
+        # Test if a dictionary of columns gives the same result
+        np.testing.assert_allclose(Pricer().price_many(
+            {name: book[name] for name in book.dtype.names}), prices)
+
+        # Test if strike slices priced on one tree match each row
+        book = np.zeros(12, dtype=[
+            ('option_method', 'U8'), ('S', 'f8'), ('K', 'f8'),
+            ('option', 'U4'), ('american', '?')])
+        book['option_method'] = np.repeat(['euro_bin', 'crr_bin', 'tt'], 4)
+        book['S'] = np.tile([100, 100, 95, 100], 3)
+        book['K'] = np.tile([90, 100, 100, 110], 3)
+        book['option'] = np.tile(['put', 'call', 'put', 'call'], 3)
+        book['american'] = np.tile([True, True, False, True], 3)
+        prices = Pricer().price_many(book, steps=200)
+        for row, price in zip(book, prices):
+            self.assertAlmostEqual(price, Pricer().price(steps=200, **{
+                name: row[name].item() for name in book.dtype.names}))
+
+        # Print the output from running the function
+        print("Book price_many: ", prices)
+
+
     def test_black_scholes_merton_vega(self):
 
         # Test if the output is a float
@@ -60,6 +164,40 @@ class ModelsTestCase(unittest.TestCase):
                   timing=True))
 
 
+    def test_black_scholes_merton_greeks(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(
+            Pricer().price(option_method='bsm_greeks', output_flag='delta'),
+            float)
+        self.assertIsInstance(Pricer().price(option_method='bsm_greeks',
+            S=50, K=55, T=1, r=0.05, q=0.01, sigma=0.3, option='put',
+            output_flag='all', timing=True)['Gamma'], float)
+
+        # Test if the price and vega match the dedicated pricers
+        greeks = Pricer().price(option_method='bsm_greeks',
+            S=50, K=55, T=1, r=0.05, q=0.01, sigma=0.3, option='put',
+            output_flag=['price', 'vega'])
+        self.assertAlmostEqual(greeks['Price'], Pricer().price(
+            option_method='bsm', S=50, K=55, T=1, r=0.05, q=0.01, sigma=0.3,
+            option='put'))
+        self.assertAlmostEqual(greeks['Vega'], Pricer().price(
+            option_method='bsm_vega', S=50, K=55, T=1, r=0.05, q=0.01,
+            sigma=0.3, option='put'))
+
+        # Test if the delta matches a central difference of the price
+        bump = 0.0001
+        fd_delta = (Pricer().price(option_method='bsm', S=100 + bump)
+                    - Pricer().price(option_method='bsm', S=100 - bump)) / (
+                        2 * bump)
+        self.assertAlmostEqual(Pricer().price(
+            option_method='bsm_greeks', output_flag='delta'), fd_delta)
+
+        # Print the output from running the function
+        print("Default black_scholes_merton_greeks: ",
+              Pricer().price(option_method='bsm_greeks', output_flag='all'))
+
+
     def test_black_76(self):
 
         # Test if the output is a float
@@ -81,6 +219,46 @@ class ModelsTestCase(unittest.TestCase):
             timing=True))
 
 
+    def test_black_76_greeks(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(
+            Pricer().price(option_method='black76_greeks',
+                           output_flag='delta'), float)
+        self.assertIsInstance(Pricer().price(option_method='black76_greeks',
+            F=50, K=55, T=1, r=0.05, sigma=0.3, option='put',
+            output_flag='all', timing=True)['Gamma'], float)
+
+        # Test if the price matches the dedicated pricer
+        self.assertAlmostEqual(Pricer().price(option_method='black76_greeks',
+            F=50, K=55, T=1, r=0.05, sigma=0.3, option='put'),
+            Pricer().price(option_method='black76', F=50, K=55, T=1, r=0.05,
+                           sigma=0.3, option='put'))
+
+        # Test if the delta matches a central difference of the price
+        bump = 0.0001
+        fd_delta = (Pricer().price(option_method='black76', F=100 + bump)
+                    - Pricer().price(option_method='black76', F=100 - bump)
+                    ) / (2 * bump)
+        self.assertAlmostEqual(Pricer().price(option_method='black76_greeks',
+            output_flag='delta'), fd_delta, places=6)
+
+        # Test if a chain of calls and puts matches pricing each contract
+        strikes = np.array([90, 100, 110])
+        options = np.array(['put', 'call', 'put'])
+        chain = Pricer().price(option_method='black76_greeks', K=strikes,
+                               option=options, output_flag='all')
+        for i, strike in enumerate(strikes):
+            self.assertAlmostEqual(chain['Theta'][i], Pricer().price(
+                option_method='black76_greeks', K=strike, option=options[i],
+                output_flag='theta'))
+
+        # Print the output from running the function
+        print("Default black_76_greeks: ",
+              Pricer().price(option_method='black76_greeks',
+                             output_flag='all'))
+
+
     def test_european_binomial(self):
 
         # Test if the output is a float
@@ -95,6 +273,15 @@ class ModelsTestCase(unittest.TestCase):
             S=50, K=55, T=1, r=0.05, q=0.01, sigma=0.3, steps=500,
             option='put', timing=True), 0)
 
+        # Test if a strip of strikes priced with many steps matches
+        # Black-Scholes-Merton
+        strikes = np.linspace(50, 200, 16)
+        options = np.where(strikes < 100, 'put', 'call')
+        strip = Pricer().price(option_method='euro_bin', K=strikes,
+                               option=options, steps=100000)
+        np.testing.assert_allclose(strip, Pricer().price(
+            option_method='bsm', K=strikes, option=options), atol=1e-4)
+
         # Print the output from running the function
         print("Default european_binomial: ",
               Pricer().price(option_method='euro_bin'))
@@ -121,6 +308,21 @@ class ModelsTestCase(unittest.TestCase):
             output_flag='all', option='put', american=True,
             timing=True)['Price'], 0)
 
+        # Test if European prices converge to Black-Scholes-Merton and
+        # early exercise adds value to the put
+        inputs = {'S':50, 'K':55, 'T':1, 'r':0.05, 'q':0.01, 'sigma':0.3,
+                  'option':'put'}
+        european = Pricer().price(option_method='crr_bin', steps=1000,
+                                  output_flag='all', **inputs)
+        american = Pricer().price(option_method='crr_bin', steps=1000,
+                                  american=True, **inputs)
+        self.assertAlmostEqual(european['Price'], Pricer().price(
+            option_method='bsm', **inputs), places=2)
+        self.assertAlmostEqual(european['Delta'], Pricer().price(
+            option_method='bsm_greeks', output_flag='delta', **inputs),
+                               places=2)
+        self.assertGreater(american, european['Price'] + 0.1)
+
         # Print the output from running the function
         print("Default cox_ross_rubinstein_binomial: ",
               Pricer().price(option_method='crr_bin'))
@@ -147,6 +349,25 @@ class ModelsTestCase(unittest.TestCase):
             output_flag='all', option='put', american=True,
             timing=True)['Price'], 0)
 
+        # Test if even steps are priced with the next odd number
+        self.assertEqual(Pricer().price(option_method='lr_bin', steps=300),
+                         Pricer().price(option_method='lr_bin', steps=301))
+
+        # Test if European prices of a chain match Black-Scholes-Merton
+        # and early exercise adds value to the puts
+        strikes = np.array([45, 50, 55, 60])
+        options = np.array(['put', 'put', 'call', 'call'])
+        inputs = {'S':50, 'T':1, 'r':0.05, 'q':0.01, 'sigma':0.3,
+                  'steps':301}
+        european = Pricer().price(option_method='lr_bin', K=strikes,
+                                  option=options, **inputs)
+        np.testing.assert_allclose(european, Pricer().price(
+            option_method='bsm', K=strikes, option=options, **inputs),
+                                   atol=1e-4)
+        american = Pricer().price(option_method='lr_bin', K=strikes,
+                                  option=options, american=True, **inputs)
+        self.assertTrue((american[:2] > european[:2] + 0.05).all())
+
         # Print the output from running the function
         print("Default leisen_reimer_binomial: ",
               Pricer().price(option_method='lr_bin'))
@@ -173,6 +394,17 @@ class ModelsTestCase(unittest.TestCase):
             output_flag='all', option='put', american=True,
             timing=True)['Price'], 0)
 
+        # Test if the European theta matches Black-Scholes-Merton
+        self.assertAlmostEqual(Pricer().price(
+            option_method='tt', output_flag='theta', steps=500),
+                               Pricer().price(option_method='bsm_greeks',
+                                              output_flag='theta'), places=4)
+
+        # Test if a tree with no middle branch probability is priced
+        self.assertAlmostEqual(Pricer().price(
+            option_method='tt', T=1, r=0.4, sigma=0.2, steps=2,
+            K=100), 32.968, places=3)
+
         # Print the output from running the function
         print("Default trinomial_tree: ", Pricer().price(option_method='tt'))
         print("Revalued trinomial_tree: ", Pricer().price(option_method='tt',
@@ -181,6 +413,41 @@ class ModelsTestCase(unittest.TestCase):
             timing=True)['Price'])
 
 
+    def test_lattice_strike_batches(self):
+
+        strikes = np.array([45, 50, 55, 60])
+        options = np.array(['put', 'put', 'call', 'call'])
+        inputs = {'S':50, 'T':1, 'r':0.05, 'q':0.01, 'sigma':0.3,
+                  'steps':301, 'american':True, 'output_flag':'all'}
+
+        for method in ('euro_bin', 'crr_bin', 'lr_bin', 'tt'):
+            with self.subTest(method=method):
+
+                # Test if strikes priced in one call match each contract
+                chain = Pricer().price(option_method=method, K=strikes,
+                                       option=options, **inputs)
+                for i, (strike, option) in enumerate(zip(strikes, options)):
+                    single = Pricer().price(option_method=method, K=strike,
+                                            option=option, **inputs)
+                    if isinstance(single, dict):
+                        for key, value in single.items():
+                            self.assertAlmostEqual(chain[key][i], value)
+                    else:
+                        self.assertAlmostEqual(chain[i], single)
+
+                # Test if contracts on different trees are rejected by
+                # the methods sharing one tree
+                if method in Pricer().params['strike_array_methods']:
+                    with self.assertRaises(ValueError):
+                        Pricer().price(option_method=method,
+                                       sigma=np.array([0.2, 0.3]))
+
+        # Print the output from running the function
+        print("Strike batch cox_ross_rubinstein_binomial: ",
+              Pricer().price(option_method='crr_bin', K=strikes,
+                             option=options, **inputs)['Price'])
+
+
     def test_implied_trinomial_tree(self):
 
         # Test if the output is a float
@@ -313,6 +580,14 @@ class ModelsTestCase(unittest.TestCase):
             S=50, K=55, T=1, r=0.05, q=0.01, sigma=0.3, simulations=1000,
             option='put', timing=True), 0)
 
+        # Test if seeded runs repeat and converge to Black-Scholes-Merton
+        price = Pricer().price(option_method='emc', simulations=200000,
+                               mc_seed=1)
+        self.assertEqual(price, Pricer().price(
+            option_method='emc', simulations=200000, mc_seed=1))
+        self.assertAlmostEqual(price, Pricer().price(option_method='bsm'),
+                               delta=0.05)
+
         # Print the output from running the function
         print("Default european_monte_carlo: ",
               Pricer().price(option_method='emc'))
@@ -413,6 +688,338 @@ class ModelsTestCase(unittest.TestCase):
                   option='put', timing=True))
 
 
+    def test_implied_vol_newton_raphson_batch(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(
+            Pricer().impliedvol(vol_method='nr_batch'), float)
+
+        # Test if the scalar result matches the single contract solver
+        self.assertAlmostEqual(Pricer().impliedvol(vol_method='nr_batch'),
+                               Pricer().impliedvol(vol_method='nr'), places=6)
+
+        # Test if a chain of prices recovers the vols used to price it
+        strikes = np.array([60, 90, 100, 110, 150])
+        options = np.array(['put', 'put', 'call', 'call', 'call'])
+        sigmas = np.array([0.45, 0.3, 0.25, 0.22, 0.4])
+        prices = Pricer().price(option_method='bsm', K=strikes, T=0.5,
+                                option=options, sigma=sigmas)
+        vols = Pricer().impliedvol(vol_method='nr_batch', K=strikes, T=0.5,
+                                   option=options, cm=prices, epsilon=1e-10)
+        np.testing.assert_allclose(vols, sigmas, rtol=1e-6)
+
+        # Test if prices outside the no arbitrage bounds return NaN
+        vols = Pricer().impliedvol(vol_method='nr_batch',
+                                   cm=np.array([0, 5, 150]))
+        self.assertTrue(np.isnan(vols[0]) and np.isnan(vols[2]))
+        self.assertGreater(vols[1], 0)
+
+        # Test if rows outside the bounds report no iterations
+        result = Pricer().impliedvol(vol_method='nr_batch',
+                                     cm=np.array([0, 5, 150]),
+                                     output_flag='all')
+        np.testing.assert_array_equal(result['Status'], [2, 0, 2])
+        self.assertEqual(result['Iterations'][[0, 2]].tolist(), [0, 0])
+        self.assertEqual(result['Iterations'][1], Pricer().impliedvol(
+            vol_method='nr', cm=5, iv_seed='auto',
+            output_flag='all')['Iterations'])
+
+        # Print the output from running the function
+        print("Default implied_vol_newton_raphson_batch: ",
+              Pricer().impliedvol(vol_method='nr_batch'))
+
+
+    def test_implied_vol_rational(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(
+            Pricer().impliedvol(vol_method='rational'), float)
+        self.assertIsInstance(Pricer().impliedvol(vol_method='rational',
+            S=50, K=55, T=1, r=0.05, q=0.01, cm=4.2, option='put',
+            timing=True), float)
+
+        # Test if deep out of the money, short dated and high vol prices
+        # recover the vols used to price them to close to machine
+        # precision
+        strikes = np.array([40, 95, 100, 105, 250, 100])
+        expiries = np.array([0.5, 1 / 365, 1 / 365, 0.1, 2, 10])
+        sigmas = np.array([0.2, 0.15, 0.6, 0.05, 0.3, 1.5])
+        options = np.array(['put', 'put', 'call', 'call', 'call', 'put'])
+        prices = Pricer().price(option_method='bsm', K=strikes, T=expiries,
+                                option=options, sigma=sigmas)
+        vols = Pricer().impliedvol(vol_method='rational', K=strikes,
+                                   T=expiries, option=options, cm=prices)
+        np.testing.assert_allclose(vols, sigmas, rtol=1e-10)
+
+        # Test if prices outside the no arbitrage bounds return NaN
+        vols = Pricer().impliedvol(vol_method='rational',
+                                   cm=np.array([0, 5, 150]))
+        self.assertTrue(np.isnan(vols[0]) and np.isnan(vols[2]))
+
+        # Test if the status comes from the price at the solved vol, so
+        # that a tolerance the solution misses is not reported converged
+        result = Pricer().impliedvol(vol_method='rational', K=strikes,
+                                     T=expiries, option=options, cm=prices,
+                                     output_flag='all')
+        self.assertTrue((result['Status'] == 0).all())
+        result = Pricer().impliedvol(vol_method='rational', K=strikes,
+                                     T=expiries, option=options, cm=prices,
+                                     epsilon=1e-20, output_flag='all')
+        np.testing.assert_array_equal(
+            result['Status'], np.where(np.abs(result['Error']) > 1e-20, 1, 0))
+        self.assertTrue((result['Status'] == 1).any())
+
+        # Print the output from running the function
+        print("Default implied_vol_rational: ",
+              Pricer().impliedvol(vol_method='rational'))
+
+
+    def test_implied_vol_seeds(self):
+
+        # Test if each seed is a float near the vol used to price the
+        # contract and gives the same solution
+        strikes = np.array([70, 95, 100, 105, 140])
+        options = np.array(['put', 'put', 'call', 'call', 'call'])
+        prices = Pricer().price(option_method='bsm', K=strikes, T=0.5,
+                                option=options, sigma=0.3)
+        for seed in ['mk', 'bs', 'corrado', 'rational', 'auto']:
+            self.assertIsInstance(ImpliedVolSeeds.seed(
+                100, 105, 0.5, 0.01, 0, 6.5, 1, seed), float)
+            self.assertAlmostEqual(Pricer().impliedvol(
+                vol_method='nr', iv_seed=seed, epsilon=1e-10), Pricer(
+                    ).impliedvol(vol_method='rational'), places=6)
+        np.testing.assert_allclose(ImpliedVolSeeds.seed(
+            100, strikes, 0.5, 0.005, 0, prices, np.where(
+                options == 'call', 1, -1), 'auto'), 0.3, rtol=0.1)
+
+        # Test if the default is Manaster-Koehler for a single contract
+        # and the automatic seed for arrays
+        self.assertEqual(ImpliedVolSeeds.seed(100, 105, 0.5, 0.01, 0, 6.5, 1),
+                         ImpliedVolSeeds.seed(100, 105, 0.5, 0.01, 0, 6.5,
+                                              1, 'mk'))
+        np.testing.assert_array_equal(ImpliedVolSeeds.seed(
+            100, strikes, 0.5, 0.005, 0, prices, 1), ImpliedVolSeeds.seed(
+                100, strikes, 0.5, 0.005, 0, prices, 1, 'auto'))
+
+        # Test if the automatic seed needs fewer Newton steps than the
+        # Manaster-Koehler seed and a fixed seed
+        report = ImpliedVol.seed_iterations(
+            K=strikes, T=0.5, option=options, cm=prices, epsilon=1e-10)
+        self.assertLess(report['auto']['mean'], report['mk']['mean'])
+        self.assertLess(report['auto']['mean'], report['sigma']['mean'])
+        self.assertEqual(report['auto']['failed'], 0)
+
+        # Print the output from running the function
+        print("Seed iterations: ", report)
+
+
+    def test_implied_vol_table(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(Pricer().impliedvol(vol_method='table'), float)
+
+        # Test if a chain of prices recovers the vols used to price it,
+        # roughly from the table alone and closely after the Newton step
+        strikes = np.array([60, 90, 100, 110, 150])
+        options = np.array(['put', 'put', 'call', 'call', 'call'])
+        sigmas = np.array([0.45, 0.3, 0.25, 0.22, 0.4])
+        prices = Pricer().price(option_method='bsm', K=strikes, T=0.5,
+                                option=options, sigma=sigmas)
+        np.testing.assert_allclose(Pricer().impliedvol(
+            vol_method='table', K=strikes, T=0.5, option=options,
+            cm=prices, iv_table_polish=False), sigmas, rtol=1e-3)
+        np.testing.assert_allclose(Pricer().impliedvol(
+            vol_method='table', K=strikes, T=0.5, option=options,
+            cm=prices), sigmas, rtol=1e-6)
+
+        # Test if a table saved to disk is memory-mapped and gives the
+        # same result
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'iv_table.npy')
+            ImpliedVolTable.build(shape=(101, 201), path=path)
+            result = Pricer().impliedvol(
+                vol_method='table', K=strikes, T=0.5, option=options,
+                cm=prices, iv_table=path)
+            self.assertIsInstance(ImpliedVolTable.load(path), np.memmap)
+            del ImpliedVolTable._tables[path]
+        np.testing.assert_allclose(result, sigmas, rtol=1e-4)
+
+        # Test if prices outside the bounds return NaN
+        self.assertTrue(np.isnan(Pricer().impliedvol(
+            vol_method='table', cm=np.array([0, 150]))).all())
+
+        # Print the output from running the function
+        print("Default implied_vol_table: ",
+              Pricer().impliedvol(vol_method='table'))
+
+
+    def test_implied_vol_brent(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(Pricer().impliedvol(vol_method='brent'), float)
+        self.assertIsInstance(Pricer().impliedvol(vol_method='brent',
+            S=50, K=55, T=1, r=0.05, q=0.01, cm=4.2, option='put',
+            timing=True), float)
+
+        # Test if a chain of prices recovers the vols used to price it
+        strikes = np.array([60, 90, 100, 110, 150])
+        options = np.array(['put', 'put', 'call', 'call', 'call'])
+        sigmas = np.array([0.45, 0.3, 0.25, 0.22, 0.4])
+        prices = Pricer().price(option_method='bsm', K=strikes, T=0.5,
+                                option=options, sigma=sigmas)
+        result = Pricer().impliedvol(vol_method='brent', K=strikes, T=0.5,
+                                     option=options, cm=prices,
+                                     epsilon=1e-12, output_flag='all')
+        np.testing.assert_allclose(result['Vol'], sigmas, rtol=1e-8)
+        self.assertTrue((result['Status'] == 0).all())
+
+        # Test if the status codes flag prices outside the bounds and the
+        # iteration cap
+        result = Pricer().impliedvol(vol_method='brent',
+                                     cm=np.array([0, 5, 150]),
+                                     output_flag='all')
+        np.testing.assert_array_equal(result['Status'], [2, 0, 2])
+        self.assertEqual(Pricer().impliedvol(
+            vol_method='brent', epsilon=1e-12, max_iterations=2,
+            output_flag='all')['Status'], 1)
+
+        # Print the output from running the function
+        print("Default implied_vol_brent: ",
+              Pricer().impliedvol(vol_method='brent'))
+
+
+    def test_implied_vol_model(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(Pricer().impliedvol(
+            option_method='crr_bin', steps=100), float)
+        self.assertIsInstance(Pricer().impliedvol(
+            option_method='black76', F=102, cm=4.5, option='put'), float)
+
+        # Test if Black-76 prices recover their vol with any vol method
+        price = Pricer().price(option_method='black76', F=102, K=100,
+                               sigma=0.3, option='put')
+        for vol_method in ('nr', 'rational', 'brent'):
+            self.assertAlmostEqual(Pricer().impliedvol(
+                option_method='black76', vol_method=vol_method, F=102,
+                K=100, cm=price, option='put', epsilon=1e-10), 0.3)
+
+        # Test if tree prices recover their vol in a few evaluations
+        strikes = np.array([80, 100, 120])
+        for option_method in ('crr_bin', 'lr_bin', 'tt'):
+            prices = np.array([Pricer().price(
+                option_method=option_method, K=K, T=1, r=0.05, sigma=0.3,
+                option='put', steps=101) for K in strikes])
+            result = Pricer().impliedvol(
+                option_method=option_method, K=strikes, T=1, r=0.05,
+                cm=prices, option='put', steps=101, epsilon=1e-8,
+                output_flag='all')
+            np.testing.assert_allclose(result['Vol'], 0.3, rtol=1e-5)
+            self.assertTrue((result['Status'] == 0).all())
+            self.assertLessEqual(result['Iterations'].max(), 5)
+
+        # Test if models that do not return a price are rejected
+        self.assertEqual(Pricer().impliedvol(option_method='bsm_greeks'),
+                         "Please select a valid option method")
+
+        # Print the output from running the function
+        print("Default implied_vol_model: ",
+              Pricer().impliedvol(option_method='crr_bin', steps=100))
+
+
+    def test_implied_vol_record(self):
+
+        # Test if each solver returns a record with every field
+        strikes = np.array([80, 100, 120])
+        prices = Pricer().price(K=strikes, sigma=0.25)
+        prices[2] = -1
+        for vol_method in ('nr_batch', 'rational', 'table', 'brent'):
+            record = Pricer().impliedvol(
+                vol_method=vol_method, K=strikes, cm=prices,
+                output_flag='record')
+            self.assertEqual(record.dtype.names, (
+                'vol', 'status', 'iterations', 'price_error', 'wall_time'))
+            np.testing.assert_allclose(record['vol'][:2], 0.25, atol=1e-4)
+            np.testing.assert_array_equal(record['status'], [0, 0, 2])
+            self.assertTrue(np.isnan(record['price_error'][2]))
+            self.assertTrue((record['wall_time'] > 0).all())
+
+        # Test if failures can be filtered without checks on each row
+        self.assertEqual((record['status'] != 0).sum(), 1)
+        self.assertLess(np.abs(record['price_error'][:2]).max(), 1e-4)
+
+        # Test if the scalar and model solvers return single records
+        for kwargs in ({'vol_method':'nr'}, {'vol_method':'bisection'},
+                       {'vol_method':'naive'}, {'option_method':'hw87'},
+                       {'option_method':'crr_bin', 'american':True}):
+            record = Pricer().impliedvol(output_flag='record', **kwargs)
+            self.assertEqual(record['status'], 0)
+            self.assertGreater(record['iterations'], 0)
+            self.assertLess(abs(record['price_error']), 1e-4)
+
+        # Test if prices outside the no arbitrage bounds are flagged
+        for vol_method in ('nr', 'naive', 'naive_verbose'):
+            record = Pricer().impliedvol(vol_method=vol_method, cm=200,
+                                         output_flag='record')
+            self.assertTrue(np.isnan(record['vol']))
+            self.assertEqual(record['status'], 2)
+            self.assertEqual(record['iterations'], 0)
+
+        # Test if the naive searches stop at max_iterations
+        for vol_method in ('naive', 'naive_verbose'):
+            record = Pricer().impliedvol(vol_method=vol_method, epsilon=0,
+                                         max_iterations=5,
+                                         output_flag='record')
+            self.assertEqual(record['status'], 1)
+            self.assertEqual(record['iterations'], 5)
+            self.assertLess(abs(record['vol'] - 0.2), 0.1)
+
+        # Print the output from running the function
+        print("Default implied_vol_record: ",
+              Pricer().impliedvol(output_flag='record'))
+
+
+    def test_implied_parameter(self):
+
+        # Test if the output is a float
+        self.assertIsInstance(Pricer().impliedvol(option_method='hw87'),
+                              float)
+
+        # Test if vols are recovered under models with no analytic vega,
+        # with Monte Carlo paths reused across trials
+        price = Pricer().price(option_method='hw87', sigma=0.3, K=105)
+        self.assertAlmostEqual(Pricer().impliedvol(
+            option_method='hw87', cm=price, K=105, epsilon=1e-10), 0.3)
+        price = Pricer().price(option_method='emc', sigma=0.3, mc_seed=1,
+                               simulations=2000)
+        self.assertAlmostEqual(Pricer().impliedvol(
+            option_method='emc', cm=price, mc_seed=1, simulations=2000,
+            epsilon=1e-10), 0.3)
+
+        # Test if other parameters can be solved for, batched for the
+        # array methods
+        price = Pricer().price(option_method='hw87', vvol=0.8, K=105)
+        self.assertAlmostEqual(Pricer().impliedvol(
+            option_method='hw87', implied_param='vvol', cm=price, K=105,
+            epsilon=1e-10), 0.8)
+        strikes = np.array([90, 100, 110])
+        prices = Pricer().price(K=strikes, q=0.03, T=1)
+        result = Pricer().impliedvol(
+            implied_param='q', K=strikes, T=1, cm=prices,
+            implied_param_bracket=(-0.2, 0.2), epsilon=1e-12,
+            output_flag='all')
+        np.testing.assert_allclose(result['Vol'], 0.03)
+        self.assertTrue((result['Status'] == 0).all())
+
+        # Test if a price out of reach of the bracket is flagged
+        self.assertEqual(Pricer().impliedvol(
+            option_method='hw87', cm=500, output_flag='all')['Status'], 3)
+
+        # Print the output from running the function
+        print("Default implied_parameter: ",
+              Pricer().impliedvol(option_method='hw87'))
+
+
     def test_implied_vol_bisection(self):
 
         # Test if the output is a float
@@ -483,6 +1090,181 @@ class ModelsTestCase(unittest.TestCase):
                   option='put', timing=True))
 
 
+    def test_model_params(self):
+
+        params = Pricer(S=50, sigma=0.3).params
+
+        # Test if supplied values replace the defaults
+        self.assertEqual(params['S'], 50)
+        self.assertEqual(params.sigma, 0.3)
+        self.assertEqual(params['K'], 100)
+
+        # Test if the parameters are immutable and replace returns a copy
+        with self.assertRaises(AttributeError):
+            params.S = 60
+        self.assertEqual(params.replace(S=60)['S'], 60)
+        self.assertEqual(params['S'], 50)
+
+        # Test if unknown parameter names are rejected
+        with self.assertRaises(TypeError):
+            Pricer().price(option_method='bsm', strike=100)
+
+
+    def test_pricer_cache(self):
+
+        pricer = Pricer(cache=True, cache_size=2, cache_tolerance=1e-6)
+
+        # Test if a repeated or near identical request is served from cache
+        price = pricer.price(option_method='crr_bin', steps=200)
+        self.assertEqual(pricer.price(option_method='crr_bin', steps=200),
+                         price)
+        self.assertEqual(pricer.price(
+            option_method='crr_bin', steps=200, S=100 + 1e-9), price)
+        self.assertIsInstance(pricer.impliedvol(), float)
+        self.assertEqual(pricer.impliedvol(), pricer.impliedvol())
+        stats = pricer.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (4, 2))
+        self.assertGreater(stats['saved_time'], 0)
+
+        # Test if the least recently used entry is evicted when full
+        pricer.price(option_method='bsm')
+        self.assertEqual(pricer.cache.stats()['evictions'], 1)
+        self.assertEqual(pricer.cache.stats()['size'], 2)
+
+        # Test if entries expire after the time to live
+        now = [0.0]
+        pricer.cache = PricerCache(ttl=10, clock=lambda: now[0])
+        pricer.price(option_method='bsm')
+        now[0] = 11.0
+        pricer.price(option_method='bsm')
+        self.assertEqual(pricer.cache.stats()['expirations'], 1)
+        self.assertEqual(pricer.cache.stats()['hits'], 0)
+
+        # Test if Monte Carlo prices are only cached when seeded
+        pricer = Pricer(cache=True)
+        self.assertNotEqual(pricer.price(option_method='emc'),
+                            pricer.price(option_method='emc'))
+        self.assertEqual(pricer.cache.stats()['size'], 0)
+        self.assertEqual(pricer.price(option_method='emc', mc_seed=1),
+                         pricer.price(option_method='emc', mc_seed=1))
+        self.assertEqual(pricer.cache.stats()['hits'], 1)
+
+        # Print the output from running the function
+        print("Cache statistics: ", stats)
+
+
+    def test_iv_seed_cache(self):
+
+        pricer = Pricer(iv_seed_cache=True, iv_seed_cache_size=3)
+        strikes = np.array([80, 100, 120])
+        options = np.array(['put', 'call', 'call'])
+        sigmas = np.array([0.3, 0.25, 0.22])
+
+        # Test if the first tick solves cold and later ticks warm start
+        # from the last solution
+        prices = pricer.price(K=strikes, option=options, sigma=sigmas)
+        cold = pricer.impliedvol(vol_method='nr_batch', K=strikes,
+                                 option=options, cm=prices,
+                                 output_flag='all')
+        prices = pricer.price(K=strikes, option=options,
+                              sigma=sigmas * 1.001)
+        warm = pricer.impliedvol(vol_method='nr_batch', K=strikes,
+                                 option=options, cm=prices,
+                                 output_flag='all')
+        np.testing.assert_allclose(warm['Vol'], sigmas * 1.001, rtol=1e-4)
+        self.assertLessEqual(warm['Iterations'].max(), 1)
+        stats = pricer.iv_seed_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (3, 3))
+        self.assertEqual(stats['iterations_saved'], np.sum(np.maximum(
+            cold['Iterations'] - warm['Iterations'], 0)))
+
+        # Test if scalar Newton-Raphson shares the seeds and the least
+        # recently used contract is evicted when full
+        self.assertIsInstance(pricer.impliedvol(K=100, cm=float(prices[1])),
+                              float)
+        self.assertEqual(pricer.iv_seed_cache.stats()['hits'], 4)
+        pricer.impliedvol(K=105)
+        self.assertEqual(pricer.iv_seed_cache.stats()['evictions'], 1)
+
+        # Test if seeds expire after the time to live
+        now = [0.0]
+        pricer.iv_seed_cache = IVSeedCache(ttl=10, clock=lambda: now[0])
+        pricer.impliedvol()
+        now[0] = 11.0
+        pricer.impliedvol()
+        self.assertEqual(pricer.iv_seed_cache.stats()['expirations'], 1)
+        self.assertEqual(pricer.iv_seed_cache.stats()['hits'], 0)
+
+        # Test if chains on two underlyings with the same strikes and
+        # expiries keep separate seeds
+        pricer = Pricer(iv_seed_cache=True)
+        for underlying, spot in (('AAA', 100), ('BBB', 110)):
+            pricer.impliedvol(
+                vol_method='nr_batch', underlying=underlying, S=spot,
+                K=strikes, option=options, cm=pricer.price(
+                    S=spot, K=strikes, option=options, sigma=sigmas))
+        stats = pricer.iv_seed_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']),
+                         (0, 6, 6))
+        prices = pricer.price(S=110, K=strikes, option=options,
+                              sigma=sigmas * 1.001)
+        warm = pricer.impliedvol(vol_method='nr_batch', underlying='BBB',
+                                 S=110, K=strikes, option=options, cm=prices,
+                                 output_flag='all')
+        np.testing.assert_allclose(warm['Vol'], sigmas * 1.001, rtol=1e-4)
+        self.assertLessEqual(warm['Iterations'].max(), 1)
+        self.assertEqual(pricer.iv_seed_cache.stats()['hits'], 3)
+
+        # Print the output from running the function
+        print("Seed cache statistics: ", stats)
+
+
+    def test_lazy_imports(self):
+
+        # Test if importing the Pricer leaves the engines and scipy unloaded
+        loaded = subprocess.run(
+            [sys.executable, '-c', 'import sys, optionmodels.models; '
+             'print(sorted(m for m in sys.modules if m.startswith('
+             '("scipy", "optionmodels.latticemethods", '
+             '"optionmodels.montecarlo"))))'],
+            capture_output=True, text=True, check=True).stdout.strip()
+        self.assertEqual(loaded, '[]')
+
+        # Test if scalar Newton-Raphson with the default seed leaves
+        # scipy unloaded
+        loaded = subprocess.run(
+            [sys.executable, '-c', 'import sys, optionmodels.models; '
+             'optionmodels.models.Pricer().impliedvol(vol_method="nr"); '
+             'print(any(m.startswith("scipy") for m in sys.modules))'],
+            capture_output=True, text=True, check=True).stdout.strip()
+        self.assertEqual(loaded, 'False')
+
+        # Test if the engines are loaded on first use
+        self.assertGreater(Pricer().price(option_method='crr_bin', steps=50), 0)
+        self.assertIn('optionmodels.latticemethods', sys.modules)
+
+
+    def test_normal_distribution(self):
+
+        x = np.linspace(-8, 8, 33)
+        p = np.linspace(0.001, 0.999, 33)
+
+        # Test if scalar inputs return floats
+        self.assertIsInstance(NormalDistribution.cdf(0.5), float)
+        self.assertIsInstance(NormalDistribution.pdf(0.5), float)
+        self.assertIsInstance(NormalDistribution.ppf(0.5), float)
+
+        # Test if scalar and array values match scipy.stats
+        for value in x:
+            self.assertAlmostEqual(NormalDistribution.cdf(float(value)),
+                                   si.norm.cdf(value), places=14)
+            self.assertAlmostEqual(NormalDistribution.pdf(float(value)),
+                                   si.norm.pdf(value), places=14)
+        np.testing.assert_allclose(NormalDistribution.cdf(x), si.norm.cdf(x))
+        np.testing.assert_allclose(NormalDistribution.pdf(x), si.norm.pdf(x))
+        np.testing.assert_allclose(NormalDistribution.ppf(p), si.norm.ppf(p))
+
+
     def test_sabr_volatility_calibrate(self):
 
         # Test if the output is a float
@@ -499,6 +1281,15 @@ class ModelsTestCase(unittest.TestCase):
             rho=-0.2, option='call', timing=True,
             output_flag='all')['Price'], 0)
 
+        # Test if a strike grid matches calibrating each strike
+        strikes = np.linspace(60, 140, 5)
+        smile = SABRVolatility().calibrate(K=strikes, output_flag='all')
+        for i, strike in enumerate(strikes):
+            self.assertAlmostEqual(smile['Vol'][i], SABRVolatility().calibrate(
+                K=strike, output_flag='vol'))
+        self.assertGreater(SABRVolatility().calibrate(
+            K=strikes, output_flag='greeks')['Vega'].min(), 0)
+
         # Print the output from running the function
         print("Default sabr_volatility_calibrate: ",
               SABRVolatility().calibrate())
@@ -509,5 +1300,54 @@ class ModelsTestCase(unittest.TestCase):
                   output_flag='all')['Price'])
 
 
+    def test_vol_surface(self):
+
+        # Chain of calls and puts priced off a known smile
+        strikes = np.linspace(60, 140, 17)
+        expiries = np.array([0.1, 0.25, 0.5, 1.0])
+        K, T = (x.ravel() for x in np.meshgrid(strikes, expiries,
+                                                indexing='ij'))
+        K, T = np.tile(K, 2), np.tile(T, 2)
+        options = np.repeat(['call', 'put'], K.size // 2)
+        sigmas = 0.2 + 0.1 * np.log(K / 100) ** 2 / np.sqrt(T)
+        prices = Pricer().price(K=K, T=T, option=options, sigma=sigmas)
+
+        # Test if the build solves every contract onto the grid
+        surface = VolSurface(S=100)
+        self.assertEqual(surface.build(K=K, T=T, cm=prices, option=options),
+                         {'Contracts':136, 'Slices':4})
+        self.assertEqual(surface.grid.shape, (17, 4))
+        np.testing.assert_allclose(
+            surface.grid, 0.2 + 0.1 * np.log(strikes[:, None] / 100) ** 2
+            / np.sqrt(expiries[None, :]), rtol=1e-10)
+
+        # Test if interpolation reprices the nodes and is flat outside
+        self.assertIsInstance(surface.vol(100, 0.5), float)
+        self.assertAlmostEqual(surface.vol(100, 0.75), 0.2)
+        self.assertAlmostEqual(surface.vol(100, 5), surface.vol(100, 1))
+        np.testing.assert_allclose(
+            surface.price(K=K, T=T, option=options), prices, rtol=1e-8)
+
+        # Test if updates only solve the changed contracts and slices
+        self.assertEqual(surface.update(
+            K=K[:2], T=T[:2], cm=prices[:2] * 1.01, option=options[:2]),
+                         {'Contracts':2, 'Slices':2})
+        self.assertGreater(surface.grid[0, 0], 0.2 + 0.1 * np.log(
+            0.6) ** 2 / np.sqrt(0.1))
+        self.assertEqual(surface.update(
+            K=K[:2], T=T[:2], cm=prices[:2] * 1.01, option=options[:2]),
+                         {'Contracts':0, 'Slices':0})
+
+        # Test if a new expiry extends the grid and a spot move re-solves
+        # the whole chain
+        surface.update(K=100, T=2, cm=11.5, option='call')
+        self.assertEqual(surface.grid.shape, (17, 5))
+        self.assertEqual(surface.update(S=101),
+                         {'Contracts':137, 'Slices':5})
+
+        # Print the output from running the function
+        print("Vol surface at 100, 0.75: ", surface.vol(100, 0.75))
+
+
 if __name__ == '__main__':
     unittest.main()